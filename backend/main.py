@@ -9,16 +9,24 @@ Integrating best practices from:
 """
 
 import os
+import sys
 import asyncio
+import atexit
 import json
+import logging
+import logging.handlers
 import math
+import queue
 import random
+from contextlib import asynccontextmanager
+from types import MappingProxyType
 from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
 
+import orjson
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
@@ -49,7 +57,9 @@ class Settings(BaseSettings):
     default_llm_model: str = "gpt-4o"
     host: str = "0.0.0.0"
     port: int = 8000
+    workers: int = 1
     debug: bool = True
+    log_level: str = "INFO"
     cors_origins: str = "http://localhost:3000,http://127.0.0.1:3000,https://apexgeo.vercel.app,https://apexgeo-api-production.up.railway.app"
 
     model_config = {"env_file": ".env", "extra": "ignore"}
@@ -57,13 +67,35 @@ class Settings(BaseSettings):
 
 settings = Settings()
 
+
+# Application log records are queued and written to stdout by a listener
+# thread, so handlers never block the event loop on console I/O.
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+logging.basicConfig(level=settings.log_level.upper(), handlers=[logging.handlers.QueueHandler(_log_queue)])
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Close the real-data service's upstream HTTP session on shutdown"""
+    # The environmental router's own lifespan closes the environmental and
+    # satellite services; FastAPI runs both on shutdown
+    try:
+        yield
+    finally:
+        await real_service.close()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="GeoGPT Research Platform",
     description="State-of-the-art Geospatial AI Platform for Advanced Research with Real Environmental Data",
     version="3.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Import and register routers
@@ -84,7 +116,7 @@ app.add_middleware(
 # GEOSPATIAL DATA - Kazakhstan Cities & Regions
 # =====================================================
 
-KAZAKHSTAN_CITIES = {
+_RAW_CITIES = {
     "astana": {
         "name": "Astana",
         "name_kz": "Астана",
@@ -243,6 +275,13 @@ KAZAKHSTAN_CITIES = {
     },
 }
 
+# Lookups are always done on lowercased input, so normalize keys once and
+# expose the registry read-only.
+KAZAKHSTAN_CITIES = MappingProxyType({k.lower(): v for k, v in _RAW_CITIES.items()})
+
+# /api/cities always returns the full registry; encode it once at import.
+_CITIES_JSON = orjson.dumps({"cities": dict(KAZAKHSTAN_CITIES)})
+
 
 # =====================================================
 # HYDROLOGICAL DATA - Glaciers, Rivers, Lakes
@@ -599,6 +638,39 @@ LAKES = {
 }
 
 
+# =====================================================
+# MAP LAYER STYLES - Shared Mapbox paint expressions
+# =====================================================
+
+# These never change between requests, so every response references the same
+# dicts instead of rebuilding them. Treat them as read-only.
+_METHANE_PAINT = {
+    "circle-radius": ["interpolate", ["linear"], ["get", "emission_rate"], 50, 20, 500, 45, 1000, 70],
+    "circle-color": ["get", "color"],
+    "circle-opacity": 0.8,
+    "circle-stroke-width": 3,
+    "circle-stroke-color": "#ffffff",
+    "circle-blur": 0.1
+}
+
+_CO2_PAINT = {
+    "circle-radius": ["interpolate", ["linear"], ["get", "annual_emissions"], 1, 15, 20, 35, 50, 60],
+    "circle-color": ["get", "color"],
+    "circle-opacity": 0.85,
+    "circle-stroke-width": 3,
+    "circle-stroke-color": "#1f2937"
+}
+
+_FIRE_PAINT = {
+    "circle-radius": ["interpolate", ["linear"], ["get", "frp"], 10, 10, 100, 25, 500, 45],
+    "circle-color": ["get", "color"],
+    "circle-opacity": 0.9,
+    "circle-stroke-width": 2,
+    "circle-stroke-color": "#7c2d12",
+    "circle-blur": 0.2
+}
+
+
 # =====================================================
 # MODELS
 # =====================================================
@@ -1562,7 +1634,7 @@ m""",
             if "landmarks" in intents:
                 landmarks = city.get("landmarks", [])
                 if landmarks:
-                    landmarks_text = "\n".join([f"  • 🏛️ {l}" for l in landmarks])
+                    landmarks_text = "\n".join(f"  • 🏛️ {l}" for l in landmarks)
                     return {
                         "message": f"🏛️ **Landmarks & Attractions - {city['name']}**\n\n{landmarks_text}\n\n*{city.get('description', '')}*",
                         "map_action": {"type": "flyTo", "center": city["coordinates"], "zoom": 13, "pitch": 45},
@@ -1842,7 +1914,7 @@ m""",
         
         if "ranking" in intents or "largest" in query_lower or "biggest" in query_lower or "top" in query_lower:
             sorted_cities = sorted(KAZAKHSTAN_CITIES.values(), key=lambda x: x.get("population", 0), reverse=True)
-            ranking_text = "\n".join([f"{i+1}. **{c['name']}** - {c.get('population', 0):,}" for i, c in enumerate(sorted_cities[:10])])
+            ranking_text = "\n".join(f"{i+1}. **{c['name']}** - {c.get('population', 0):,}" for i, c in enumerate(sorted_cities[:10]))
             
             return {
                 "message": f"🏆 **Top Cities by Population**\n\n{ranking_text}",
@@ -1895,14 +1967,16 @@ m""",
             # Use real data service
             methane_data = await real_service.get_methane_data()
             
-            # Get hotspots from the response
-            hotspots = methane_data.get("hotspots", [])
-            if not hotspots:
-                # Extract from features if hotspots not directly available
-                hotspots = [f.get("properties", {}) for f in methane_data.get("features", [])]
+            hotspots = methane_data["hotspots"]
             
             features = []
+            names, rates = [], []
             for hotspot in hotspots:
+                name = hotspot.get("name", "Unknown")
+                rate = hotspot.get("emission_rate_kt_per_year", 0)
+                names.append(name)
+                rates.append(rate)
+                
                 # Color based on concentration
                 conc = hotspot.get("concentration_ppb", 1850)
                 if conc < 1900:
@@ -1919,9 +1993,9 @@ m""",
                 features.append({
                     "type": "Feature",
                     "properties": {
-                        "name": hotspot.get("name", "Unknown"),
+                        "name": name,
                         "type": hotspot.get("type", "unknown"),
-                        "emission_rate": hotspot.get("emission_rate_kt_per_year", 0),
+                        "emission_rate": rate,
                         "concentration": conc,
                         "trend": hotspot.get("trend", "stable"),
                         "color": color
@@ -1932,8 +2006,19 @@ m""",
                     }
                 })
             
-            total_emissions = methane_data.get("total_emissions_mt", sum(h.get("emission_rate_kt_per_year", 0) for h in hotspots) / 1000)
-            top_source = hotspots[0] if hotspots else {"name": "N/A", "emission_rate_kt_per_year": 0, "concentration_ppb": 0, "trend": "N/A"}
+            if "total_emissions_mt" in methane_data:
+                total_emissions = methane_data["total_emissions_mt"]
+            else:
+                total_emissions = sum(rates) / 1000
+            top_source = next(iter(hotspots), {})
+            ts_name = top_source.get("name", "N/A")
+            ts_rate = top_source.get("emission_rate_kt_per_year", 0)
+            ts_conc = top_source.get("concentration_ppb", 0)
+            ts_trend = top_source.get("trend", "N/A")
+            top_sources_text = "\n".join(
+                f"• **{h.get('name', 'Unknown')}** ({h.get('type', 'unknown')}): {h.get('emission_rate_kt_per_year', 0)} kt/yr - {h.get('concentration_ppb', 0)} ppb"
+                for h in hotspots[:5]
+            )
             
             return {
                 "message": f"""🔥 **Methane (CH₄) Emissions - Kazakhstan**
@@ -1942,12 +2027,12 @@ m""",
 **Monitoring Hotspots:** {len(hotspots)} major sources
 
 **Top Emission Sources:**
-{chr(10).join([f"• **{h.get('name', 'Unknown')}** ({h.get('type', 'unknown')}): {h.get('emission_rate_kt_per_year', 0)} kt/yr - {h.get('concentration_ppb', 0)} ppb" for h in hotspots[:5]])}
+{top_sources_text}
 
-**Largest Source:** {top_source.get('name', 'N/A')}
-- Emission Rate: {top_source.get('emission_rate_kt_per_year', 0)} kt/year
-- Concentration: {top_source.get('concentration_ppb', 0)} ppb
-- Trend: {top_source.get('trend', 'N/A')}
+**Largest Source:** {ts_name}
+- Emission Rate: {ts_rate} kt/year
+- Concentration: {ts_conc} ppb
+- Trend: {ts_trend}
 
 *Data: Sentinel-5P TROPOMI | Click on markers for details*""",
                 "map_layers": [{
@@ -1957,23 +2042,16 @@ m""",
                         "type": "geojson",
                         "data": {"type": "FeatureCollection", "features": features}
                     },
-                    "paint": {
-                        "circle-radius": ["interpolate", ["linear"], ["get", "emission_rate"], 50, 20, 500, 45, 1000, 70],
-                        "circle-color": ["get", "color"],
-                        "circle-opacity": 0.8,
-                        "circle-stroke-width": 3,
-                        "circle-stroke-color": "#ffffff",
-                        "circle-blur": 0.1
-                    }
+                    "paint": _METHANE_PAINT
                 }],
                 "map_action": {"type": "flyTo", "center": [53.0, 47.0], "zoom": 5, "pitch": 30},
                 "chart": {
                     "type": "bar",
                     "title": "Methane Emissions by Source (kt/year)",
-                    "labels": [h.get("name", "Unknown") for h in hotspots],
+                    "labels": names,
                     "datasets": [{
                         "label": "Emissions (kt/yr)",
-                        "data": [h.get("emission_rate_kt_per_year", 0) for h in hotspots],
+                        "data": rates,
                         "backgroundColor": ["#dc2626", "#f97316", "#eab308", "#22c55e", "#3b82f6"]
                     }]
                 },
@@ -1988,10 +2066,7 @@ m""",
             # Use real data service
             co2_data = await real_service.get_co2_data()
             
-            # Get sources from the response  
-            sources = co2_data.get("sources", [])
-            if not sources:
-                sources = [f.get("properties", {}) for f in co2_data.get("features", [])]
+            sources = co2_data["sources"]
             
             features = []
             for source in sources:
@@ -2023,8 +2098,20 @@ m""",
                     }
                 })
             
-            total_emissions = co2_data.get("total_emissions_mt", sum(s.get("annual_emissions_mt", 0) for s in sources))
+            if "total_emissions_mt" in co2_data:
+                total_emissions = co2_data["total_emissions_mt"]
+            else:
+                total_emissions = sum(s.get("annual_emissions_mt", 0) for s in sources)
             by_sector = co2_data.get("by_sector", {})
+            if by_sector:
+                sector_labels, sector_values = map(list, zip(*by_sector.items()))
+            else:
+                sector_labels, sector_values = ["Energy", "Industry", "Oil/Gas"], [50, 30, 20]
+            sector_text = "\n".join(f"• **{k}:** {v:.1f} MT/yr" for k, v in by_sector.items()) if by_sector else "• Data aggregating..."
+            facilities_text = "\n".join(
+                f"• **{s.get('name', 'Unknown')}** ({s.get('type', 'unknown')}): {s.get('annual_emissions_mt', 0):.1f} MT/yr"
+                for s in sources[:4]
+            )
             
             return {
                 "message": f"""🏭 **CO₂ Emissions - Kazakhstan Industrial Sources**
@@ -2033,10 +2120,10 @@ m""",
 **Major Sources:** {len(sources)} industrial facilities
 
 **By Sector:**
-{chr(10).join([f"• **{k}:** {v:.1f} MT/yr" for k, v in by_sector.items()]) if by_sector else "• Data aggregating..."}
+{sector_text}
 
 **Top Emitting Facilities:**
-{chr(10).join([f"• **{s.get('name', 'Unknown')}** ({s.get('type', 'unknown')}): {s.get('annual_emissions_mt', 0):.1f} MT/yr" for s in sources[:4]])}
+{facilities_text}
 
 *Data: Industrial Registry + EDGAR Database*""",
                 "map_layers": [{
@@ -2046,21 +2133,15 @@ m""",
                         "type": "geojson",
                         "data": {"type": "FeatureCollection", "features": features}
                     },
-                    "paint": {
-                        "circle-radius": ["interpolate", ["linear"], ["get", "annual_emissions"], 1, 15, 20, 35, 50, 60],
-                        "circle-color": ["get", "color"],
-                        "circle-opacity": 0.85,
-                        "circle-stroke-width": 3,
-                        "circle-stroke-color": "#1f2937"
-                    }
+                    "paint": _CO2_PAINT
                 }],
                 "map_action": {"type": "flyTo", "center": [67.0, 50.0], "zoom": 5, "pitch": 25},
                 "chart": {
                     "type": "doughnut",
                     "title": "CO2 Emissions by Sector",
-                    "labels": list(by_sector.keys()) if by_sector else ["Energy", "Industry", "Oil/Gas"],
+                    "labels": sector_labels,
                     "datasets": [{
-                        "data": list(by_sector.values()) if by_sector else [50, 30, 20],
+                        "data": sector_values,
                         "backgroundColor": ["#ef4444", "#f59e0b", "#22c55e", "#3b82f6", "#8b5cf6"]
                     }]
                 },
@@ -2075,14 +2156,11 @@ m""",
             # Use real data service (tries NASA FIRMS)
             fire_data = await real_service.get_fire_data_firms()
             
-            # Get fires from the response
-            fires = fire_data.get("fires", [])
-            if not fires:
-                fires = [f.get("properties", {}) for f in fire_data.get("features", [])]
+            fires = fire_data["fires"]
             
             features = []
             for fire in fires:
-                conf = fire.get("confidence", 50)
+                conf = fire.confidence
                 if conf < 50:
                     color = "#fbbf24"
                 elif conf < 80:
@@ -2090,29 +2168,27 @@ m""",
                 else:
                     color = "#dc2626"
                 
-                coords = fire.get("coordinates", [67.0, 48.0])
-                
                 features.append({
                     "type": "Feature",
                     "properties": {
-                        "brightness": fire.get("brightness", 0),
+                        "brightness": fire.brightness,
                         "confidence": conf,
-                        "frp": fire.get("frp", 0),
-                        "satellite": fire.get("satellite", "VIIRS"),
-                        "acq_date": fire.get("acq_date", ""),
+                        "frp": fire.frp,
+                        "satellite": fire.satellite,
+                        "acq_date": fire.acq_date,
                         "color": color
                     },
                     "geometry": {
                         "type": "Point",
-                        "coordinates": coords
+                        "coordinates": fire.coordinates
                     }
                 })
             
-            high_conf = len([f for f in fires if f.get("confidence", 0) > 80])
-            med_conf = len([f for f in fires if 50 <= f.get("confidence", 0) <= 80])
-            low_conf = len([f for f in fires if f.get("confidence", 0) < 50])
-            avg_frp = sum(f.get("frp", 0) for f in fires) / len(fires) if fires else 0
-            max_frp = max(f.get("frp", 0) for f in fires) if fires else 0
+            high_conf = len([f for f in fires if f.confidence > 80])
+            med_conf = len([f for f in fires if 50 <= f.confidence <= 80])
+            low_conf = len([f for f in fires if f.confidence < 50])
+            avg_frp = sum(f.frp for f in fires) / len(fires) if fires else 0
+            max_frp = max(f.frp for f in fires) if fires else 0
             
             return {
                 "message": f"""🔥 **Active Fire Detection - Kazakhstan**
@@ -2138,14 +2214,7 @@ m""",
                         "type": "geojson",
                         "data": {"type": "FeatureCollection", "features": features}
                     },
-                    "paint": {
-                        "circle-radius": ["interpolate", ["linear"], ["get", "frp"], 10, 10, 100, 25, 500, 45],
-                        "circle-color": ["get", "color"],
-                        "circle-opacity": 0.9,
-                        "circle-stroke-width": 2,
-                        "circle-stroke-color": "#7c2d12",
-                        "circle-blur": 0.2
-                    }
+                    "paint": _FIRE_PAINT
                 }],
                 "map_action": {"type": "flyTo", "center": [67.0, 48.0], "zoom": 5, "pitch": 0},
                 "chart": {
@@ -2155,9 +2224,9 @@ m""",
                     "datasets": [{
                         "label": "Fire Count",
                         "data": [
-                            len([f for f in fire_data['fires'] if f['confidence'] > 80]),
-                            len([f for f in fire_data['fires'] if 50 <= f['confidence'] <= 80]),
-                            len([f for f in fire_data['fires'] if f['confidence'] < 50])
+                            len([f for f in fire_data['fires'] if f.confidence > 80]),
+                            len([f for f in fire_data['fires'] if 50 <= f.confidence <= 80]),
+                            len([f for f in fire_data['fires'] if f.confidence < 50])
                         ],
                         "backgroundColor": ["#dc2626", "#f97316", "#fbbf24"]
                     }]
@@ -2207,38 +2276,40 @@ m""",
         # =========================================
         
         if "dashboard" in intents or "environmental" in query_lower and "overview" in query_lower:
-            # Use real data services
-            air_data = await real_service.get_air_quality_openaq()
-            methane_data = await real_service.get_methane_data()
-            co2_data = await real_service.get_co2_data()
-            temp_data = await real_service.get_temperature_data()
-            
-            # Get stations/hotspots/sources safely
-            stations = air_data.get("stations", [])
-            if not stations:
-                stations = [f.get("properties", {}) for f in air_data.get("features", [])]
-            
-            hotspots = methane_data.get("hotspots", [])
-            if not hotspots:
-                hotspots = [f.get("properties", {}) for f in methane_data.get("features", [])]
-            
-            sources = co2_data.get("sources", [])
-            if not sources:
-                sources = [f.get("properties", {}) for f in co2_data.get("features", [])]
+            # Use real data services, fetched concurrently
+            air_data, methane_data, co2_data, temp_data = await asyncio.gather(
+                real_service.get_air_quality_openaq(),
+                real_service.get_methane_data(),
+                real_service.get_co2_data(),
+                real_service.get_temperature_data()
+            )
+            
+            # The real data service always returns the flat lists alongside features
+            stations = air_data["stations"]
+            hotspots = methane_data["hotspots"]
+            sources = co2_data["sources"]
             
             grid_data = temp_data.get("grid_data", [])
             
             # Calculate aggregates safely
-            avg_aqi = air_data.get("summary", {}).get("avg_aqi", 
-                sum(s.get("aqi", 0) for s in stations) / len(stations) if stations else 0)
-            overall_status = air_data.get("summary", {}).get("overall_status", "Moderate")
+            # (explicit branches: a .get() default would compute the fallback sums eagerly)
+            air_summary = air_data.get("summary") or {}
+            if "avg_aqi" in air_summary:
+                avg_aqi = air_summary["avg_aqi"]
+            else:
+                avg_aqi = sum(s.get("aqi", 0) for s in stations) / len(stations) if stations else 0
+            overall_status = air_summary.get("overall_status", "Moderate")
             
-            total_methane = methane_data.get("total_emissions_mt", 
-                sum(h.get("emission_rate_kt_per_year", 0) for h in hotspots) / 1000)
-            top_methane = hotspots[0].get("name", "N/A") if hotspots else "N/A"
+            if "total_emissions_mt" in methane_data:
+                total_methane = methane_data["total_emissions_mt"]
+            else:
+                total_methane = sum(h.get("emission_rate_kt_per_year", 0) for h in hotspots) / 1000
+            top_methane = next(iter(hotspots), {}).get("name", "N/A")
             
-            total_co2 = co2_data.get("total_emissions_mt",
-                sum(s.get("annual_emissions_mt", 0) for s in sources))
+            if "total_emissions_mt" in co2_data:
+                total_co2 = co2_data["total_emissions_mt"]
+            else:
+                total_co2 = sum(s.get("annual_emissions_mt", 0) for s in sources)
             
             temp_summary = temp_data.get("summary", {})
             min_temp = temp_summary.get("min_temp", -20)
@@ -2418,7 +2489,7 @@ async def chat(request: ChatRequest):
 
 @app.get("/api/cities")
 async def get_cities():
-    return {"cities": KAZAKHSTAN_CITIES}
+    return Response(content=_CITIES_JSON, media_type="application/json")
 
 
 @app.get("/api/cities/{city_name}")
@@ -2440,12 +2511,10 @@ async def quick_air_quality(city: str):
     if not city_data:
         raise HTTPException(404, f"City '{city}' not found")
     
-    data = await env_service.get_realtime_air_quality(
-        city_data["coordinates"][1],
-        city_data["coordinates"][0]
-    )
+    # Stations are selected by city name; cities without a monitoring
+    # station get the no_data answer below
+    data = await env_service.get_realtime_air_quality(city=city_data["name"], summary_only=True)
     
-    # Find nearest station
     if data["stations"]:
         station = data["stations"][0]
         return {
@@ -2462,8 +2531,10 @@ async def quick_air_quality(city: str):
 @app.get("/api/quick/emissions")
 async def quick_emissions_summary():
     """Quick emissions summary for Kazakhstan"""
-    methane = await env_service.get_methane_emissions()
-    co2 = await env_service.get_co2_emissions()
+    methane, co2 = await asyncio.gather(
+        env_service.get_methane_emissions(),
+        env_service.get_co2_emissions()
+    )
     
     return {
         "methane": {
@@ -2494,6 +2565,31 @@ async def quick_temperature_summary():
     }
 
 
+@app.get("/api/quick/dashboard")
+async def quick_dashboard_bundle():
+    """All real-data dashboard layers, fetched concurrently"""
+    return Response(content=await real_service.get_dashboard_bundle_json(), media_type="application/json")
+
+
+def _geojson_response(body: bytes, as_seq: bool) -> Response:
+    """Encoded features as one FeatureCollection or a GeoJSON text sequence"""
+    return Response(content=body, media_type="application/geo+json-seq" if as_seq else "application/geo+json")
+
+
+@app.get("/api/quick/fires/geojson")
+async def quick_fires_geojson(country: str = "KAZ", days: int = 7, seq: bool = False):
+    """NASA FIRMS fires as GeoJSON, encoded once per cached download"""
+    return _geojson_response(await real_service.get_fire_data_firms_geojson(country, days, as_seq=seq), seq)
+
+
+@app.get("/api/quick/earthquakes/geojson")
+async def quick_earthquakes_geojson(days: int = 30, min_magnitude: float = 3.0, seq: bool = False):
+    """USGS earthquakes as GeoJSON, encoded once per cached download"""
+    return _geojson_response(
+        await real_service.get_earthquake_data_geojson(days, min_magnitude, as_seq=seq), seq
+    )
+
+
 # WebSocket
 class ConnectionManager:
     def __init__(self):
@@ -2524,4 +2620,20 @@ async def ws_chat(ws: WebSocket):
 if __name__ == "__main__":
     import uvicorn
     print("\n🌍 ApexGIS Platform v2.0\n")
-    uvicorn.run("main:app", host=settings.host, port=settings.port, reload=False)
+    
+    # uvloop + httptools roughly double throughput; uvloop has no Windows build
+    try:
+        import uvloop  # noqa: F401
+        import httptools  # noqa: F401
+        server_options = {"loop": "uvloop", "http": "httptools"}
+    except ImportError:
+        server_options = {}
+    
+    uvicorn.run(
+        "main:app",
+        host=settings.host,
+        port=settings.port,
+        workers=settings.workers,
+        reload=False,
+        **server_options
+    )
@@ -5,23 +5,50 @@ Real data integration from OpenAQ, Sentinel-5P, MODIS, ERA5
 """
 
 from fastapi import APIRouter, HTTPException, Query
-from fastapi.responses import Response
-from typing import Optional, List, Dict, Any
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from typing import Optional, List, Dict, Any, Tuple
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from datetime import datetime, timedelta
 import asyncio
-import random
+import base64
+import logging
+import math
+import tempfile
+import time
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from operator import itemgetter
+
+import numpy as np
+import orjson
 
 # Import our services - using proper Python imports
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from services.environmental_data import EnvironmentalDataService
+from services.environmental_data import EnvironmentalDataService, KAZAKHSTAN_AIR_QUALITY_STATIONS, utc_timestamp
 from services.satellite_data import SatelliteDataService
 from services.visualization import VisualizationService
-from services.report_service import report_generator
+from services.cache import async_ttl_cache, per_second_stamp
+from services.report_service import report_generator, StationRow, MethaneRow, Co2Row, FireRow
+
+
+@asynccontextmanager
+async def _lifespan(app):
+    """Keep the hourly history precompute running while the app is up"""
+    task = asyncio.create_task(_precompute_history_loop())
+    try:
+        yield
+    finally:
+        task.cancel()
+        await asyncio.gather(env_service.close(), sat_service.close(), return_exceptions=True)
+
 
-router = APIRouter(prefix="/api/environmental", tags=["Environmental Data"])
+router = APIRouter(prefix="/api/environmental", tags=["Environmental Data"], lifespan=_lifespan)
+
+logger = logging.getLogger(__name__)
 
 # Initialize services
 env_service = EnvironmentalDataService()
@@ -29,6 +56,427 @@ sat_service = SatelliteDataService()
 viz_service = VisualizationService()
 
 
+# ============================================
+# MAP LAYER TEMPLATES
+# ============================================
+
+# Layer sources are regular inline Mapbox GeoJSON sources. Their data and the
+# top-level "geojson" key hold a slot string that is filled with the
+# FeatureCollection encoded once per response (see _splice_slots).
+_GEOJSON_SLOT = "__GEOJSON__"
+_GEOJSON_SLOT_JSON = orjson.dumps(_GEOJSON_SLOT)
+_GEOJSON_SOURCE = {"type": "geojson", "data": _GEOJSON_SLOT}
+
+# Layer definitions carry no per-request data, so handlers share these
+# module-level objects; treat them as read-only.
+_AIR_QUALITY_LAYER = {
+    "id": "air-quality-stations",
+    "type": "circle",
+    "source": _GEOJSON_SOURCE,
+    "paint": {
+        "circle-radius": [
+            "interpolate", ["linear"], ["get", "aqi"],
+            0, 15,
+            150, 35,
+            300, 50
+        ],
+        "circle-color": ["get", "color"],
+        "circle-opacity": 0.8,
+        "circle-stroke-width": 3,
+        "circle-stroke-color": "#ffffff",
+        "circle-blur": 0.3
+    }
+}
+
+_CO2_LAYERS = [
+    {
+        "id": "co2-sources",
+        "type": "circle",
+        "source": _GEOJSON_SOURCE,
+        "paint": {
+            "circle-radius": [
+                "interpolate", ["linear"], ["get", "emission_mt_year"],
+                1, 15, 10, 30, 30, 50
+            ],
+            "circle-color": ["get", "color"],
+            "circle-opacity": 0.8,
+            "circle-stroke-width": 2,
+            "circle-stroke-color": "#ffffff"
+        }
+    }
+]
+
+_TEMPERATURE_LAYERS = [
+    {
+        "id": "temperature-heatmap",
+        "type": "heatmap",
+        "source": _GEOJSON_SOURCE,
+        "paint": {
+            "heatmap-weight": ["get", "weight"],
+            "heatmap-intensity": 1,
+            "heatmap-radius": ["interpolate", ["linear"], ["zoom"], 4, 30, 8, 50, 12, 80],
+            "heatmap-opacity": 0.8,
+            "heatmap-color": [
+                "interpolate",
+                ["linear"],
+                ["heatmap-density"],
+                0, "rgba(33,102,172,0)",
+                0.2, "rgb(103,169,207)",
+                0.4, "rgb(209,229,240)",
+                0.6, "rgb(253,219,199)",
+                0.8, "rgb(239,138,98)",
+                1, "rgb(178,24,43)"
+            ]
+        }
+    }
+]
+
+_NDVI_LAYERS_JSON = orjson.dumps([
+    {
+        "id": "ndvi-heatmap",
+        "type": "heatmap",
+        "source": _GEOJSON_SOURCE,
+        "paint": {
+            "heatmap-weight": ["interpolate", ["linear"], ["get", "ndvi"], -0.2, 0, 0.8, 1],
+            "heatmap-intensity": 1.2,
+            "heatmap-radius": 25,
+            "heatmap-opacity": 0.85,
+            "heatmap-color": [
+                "interpolate",
+                ["linear"],
+                ["heatmap-density"],
+                0, "rgba(165,0,38,0.6)",
+                0.25, "rgba(215,48,39,0.7)",
+                0.5, "rgba(254,224,139,0.8)",
+                0.75, "rgba(102,189,99,0.85)",
+                1, "rgba(0,104,55,0.9)"
+            ]
+        }
+    }
+])
+
+_LST_LAYERS_JSON = orjson.dumps([
+    {
+        "id": "lst-heatmap",
+        "type": "heatmap",
+        "source": _GEOJSON_SOURCE,
+        "paint": {
+            "heatmap-weight": ["interpolate", ["linear"], ["get", "lst"], 10, 0.2, 40, 1],
+            "heatmap-intensity": 1.5,
+            "heatmap-radius": 30,
+            "heatmap-opacity": 0.75,
+            "heatmap-color": [
+                "interpolate",
+                ["linear"],
+                ["heatmap-density"],
+                0, "rgba(0,0,128,0)",
+                0.2, "rgba(0,128,255,0.6)",
+                0.4, "rgba(0,255,128,0.7)",
+                0.6, "rgba(255,255,0,0.8)",
+                0.8, "rgba(255,128,0,0.85)",
+                1, "rgba(255,0,0,0.9)"
+            ]
+        }
+    }
+])
+
+_FIRE_LAYERS_JSON = orjson.dumps([
+    {
+        "id": "fire-points",
+        "type": "circle",
+        "source": _GEOJSON_SOURCE,
+        "paint": {
+            "circle-radius": ["interpolate", ["linear"], ["get", "frp"], 10, 8, 100, 20, 500, 35],
+            "circle-color": [
+                "interpolate",
+                ["linear"],
+                ["get", "confidence"],
+                30, "#fbbf24",
+                60, "#f97316",
+                90, "#dc2626"
+            ],
+            "circle-opacity": 0.9,
+            "circle-stroke-width": 2,
+            "circle-stroke-color": "#7c2d12",
+            "circle-blur": 0.2
+        }
+    }
+])
+
+# Static layer wrappers are encoded once and spliced into the placeholder slot.
+_LAYERS_SLOT = "__MAP_LAYERS__"
+_LAYERS_SLOT_JSON = orjson.dumps(_LAYERS_SLOT)
+_HEATMAP_SLOT = "__HEATMAP_LAYER__"
+_HEATMAP_SLOT_JSON = orjson.dumps(_HEATMAP_SLOT)
+_LEGEND_SLOT = "__LEGEND__"
+_LEGEND_SLOT_JSON = orjson.dumps(_LEGEND_SLOT)
+_ANIMATION_SLOT = "__ANIMATION_CONFIG__"
+_ANIMATION_SLOT_JSON = orjson.dumps(_ANIMATION_SLOT)
+
+_METHANE_LAYERS_JSON = orjson.dumps([
+    {
+        "id": "methane-hotspots",
+        "type": "fill",
+        "source": _GEOJSON_SOURCE,
+        "paint": {
+            "fill-color": ["get", "color"],
+            "fill-opacity": ["get", "opacity"],
+            "fill-outline-color": "#ffffff"
+        }
+    }
+])
+
+_NDVI_LEGEND_JSON = orjson.dumps({
+    "title": "NDVI - Vegetation Health",
+    "items": [
+        {"color": "#006837", "label": "Dense Vegetation (0.6-1.0)"},
+        {"color": "#66bd63", "label": "Healthy Vegetation (0.3-0.6)"},
+        {"color": "#fee08b", "label": "Sparse Vegetation (0.1-0.3)"},
+        {"color": "#d73027", "label": "Bare Soil (-0.1-0.1)"},
+        {"color": "#a50026", "label": "Water/Snow (<-0.1)"}
+    ]
+})
+
+_FIRE_ANIMATION_JSON = orjson.dumps({
+    "type": "pulse",
+    "duration": 1500,
+    "property": "circle-radius",
+    "min_scale": 0.8,
+    "max_scale": 1.4
+})
+
+
+# ============================================
+# RESPONSE CACHE
+# ============================================
+
+# Serialized response bodies keyed by endpoint and normalized query params.
+# Entries are per process and expire after the endpoint's TTL.
+_response_cache: Dict[str, Tuple[float, bytes]] = {}
+_RESPONSE_CACHE_MAX_ENTRIES = 512
+
+AIR_QUALITY_TTL = 60
+METHANE_TTL = 300
+CO2_TTL = 300
+TEMPERATURE_TTL = 600
+DASHBOARD_TTL = 60
+
+
+def _cached_response(key: str) -> Optional[Response]:
+    """Return the cached body for key as a Response, if still fresh"""
+    entry = _response_cache.get(key)
+    if entry is None or entry[0] <= time.monotonic():
+        return None
+    return Response(content=entry[1], media_type="application/json")
+
+
+def _cache_response(key: str, ttl: float, response: Response) -> Response:
+    """Store the rendered body of response under key for ttl seconds"""
+    now = time.monotonic()
+    if len(_response_cache) >= _RESPONSE_CACHE_MAX_ENTRIES:
+        for stale in [k for k, (expires, _) in _response_cache.items() if expires <= now]:
+            del _response_cache[stale]
+        if len(_response_cache) >= _RESPONSE_CACHE_MAX_ENTRIES:
+            _response_cache.clear()
+    _response_cache[key] = (now + ttl, response.body)
+    return response
+
+
+def _key_part(value: Any, ndigits: Optional[int] = None) -> str:
+    """Normalize an optional query value for use in a cache key"""
+    if value is None:
+        return "_"
+    return str(value if ndigits is None else round(value, ndigits))
+
+
+# ============================================
+# FEATURE PROPERTY PROJECTIONS
+# ============================================
+
+# Flat station/hotspot/source records are projected out of GeoJSON properties
+# with one itemgetter call per feature; the geometry coordinates go last.
+_STATION_FIELDS = ("id", "name", "city", "aqi", "category", "color",
+                   "health_implications", "pollutants", "elevation", "timestamp", "coordinates")
+_STATION_KEYS = itemgetter(*_STATION_FIELDS[:-1])
+
+_HOTSPOT_FIELDS = ("id", "name", "type", "emission_rate_kt_year", "concentration_ppb",
+                   "trend", "area_km2", "coordinates")
+_HOTSPOT_KEYS = itemgetter("id", "name", "source_type", "emission_rate_kt_year",
+                           "concentration_ppb", "trend", "area_km2")
+
+_CO2_SOURCE_FIELDS = ("id", "name", "type", "annual_emissions_mt", "fuel_type",
+                      "capacity", "color", "coordinates")
+_CO2_SOURCE_KEYS = itemgetter("id", "name", "facility_type", "emission_mt_year",
+                              "fuel_type", "capacity", "color")
+
+
+def _feature_coordinates(feature: Dict[str, Any]) -> List[float]:
+    """Geometry coordinates of a feature, or [0, 0] if it has no geometry"""
+    try:
+        return feature["geometry"]["coordinates"]
+    except (KeyError, TypeError):
+        return [0, 0]
+
+
+def _pack_coordinates(features: List[Dict[str, Any]]) -> str:
+    """
+    Base64 of little-endian float32 [lon, lat] pairs for Point features, in
+    feature order, for clients that feed typed arrays straight to the GPU.
+    """
+    coords = np.fromiter(
+        (c for f in features for c in f["geometry"]["coordinates"][:2]), dtype="<f4", count=2 * len(features)
+    )
+    return base64.b64encode(coords.tobytes()).decode("ascii")
+
+
+# Representative [lon, lat] per geometry type: the point itself or the first
+# vertex of the (first) outer ring.
+_ANCHOR_COORDINATES = {
+    "Point": lambda g: g["coordinates"],
+    "Polygon": lambda g: g["coordinates"][0][0],
+    "MultiPolygon": lambda g: g["coordinates"][0][0][0]
+}
+
+
+# Same options ORJSONResponse renders with: NumPy arrays are encoded straight
+# from their buffers, no .tolist() round trip
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _splice_slots(payload: Dict[str, Any], slots: Dict[bytes, bytes],
+                  geojson: Optional[Dict[str, Any]] = None) -> Response:
+    """
+    Encode payload, filling each encoded slot string with pre-encoded bytes.
+    With geojson, every GeoJSON slot (the top-level key and the layer
+    sources) is filled with that collection, encoded once.
+    """
+    body = orjson.dumps(payload, option=_ORJSON_OPTIONS)
+    for slot_json, value_json in slots.items():
+        body = body.replace(slot_json, value_json, 1)
+    if geojson is not None:
+        body = body.replace(_GEOJSON_SLOT_JSON, orjson.dumps(geojson, option=_ORJSON_OPTIONS))
+    return Response(content=body, media_type="application/json")
+
+
+def _splice_layers(payload: Dict[str, Any], layers_json: bytes,
+                   geojson: Optional[Dict[str, Any]] = None) -> Response:
+    """Encode payload, filling the layer and GeoJSON slots with pre-encoded bytes"""
+    return _splice_slots(payload, {_LAYERS_SLOT_JSON: layers_json}, geojson)
+
+
+# ============================================
+# AIR QUALITY HISTORY PRECOMPUTE
+# ============================================
+
+# History is generated once per (station, days, hour) and served from the
+# response cache; a background task fills the current hour for every known
+# station so requests never pay for generation.
+HISTORY_TTL = 3600
+HISTORY_PRECOMPUTE_DAYS = (7,)
+
+
+# Per-context NumPy generators avoid the lock around the legacy global
+# RandomState that np.random.uniform shares across threads.
+_history_rng: ContextVar[np.random.Generator] = ContextVar("history_rng")
+
+
+def _get_history_rng() -> np.random.Generator:
+    rng = _history_rng.get(None)
+    if rng is None:
+        rng = np.random.default_rng()
+        _history_rng.set(rng)
+    return rng
+
+
+def _generate_history(days: int, now: datetime) -> Dict[str, Any]:
+    """
+    Hourly synthetic history columns ending at now, oldest first.
+    Numeric columns are NumPy arrays; they are serialized as-is by orjson.
+    """
+    rng = _get_history_rng()
+    n = max(days, 0) * 24  # Hourly data
+    hours_ago = np.arange(n - 1, -1, -1)
+    hour_of_day = (now.hour - hours_ago) % 24
+    base_aqi = 45 + (15 * (1 + 0.5 * (hour_of_day - 12) / 12))  # Daily pattern
+    
+    return {
+        "timestamps": _hourly_isoformat(now, hours_ago),
+        "aqi": np.round(base_aqi + rng.uniform(-10, 10, n)).astype(np.int64),
+        "pm25": np.round(12 + rng.uniform(-3, 5, n), 1),
+        "pm10": np.round(25 + rng.uniform(-5, 10, n), 1),
+        "no2": np.round(18 + rng.uniform(-5, 8, n), 1),
+        "o3": np.round(35 + rng.uniform(-10, 15, n), 1)
+    }
+
+
+def _hourly_isoformat(now: datetime, hours_ago: np.ndarray) -> List[str]:
+    """
+    ISO timestamps for now minus each hour offset. Only the date-hour prefix
+    differs between samples, so it is formatted in one vectorized call and
+    joined to the shared minute/second tail of now.isoformat().
+    """
+    base = np.datetime64(now.replace(minute=0, second=0, microsecond=0), "h")
+    prefixes = np.datetime_as_string(base - hours_ago.astype("timedelta64[h]"), unit="h")
+    tail = now.isoformat()[13:]
+    return [prefix + tail for prefix in prefixes.tolist()]
+
+
+def _history_cache_key(station_id: str, days: int, now: datetime) -> str:
+    return f"aq_history:{station_id}:{days}:{now:%Y%m%d%H}"
+
+
+def _cache_history(cache_key: str, station_id: str, days: int, now: datetime) -> Response:
+    """Generate, encode and cache the history envelope for one station"""
+    history = _generate_history(days, now)
+    return _cache_response(cache_key, HISTORY_TTL, ORJSONResponse({
+        "status": "success",
+        "station_id": station_id,
+        "period_days": days,
+        "data_points": len(history["timestamps"]),
+        "history": history,
+        "chart_config": {
+            "type": "line",
+            "title": f"Air Quality History - {station_id}",
+            "labels": [t[:16] for t in history["timestamps"][::6]],  # Every 6 hours
+            "datasets": [
+                {
+                    "label": "AQI",
+                    "data": np.ascontiguousarray(history["aqi"][::6]),
+                    "borderColor": "#ef4444",
+                    "fill": False
+                },
+                {
+                    "label": "PM2.5",
+                    "data": np.ascontiguousarray(history["pm25"][::6]),
+                    "borderColor": "#f59e0b",
+                    "fill": False
+                },
+                {
+                    "label": "PM10",
+                    "data": np.ascontiguousarray(history["pm10"][::6]),
+                    "borderColor": "#3b82f6",
+                    "fill": False
+                }
+            ]
+        }
+    }))
+
+
+async def _precompute_history_loop():
+    """Fill the history cache for every known station at the top of each hour"""
+    while True:
+        now = datetime.now()
+        try:
+            for station_id in KAZAKHSTAN_AIR_QUALITY_STATIONS:
+                for days in HISTORY_PRECOMPUTE_DAYS:
+                    cache_key = _history_cache_key(station_id, days, now)
+                    if _cached_response(cache_key) is None:
+                        _cache_history(cache_key, station_id, days, now)
+        except Exception:
+            logger.exception("Air quality history precompute failed")
+        await asyncio.sleep(3600 - now.minute * 60 - now.second)
+
+
 # ============================================
 # AIR QUALITY ENDPOINTS
 # ============================================
@@ -44,64 +492,40 @@ async def get_air_quality(
     Get real-time air quality data from monitoring stations.
     Returns AQI, pollutant levels, health recommendations.
     """
+    # Stations are selected by city only; lat/lon/radius_km do not change the
+    # body, so they stay out of the key
+    cache_key = f"airquality:{_key_part(city)}"
+    cached = _cached_response(cache_key)
+    if cached is not None:
+        return cached
+    
     try:
-        print("[DEBUG] Starting air quality request...")
-        data = await env_service.get_realtime_air_quality(city=city, lat=lat, lon=lon, radius_km=radius_km)
-        print(f"[DEBUG] Got {len(data.get('features', []))} features from service")
-        
-        # Extract stations from features for easy access
+        # Project each station record as its feature is produced, then wrap
+        # the collected features once for the GeoJSON field
+        timestamp = utc_timestamp()
+        features = []
         stations = []
-        for feature in data["features"]:
-            props = feature["properties"]
-            stations.append({
-                "id": props["id"],
-                "name": props["name"],
-                "city": props["city"],
-                "aqi": props["aqi"],
-                "category": props["category"],
-                "color": props["color"],
-                "health_implications": props["health_implications"],
-                "pollutants": props["pollutants"],
-                "coordinates": feature["geometry"]["coordinates"],
-                "elevation": props["elevation"],
-                "timestamp": props["timestamp"]
-            })
-        
-        print(f"[DEBUG] Processed {len(stations)} stations")
-        print(f"[DEBUG] Creating response...")
+        for f in env_service.iter_realtime_air_quality(city=city, timestamp=timestamp):
+            features.append(f)
+            stations.append(dict(zip(_STATION_FIELDS, _STATION_KEYS(f["properties"]) + (f["geometry"]["coordinates"],))))
+        data = env_service.air_quality_collection(features, timestamp)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Got %d air quality features from service", len(features))
         
         response = {
             "status": "success",
             "timestamp": data["metadata"]["timestamp"],
             "metadata": data["metadata"],
             "stations": stations,
-            "geojson": data,  # Already properly formatted
-            "map_layer": {
-                "id": "air-quality-stations",
-                "type": "circle",
-                "source": {
-                    "type": "geojson",
-                    "data": data
-                },
-                "paint": {
-                    "circle-radius": [
-                        "interpolate", ["linear"], ["get", "aqi"],
-                        0, 15,
-                        150, 35,
-                        300, 50
-                    ],
-                    "circle-color": ["get", "color"],
-                    "circle-opacity": 0.8,
-                    "circle-stroke-width": 3,
-                    "circle-stroke-color": "#ffffff",
-                    "circle-blur": 0.3
-                }
-            },
-            "heatmap_layer": create_aqi_heatmap(data["features"])
+            "geojson": _GEOJSON_SLOT,  # Already properly formatted
+            "coords_f32_b64": _pack_coordinates(features),
+            "map_layer": _AIR_QUALITY_LAYER,
+            "heatmap_layer": _HEATMAP_SLOT
         }
         
-        print(f"[DEBUG] Response created successfully")
-        return response
+        return _cache_response(cache_key, AIR_QUALITY_TTL, _splice_slots(
+            response, {_HEATMAP_SLOT_JSON: _AQI_HEATMAP_LAYER_JSON}, data
+        ))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -109,59 +533,34 @@ async def get_air_quality(
 @router.get("/air-quality/history")
 async def get_air_quality_history(
     station_id: str = Query(..., description="Station ID"),
-    days: int = Query(7, description="Number of days of history")
+    days: int = Query(7, description="Number of days of history"),
+    stream: bool = Query(False, description="Stream only the history columns as they are encoded")
 ):
-    """Get historical air quality data for charting"""
+    """
+    Get historical air quality data for charting.
+    "history" is columnar: parallel "timestamps", "aqi", "pm25", "pm10",
+    "no2" and "o3" lists, one entry per hour, oldest first.
+    """
     try:
-        # Generate realistic historical data
-        history = []
         now = datetime.now()
         
-        for i in range(days * 24):  # Hourly data
-            timestamp = now - timedelta(hours=i)
-            base_aqi = 45 + (15 * (1 + 0.5 * (timestamp.hour - 12) / 12))  # Daily pattern
+        if stream:
+            history = _generate_history(days, now)
             
-            history.append({
-                "timestamp": timestamp.isoformat(),
-                "aqi": round(base_aqi + random.uniform(-10, 10)),
-                "pm25": round(12 + random.uniform(-3, 5), 1),
-                "pm10": round(25 + random.uniform(-5, 10), 1),
-                "no2": round(18 + random.uniform(-5, 8), 1),
-                "o3": round(35 + random.uniform(-10, 15), 1)
-            })
+            async def encode_history():
+                yield b'{"history":{'
+                for index, (column, values) in enumerate(history.items()):
+                    yield (b"," if index else b"") + orjson.dumps(column) + b":" + orjson.dumps(values, option=_ORJSON_OPTIONS)
+                yield b"}}"
+            
+            return StreamingResponse(encode_history(), media_type="application/json")
         
-        return {
-            "status": "success",
-            "station_id": station_id,
-            "period_days": days,
-            "data_points": len(history),
-            "history": list(reversed(history)),
-            "chart_config": {
-                "type": "line",
-                "title": f"Air Quality History - {station_id}",
-                "labels": [h["timestamp"][:16] for h in reversed(history)][::6],  # Every 6 hours
-                "datasets": [
-                    {
-                        "label": "AQI",
-                        "data": [h["aqi"] for h in reversed(history)][::6],
-                        "borderColor": "#ef4444",
-                        "fill": False
-                    },
-                    {
-                        "label": "PM2.5",
-                        "data": [h["pm25"] for h in reversed(history)][::6],
-                        "borderColor": "#f59e0b",
-                        "fill": False
-                    },
-                    {
-                        "label": "PM10",
-                        "data": [h["pm10"] for h in reversed(history)][::6],
-                        "borderColor": "#3b82f6",
-                        "fill": False
-                    }
-                ]
-            }
-        }
+        # Served from the hourly precompute for known stations
+        cache_key = _history_cache_key(station_id, days, now)
+        cached = _cached_response(cache_key)
+        if cached is not None:
+            return cached
+        return _cache_history(cache_key, station_id, days, now)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -179,50 +578,32 @@ async def get_methane_emissions(
     Get methane emission data from Sentinel-5P and ground monitoring.
     Includes emission hotspots, plume visualization, and trend analysis.
     """
+    cache_key = f"methane:{_key_part(region)}:{_key_part(source_type)}"
+    cached = _cached_response(cache_key)
+    if cached is not None:
+        return cached
+    
     try:
         data = await env_service.get_methane_emissions()
         
         # Extract hotspots from features
-        hotspots = []
-        for feature in data["features"]:
-            props = feature["properties"]
-            hotspots.append({
-                "id": props["id"],
-                "name": props["name"],
-                "type": props["source_type"],
-                "emission_rate_kt_year": props["emission_rate_kt_year"],
-                "concentration_ppb": props.get("concentration_ppb", 1900),
-                "trend": props.get("trend", "stable"),
-                "coordinates": feature["geometry"]["coordinates"][0][0] if feature["geometry"]["type"] == "Polygon" else feature["geometry"]["coordinates"],
-                "area_km2": props.get("area_km2", 100)
-            })
+        hotspots = [
+            dict(zip(_HOTSPOT_FIELDS, _HOTSPOT_KEYS(f["properties"]) + (_ANCHOR_COORDINATES[f["geometry"]["type"]](f["geometry"]),)))
+            for f in data["features"]
+        ]
         
         # Calculate total emissions
         total_emissions = sum(h["emission_rate_kt_year"] for h in hotspots)
         
-        return {
+        return _cache_response(cache_key, METHANE_TTL, _splice_layers({
             "status": "success",
             "timestamp": data["metadata"]["timestamp"],
             "metadata": data["metadata"],
             "total_emissions_mt": round(total_emissions / 1000, 2),
             "hotspots": hotspots,
-            "geojson": data,  # Already in GeoJSON format
-            "map_layers": [
-                {
-                    "id": "methane-hotspots",
-                    "type": "fill",
-                    "source": {
-                        "type": "geojson",
-                        "data": data
-                    },
-                    "paint": {
-                        "fill-color": ["get", "color"],
-                        "fill-opacity": ["get", "opacity"],
-                        "fill-outline-color": "#ffffff"
-                    }
-                }
-            ]
-        }
+            "geojson": _GEOJSON_SLOT,  # Already in GeoJSON format
+            "map_layers": _LAYERS_SLOT
+        }, _METHANE_LAYERS_JSON, data))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -239,59 +620,35 @@ async def get_co2_emissions(
     Get CO2 emission data from major sources.
     Includes industrial facilities, power plants, and urban areas.
     """
+    cache_key = f"co2:{_key_part(sector)}"
+    cached = _cached_response(cache_key)
+    if cached is not None:
+        return cached
+    
     try:
         data = await env_service.get_co2_emissions()
         
         # Extract sources from features
         sources = []
-        by_sector = {}
+        by_sector = defaultdict(int)
         for feature in data["features"]:
             props = feature["properties"]
-            sources.append({
-                "id": props["id"],
-                "name": props["name"],
-                "type": props["facility_type"],
-                "annual_emissions_mt": props["emission_mt_year"],
-                "coordinates": feature["geometry"]["coordinates"],
-                "fuel_type": props.get("fuel_type", "mixed"),
-                "capacity": props.get("capacity"),
-                "color": props.get("color", "#ef4444")
-            })
+            sources.append(dict(zip(
+                _CO2_SOURCE_FIELDS, _CO2_SOURCE_KEYS(props) + (feature["geometry"]["coordinates"],)
+            )))
             # Aggregate by sector/type
-            sector_type = props["facility_type"]
-            if sector_type not in by_sector:
-                by_sector[sector_type] = 0
-            by_sector[sector_type] += props["emission_mt_year"]
+            by_sector[props["facility_type"]] += props["emission_mt_year"]
         
-        return {
+        return _cache_response(cache_key, CO2_TTL, _splice_slots({
             "status": "success",
             "timestamp": data["metadata"]["timestamp"],
             "metadata": data["metadata"],
             "total_emissions_mt": data["metadata"]["total_emissions_mt_year"],
             "sources": sources,
             "by_sector": by_sector,
-            "geojson": data,  # Already in GeoJSON format
-            "map_layers": [
-                {
-                    "id": "co2-sources",
-                    "type": "circle",
-                    "source": {
-                        "type": "geojson",
-                        "data": data
-                    },
-                    "paint": {
-                        "circle-radius": [
-                            "interpolate", ["linear"], ["get", "emission_mt_year"],
-                            1, 15, 10, 30, 30, 50
-                        ],
-                        "circle-color": ["get", "color"],
-                        "circle-opacity": 0.8,
-                        "circle-stroke-width": 2,
-                        "circle-stroke-color": "#ffffff"
-                    }
-                }
-            ]
-        }
+            "geojson": _GEOJSON_SLOT,  # Already in GeoJSON format
+            "map_layers": _CO2_LAYERS
+        }, {}, data))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -303,72 +660,61 @@ async def get_co2_emissions(
 @router.get("/temperature")
 async def get_temperature_data(
     resolution: str = Query("medium", description="Grid resolution: low, medium, high"),
-    include_anomaly: bool = Query(True, description="Include temperature anomaly data")
+    include_anomaly: bool = Query(True, description="Include temperature anomaly data"),
+    stream: bool = Query(False, description="Stream only the grid features as NDJSON")
 ):
     """
     Get temperature data grid from ERA5 reanalysis.
     Includes current temperature, anomalies, and historical trends.
     """
+    if stream:
+        return StreamingResponse(env_service.stream_temperature_ndjson(), media_type="application/x-ndjson")
+    
+    cache_key = f"temperature:{resolution}"
+    cached = _cached_response(cache_key)
+    if cached is not None:
+        return cached
+    
     try:
         data = await env_service.get_temperature_data(resolution)
         
-        # Calculate summary stats from features
-        temps = [f["properties"]["temperature"] for f in data["features"]]
-        
-        # Group by climate zone
-        zones = {}
+        # Summary stats and per-climate-zone [sum, count] in one pass
+        t_min = math.inf
+        t_max = -math.inf
+        t_sum = 0.0
+        t_count = 0
+        zones = defaultdict(lambda: [0, 0])
         for f in data["features"]:
-            zone = f["properties"]["climate_zone"]
-            if zone not in zones:
-                zones[zone] = {"temps": [], "name": zone}
-            zones[zone]["temps"].append(f["properties"]["temperature"])
-        
-        climate_zones = []
-        for zone_name, zone_data in zones.items():
-            climate_zones.append({
-                "name": zone_name,
-                "avg_temp": round(sum(zone_data["temps"]) / len(zone_data["temps"]), 1) if zone_data["temps"] else 0
-            })
+            props = f["properties"]
+            t = props["temperature"]
+            if t < t_min:
+                t_min = t
+            if t > t_max:
+                t_max = t
+            t_sum += t
+            t_count += 1
+            zone_totals = zones[props["climate_zone"]]
+            zone_totals[0] += t
+            zone_totals[1] += 1
         
-        return {
+        climate_zones = [
+            {"name": zone_name, "avg_temp": round(zone_sum / zone_count, 1)}
+            for zone_name, (zone_sum, zone_count) in zones.items()
+        ]
+        
+        return _cache_response(cache_key, TEMPERATURE_TTL, _splice_slots({
             "status": "success",
             "timestamp": data["metadata"]["timestamp"],
             "metadata": data["metadata"],
             "summary": {
-                "min_temp": min(temps) if temps else -20,
-                "max_temp": max(temps) if temps else 30,
-                "avg_temp": round(sum(temps) / len(temps), 1) if temps else 0
+                "min_temp": t_min if t_count else -20,
+                "max_temp": t_max if t_count else 30,
+                "avg_temp": round(t_sum / t_count, 1) if t_count else 0
             },
             "climate_zones": climate_zones,
-            "geojson": data,  # Already in GeoJSON format
-            "map_layers": [
-                {
-                    "id": "temperature-heatmap",
-                    "type": "heatmap",
-                    "source": {
-                        "type": "geojson",
-                        "data": data
-                    },
-                    "paint": {
-                        "heatmap-weight": ["get", "weight"],
-                        "heatmap-intensity": 1,
-                        "heatmap-radius": ["interpolate", ["linear"], ["zoom"], 4, 30, 8, 50, 12, 80],
-                        "heatmap-opacity": 0.8,
-                        "heatmap-color": [
-                            "interpolate",
-                            ["linear"],
-                            ["heatmap-density"],
-                            0, "rgba(33,102,172,0)",
-                            0.2, "rgb(103,169,207)",
-                            0.4, "rgb(209,229,240)",
-                            0.6, "rgb(253,219,199)",
-                            0.8, "rgb(239,138,98)",
-                            1, "rgb(178,24,43)"
-                        ]
-                    }
-                }
-            ]
-        }
+            "geojson": _GEOJSON_SLOT,  # Already in GeoJSON format
+            "map_layers": _TEMPERATURE_LAYERS
+        }, {}, data))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -390,14 +736,17 @@ async def get_ndvi_data(
     try:
         data = await sat_service.calculate_ndvi_layer([lon, lat], radius_km)
         
+        grid = data["ndvi_grid"]
+        colors = get_ndvi_colors([point["ndvi"] for point in grid])
+        
         features = []
-        for point in data["ndvi_grid"]:
+        for point, color in zip(grid, colors):
             features.append({
                 "type": "Feature",
                 "properties": {
                     "ndvi": point["ndvi"],
                     "vegetation_class": point["class"],
-                    "color": get_ndvi_color(point["ndvi"])
+                    "color": color
                 },
                 "geometry": {
                     "type": "Point",
@@ -405,51 +754,16 @@ async def get_ndvi_data(
                 }
             })
         
-        return {
+        geojson = {"type": "FeatureCollection", "features": features}
+        return _splice_slots({
             "status": "success",
             "timestamp": data["timestamp"],
             "summary": data["summary"],
-            "geojson": {
-                "type": "FeatureCollection",
-                "features": features
-            },
-            "map_layers": [
-                {
-                    "id": "ndvi-heatmap",
-                    "type": "heatmap",
-                    "source": {
-                        "type": "geojson",
-                        "data": {"type": "FeatureCollection", "features": features}
-                    },
-                    "paint": {
-                        "heatmap-weight": ["interpolate", ["linear"], ["get", "ndvi"], -0.2, 0, 0.8, 1],
-                        "heatmap-intensity": 1.2,
-                        "heatmap-radius": 25,
-                        "heatmap-opacity": 0.85,
-                        "heatmap-color": [
-                            "interpolate",
-                            ["linear"],
-                            ["heatmap-density"],
-                            0, "rgba(165,0,38,0.6)",
-                            0.25, "rgba(215,48,39,0.7)",
-                            0.5, "rgba(254,224,139,0.8)",
-                            0.75, "rgba(102,189,99,0.85)",
-                            1, "rgba(0,104,55,0.9)"
-                        ]
-                    }
-                }
-            ],
-            "legend": {
-                "title": "NDVI - Vegetation Health",
-                "items": [
-                    {"color": "#006837", "label": "Dense Vegetation (0.6-1.0)"},
-                    {"color": "#66bd63", "label": "Healthy Vegetation (0.3-0.6)"},
-                    {"color": "#fee08b", "label": "Sparse Vegetation (0.1-0.3)"},
-                    {"color": "#d73027", "label": "Bare Soil (-0.1-0.1)"},
-                    {"color": "#a50026", "label": "Water/Snow (<-0.1)"}
-                ]
-            }
-        }
+            "geojson": _GEOJSON_SLOT,
+            "coords_f32_b64": _pack_coordinates(features),
+            "map_layers": _LAYERS_SLOT,
+            "legend": _LEGEND_SLOT
+        }, {_LAYERS_SLOT_JSON: _NDVI_LAYERS_JSON, _LEGEND_SLOT_JSON: _NDVI_LEGEND_JSON}, geojson)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -482,42 +796,15 @@ async def get_land_surface_temperature(
                 }
             })
         
-        return {
+        geojson = {"type": "FeatureCollection", "features": features}
+        return _splice_layers({
             "status": "success",
             "timestamp": data["timestamp"],
             "summary": data["summary"],
-            "geojson": {
-                "type": "FeatureCollection",
-                "features": features
-            },
-            "map_layers": [
-                {
-                    "id": "lst-heatmap",
-                    "type": "heatmap",
-                    "source": {
-                        "type": "geojson",
-                        "data": {"type": "FeatureCollection", "features": features}
-                    },
-                    "paint": {
-                        "heatmap-weight": ["interpolate", ["linear"], ["get", "lst"], 10, 0.2, 40, 1],
-                        "heatmap-intensity": 1.5,
-                        "heatmap-radius": 30,
-                        "heatmap-opacity": 0.75,
-                        "heatmap-color": [
-                            "interpolate",
-                            ["linear"],
-                            ["heatmap-density"],
-                            0, "rgba(0,0,128,0)",
-                            0.2, "rgba(0,128,255,0.6)",
-                            0.4, "rgba(0,255,128,0.7)",
-                            0.6, "rgba(255,255,0,0.8)",
-                            0.8, "rgba(255,128,0,0.85)",
-                            1, "rgba(255,0,0,0.9)"
-                        ]
-                    }
-                }
-            ]
-        }
+            "geojson": _GEOJSON_SLOT,
+            "coords_f32_b64": _pack_coordinates(features),
+            "map_layers": _LAYERS_SLOT
+        }, _LST_LAYERS_JSON, geojson)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -551,48 +838,17 @@ async def get_fire_data(
                 }
             })
         
-        return {
+        geojson = {"type": "FeatureCollection", "features": features}
+        return _splice_slots({
             "status": "success",
             "timestamp": data["timestamp"],
             "summary": data["summary"],
             "fires": data["fires"],
-            "geojson": {
-                "type": "FeatureCollection",
-                "features": features
-            },
-            "map_layers": [
-                {
-                    "id": "fire-points",
-                    "type": "circle",
-                    "source": {
-                        "type": "geojson",
-                        "data": {"type": "FeatureCollection", "features": features}
-                    },
-                    "paint": {
-                        "circle-radius": ["interpolate", ["linear"], ["get", "frp"], 10, 8, 100, 20, 500, 35],
-                        "circle-color": [
-                            "interpolate",
-                            ["linear"],
-                            ["get", "confidence"],
-                            30, "#fbbf24",
-                            60, "#f97316",
-                            90, "#dc2626"
-                        ],
-                        "circle-opacity": 0.9,
-                        "circle-stroke-width": 2,
-                        "circle-stroke-color": "#7c2d12",
-                        "circle-blur": 0.2
-                    }
-                }
-            ],
-            "animation_config": {
-                "type": "pulse",
-                "duration": 1500,
-                "property": "circle-radius",
-                "min_scale": 0.8,
-                "max_scale": 1.4
-            }
-        }
+            "geojson": _GEOJSON_SLOT,
+            "coords_f32_b64": _pack_coordinates(features),
+            "map_layers": _LAYERS_SLOT,
+            "animation_config": _ANIMATION_SLOT
+        }, {_LAYERS_SLOT_JSON: _FIRE_LAYERS_JSON, _ANIMATION_SLOT_JSON: _FIRE_ANIMATION_JSON}, geojson)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -667,20 +923,66 @@ async def get_pollution_flow(
 # COMBINED ENVIRONMENTAL DASHBOARD
 # ============================================
 
+# Status labels are looked up by bisecting inclusive upper bounds, so a value
+# equal to a break point stays in the lower band.
+_AQI_STATUS_BREAKS = (50, 100)
+_AQI_STATUS = ("Good", "Moderate", "Unhealthy")
+_METHANE_STATUS_BREAKS = (1000, 2000)
+_CO2_STATUS_BREAKS = (50, 100)
+_EMISSION_STATUS = ("Low", "Moderate", "High")
+
+# Each dashboard source gets a bounded wait. On timeout the last good payload
+# is served and the slow call keeps running in the background to refresh it.
+DASHBOARD_SOURCE_TIMEOUT = 1.5
+_dashboard_last_good: Dict[str, Dict[str, Any]] = {}
+_dashboard_refreshes: set = set()
+
+
+def _remember_dashboard_source(name: str, task: "asyncio.Task") -> None:
+    """Done-callback storing a background refresh result as last good"""
+    _dashboard_refreshes.discard(task)
+    if not task.cancelled() and task.exception() is None:
+        _dashboard_last_good[name] = task.result()
+
+
+async def _fetch_dashboard_source(name: str, coro) -> Tuple[Dict[str, Any], bool]:
+    """Await one dashboard source; returns (payload, is_stale)"""
+    task = asyncio.ensure_future(coro)
+    try:
+        result = await asyncio.wait_for(asyncio.shield(task), DASHBOARD_SOURCE_TIMEOUT)
+    except asyncio.TimeoutError:
+        stale = _dashboard_last_good.get(name)
+        if stale is None:
+            # Nothing to fall back to yet: wait for the real answer
+            result = await task
+        else:
+            _dashboard_refreshes.add(task)
+            task.add_done_callback(lambda t: _remember_dashboard_source(name, t))
+            return stale, True
+    _dashboard_last_good[name] = result
+    return result, False
+
+
 @router.get("/dashboard")
 async def get_environmental_dashboard():
     """
     Get comprehensive environmental dashboard data.
     Combines all environmental indicators into one response.
     """
+    cached = _cached_response("dashboard:global")
+    if cached is not None:
+        return cached
+    
     try:
-        # Fetch all data in parallel
-        air_quality, methane, co2, temperature = await asyncio.gather(
-            env_service.get_realtime_air_quality(),
-            env_service.get_methane_emissions(),
-            env_service.get_co2_emissions(),
-            env_service.get_temperature_data()
+        # Fetch all data in parallel, each bounded by DASHBOARD_SOURCE_TIMEOUT
+        sources = await asyncio.gather(
+            _fetch_dashboard_source("air_quality", env_service.get_realtime_air_quality()),
+            _fetch_dashboard_source("methane", env_service.get_methane_emissions()),
+            _fetch_dashboard_source("co2", env_service.get_co2_emissions()),
+            _fetch_dashboard_source("temperature", env_service.get_temperature_data())
         )
+        air_quality, methane, co2, temperature = (payload for payload, _ in sources)
+        stale = any(is_stale for _, is_stale in sources)
         
         # Extract data from GeoJSON format
         aq_features = air_quality.get("features", [])
@@ -688,33 +990,32 @@ async def get_environmental_dashboard():
         co2_features = co2.get("features", [])
         temp_features = temperature.get("features", [])
         
-        # Calculate summaries
-        aq_aqis = [f["properties"].get("aqi", 0) for f in aq_features]
-        avg_aqi = sum(aq_aqis) / len(aq_aqis) if aq_aqis else 0
-        
+        # Calculate summaries in a single pass per feature list
+        aqis = np.fromiter((f["properties"].get("aqi", 0) for f in aq_features), dtype=np.float64, count=len(aq_features))
+        avg_aqi = float(aqis.mean()) if aqis.size else 0.0
         methane_emissions = sum(f["properties"].get("emission_rate_kt_year", 0) for f in methane_features)
         co2_emissions = sum(f["properties"].get("emission_mt_year", 0) for f in co2_features)
-        temps = [f["properties"].get("temperature", 0) for f in temp_features]
-        avg_temp = sum(temps) / len(temps) if temps else 0
+        avg_temp = sum(f["properties"].get("temperature", 0) for f in temp_features) / len(temp_features) if temp_features else 0
         
-        return {
+        response = ORJSONResponse({
             "status": "success",
             "timestamp": datetime.now().isoformat(),
+            "stale": stale,
             "dashboard": {
                 "air_quality": {
                     "stations_count": len(aq_features),
                     "avg_aqi": round(avg_aqi, 1),
-                    "status": "Good" if avg_aqi <= 50 else "Moderate" if avg_aqi <= 100 else "Unhealthy"
+                    "status": _AQI_STATUS[bisect_left(_AQI_STATUS_BREAKS, avg_aqi)]
                 },
                 "methane": {
                     "total_emissions_kt": round(methane_emissions, 1),
                     "hotspots_count": len(methane_features),
-                    "status": "High" if methane_emissions > 2000 else "Moderate" if methane_emissions > 1000 else "Low"
+                    "status": _EMISSION_STATUS[bisect_left(_METHANE_STATUS_BREAKS, methane_emissions)]
                 },
                 "co2": {
                     "total_emissions_mt": round(co2_emissions, 1),
                     "sources_count": len(co2_features),
-                    "status": "High" if co2_emissions > 100 else "Moderate" if co2_emissions > 50 else "Low"
+                    "status": _EMISSION_STATUS[bisect_left(_CO2_STATUS_BREAKS, co2_emissions)]
                 },
                 "temperature": {
                     "avg_temp": round(avg_temp, 1),
@@ -722,7 +1023,10 @@ async def get_environmental_dashboard():
                     "status": "Normal"
                 }
             }
-        }
+        })
+        # Responses built from stale sources are not cached, so the next
+        # request picks up the refreshed data
+        return response if stale else _cache_response("dashboard:global", DASHBOARD_TTL, response)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -731,60 +1035,73 @@ async def get_environmental_dashboard():
 # HELPER FUNCTIONS
 # ============================================
 
-import random
+# Color ramps as (breaks, colors) pairs. AQI bands include their upper break
+# (bisect_left); methane/CO2/NDVI bands exclude it (bisect_right).
+_AQI_COLOR_BREAKS = (50, 100, 150, 200, 300)
+_AQI_COLORS = (
+    "#00e400",  # Good - Green
+    "#ffff00",  # Moderate - Yellow
+    "#ff7e00",  # Unhealthy for Sensitive - Orange
+    "#ff0000",  # Unhealthy - Red
+    "#8f3f97",  # Very Unhealthy - Purple
+    "#7e0023"   # Hazardous - Maroon
+)
+
+_METHANE_COLOR_BREAKS = (1900, 2100, 2300)
+_METHANE_COLORS = (
+    "#22c55e",  # Low - Green
+    "#eab308",  # Moderate - Yellow
+    "#f97316",  # High - Orange
+    "#dc2626"   # Very High - Red
+)
+
+_CO2_COLOR_BREAKS = (5, 15, 30)
+_CO2_COLORS = (
+    "#22c55e",  # Low
+    "#eab308",  # Moderate
+    "#f97316",  # High
+    "#dc2626"   # Very High
+)
+
+_NDVI_COLOR_BREAKS = (-0.1, 0.1, 0.3, 0.6)
+_NDVI_COLORS = (
+    "#a50026",  # Water/Snow
+    "#d73027",  # Bare soil
+    "#fee08b",  # Sparse vegetation
+    "#66bd63",  # Moderate vegetation
+    "#006837"   # Dense vegetation
+)
+
 
 def get_aqi_color(aqi: int) -> str:
     """Get color for AQI value based on EPA scale"""
-    if aqi <= 50:
-        return "#00e400"  # Good - Green
-    elif aqi <= 100:
-        return "#ffff00"  # Moderate - Yellow
-    elif aqi <= 150:
-        return "#ff7e00"  # Unhealthy for Sensitive - Orange
-    elif aqi <= 200:
-        return "#ff0000"  # Unhealthy - Red
-    elif aqi <= 300:
-        return "#8f3f97"  # Very Unhealthy - Purple
-    else:
-        return "#7e0023"  # Hazardous - Maroon
+    return _AQI_COLORS[bisect_left(_AQI_COLOR_BREAKS, aqi)]
 
 
 def get_methane_color(concentration: float) -> str:
     """Get color for methane concentration"""
-    if concentration < 1900:
-        return "#22c55e"  # Low - Green
-    elif concentration < 2100:
-        return "#eab308"  # Moderate - Yellow
-    elif concentration < 2300:
-        return "#f97316"  # High - Orange
-    else:
-        return "#dc2626"  # Very High - Red
+    return _METHANE_COLORS[bisect_right(_METHANE_COLOR_BREAKS, concentration)]
 
 
 def get_co2_color(emissions_mt: float) -> str:
     """Get color for CO2 emissions"""
-    if emissions_mt < 5:
-        return "#22c55e"  # Low
-    elif emissions_mt < 15:
-        return "#eab308"  # Moderate
-    elif emissions_mt < 30:
-        return "#f97316"  # High
-    else:
-        return "#dc2626"  # Very High
+    return _CO2_COLORS[bisect_right(_CO2_COLOR_BREAKS, emissions_mt)]
 
 
 def get_ndvi_color(ndvi: float) -> str:
     """Get color for NDVI value"""
-    if ndvi < -0.1:
-        return "#a50026"  # Water/Snow
-    elif ndvi < 0.1:
-        return "#d73027"  # Bare soil
-    elif ndvi < 0.3:
-        return "#fee08b"  # Sparse vegetation
-    elif ndvi < 0.6:
-        return "#66bd63"  # Moderate vegetation
-    else:
-        return "#006837"  # Dense vegetation
+    return _NDVI_COLORS[bisect_right(_NDVI_COLOR_BREAKS, ndvi)]
+
+
+# Batch variant for the NDVI grid: one np.digitize over the whole column of
+# values, indexing a color table, instead of one Python call per point.
+# right=False matches the exclusive bands.
+_NDVI_COLOR_TABLE = np.array(_NDVI_COLORS)
+
+
+def get_ndvi_colors(ndvis) -> List[str]:
+    """Colors for a batch of NDVI values"""
+    return _NDVI_COLOR_TABLE[np.digitize(ndvis, _NDVI_COLOR_BREAKS)].tolist()
 
 
 def normalize_temperature(temp_c: float, min_temp: float = -20, max_temp: float = 40) -> float:
@@ -792,6 +1109,26 @@ def normalize_temperature(temp_c: float, min_temp: float = -20, max_temp: float
     return max(0, min(1, (temp_c - min_temp) / (max_temp - min_temp)))
 
 
+# Shared by every heatmap layer; read-only (copy.deepcopy before mutating)
+_AQI_HEATMAP_PAINT = {
+    "heatmap-weight": ["interpolate", ["linear"], ["get", "aqi"], 0, 0, 300, 1],
+    "heatmap-intensity": 1.5,
+    "heatmap-radius": ["interpolate", ["linear"], ["zoom"], 4, 40, 10, 60],
+    "heatmap-opacity": 0.7,
+    "heatmap-color": [
+        "interpolate",
+        ["linear"],
+        ["heatmap-density"],
+        0, "rgba(0,228,0,0)",
+        0.2, "rgba(255,255,0,0.6)",
+        0.4, "rgba(255,126,0,0.7)",
+        0.6, "rgba(255,0,0,0.8)",
+        0.8, "rgba(143,63,151,0.85)",
+        1, "rgba(126,0,35,0.9)"
+    ]
+}
+
+
 def create_aqi_heatmap(features: List[Dict]) -> Dict:
     """Create heatmap layer configuration for AQI data"""
     return {
@@ -801,26 +1138,15 @@ def create_aqi_heatmap(features: List[Dict]) -> Dict:
             "type": "geojson",
             "data": {"type": "FeatureCollection", "features": features}
         },
-        "paint": {
-            "heatmap-weight": ["interpolate", ["linear"], ["get", "aqi"], 0, 0, 300, 1],
-            "heatmap-intensity": 1.5,
-            "heatmap-radius": ["interpolate", ["linear"], ["zoom"], 4, 40, 10, 60],
-            "heatmap-opacity": 0.7,
-            "heatmap-color": [
-                "interpolate",
-                ["linear"],
-                ["heatmap-density"],
-                0, "rgba(0,228,0,0)",
-                0.2, "rgba(255,255,0,0.6)",
-                0.4, "rgba(255,126,0,0.7)",
-                0.6, "rgba(255,0,0,0.8)",
-                0.8, "rgba(143,63,151,0.85)",
-                1, "rgba(126,0,35,0.9)"
-            ]
-        }
+        "paint": _AQI_HEATMAP_PAINT
     }
 
 
+# The route variant's source data is the GeoJSON slot like the other layers,
+# so the whole layer is static and encoded once
+_AQI_HEATMAP_LAYER_JSON = orjson.dumps({**create_aqi_heatmap([]), "source": _GEOJSON_SOURCE})
+
+
 def generate_environmental_alerts(air_quality: Dict, methane: Dict, co2: Dict) -> List[Dict]:
     """Generate alerts based on environmental data thresholds"""
     alerts = []
@@ -854,6 +1180,125 @@ def generate_environmental_alerts(air_quality: Dict, methane: Dict, co2: Dict) -
 # PDF REPORT GENERATION
 # ============================================
 
+# The environmental service caches its own collections; fire detections are
+# not cached by the satellite service, so repeated report requests share
+# those fetches for REPORT_SOURCE_TTL seconds
+REPORT_SOURCE_TTL = 60
+_report_fires = async_ttl_cache(REPORT_SOURCE_TTL)(sat_service.get_fire_data)
+
+REPORT_CHUNK_SIZE = 64 * 1024
+
+
+def _iter_file_chunks(f, chunk_size: int = REPORT_CHUNK_SIZE):
+    """Yield a file's contents in chunks, closing it once exhausted"""
+    try:
+        while chunk := f.read(chunk_size):
+            yield chunk
+    finally:
+        f.close()
+
+
+# Local-time %Y%m%d_%H%M%S stamp for report filenames, formatted at most once per second
+_report_timestamp = per_second_stamp(
+    lambda second: datetime.fromtimestamp(second).strftime("%Y%m%d_%H%M%S")
+)
+
+
+def _report_columns(result: Dict) -> Tuple[List[Dict], List[List[float]], List[str]]:
+    """Properties, coordinates and names of a GeoJSON result as parallel lists"""
+    features = result.get("features", [])
+    props = [f.get("properties", {}) for f in features]
+    coordinates = [_feature_coordinates(f) for f in features]
+    names = [p.get("name", "Unknown") for p in props]
+    return props, coordinates, names
+
+
+def _report_air_quality_section(result: Dict) -> Tuple[Dict[str, Any], int]:
+    props, coordinates, names = _report_columns(result)
+    aqis = [p.get("aqi", 0) for p in props]
+    stations = [
+        StationRow(
+            name=name,
+            aqi=aqi,
+            category=p.get("category", "N/A"),
+            dominant_pollutant=p.get("dominant_pollutant", "N/A"),
+            coordinates=coords,
+            pm25=p.get("pm25", 0),
+            pm10=p.get("pm10", 0),
+            no2=p.get("no2", 0),
+            o3=p.get("o3", 0)
+        )
+        for p, name, aqi, coords in zip(props, names, aqis, coordinates)
+    ]
+    
+    # Calculate summary
+    avg_aqi = float(np.mean(aqis)) if aqis else 0.0
+    return {
+        "air_quality": {"stations": stations},
+        "air_quality_status": _AQI_STATUS[bisect_left(_AQI_STATUS_BREAKS, avg_aqi)]
+    }, len(stations)
+
+
+def _report_methane_section(result: Dict) -> Tuple[Dict[str, Any], int]:
+    props, coordinates, names = _report_columns(result)
+    emission_rates = [p.get("emission_rate_kt_year", 0) for p in props]
+    hotspots = [
+        MethaneRow(
+            name=name,
+            type=p.get("type", "N/A"),
+            emission_rate_kt_per_year=emission_rate,
+            concentration_ppb=p.get("concentration_ppb", 0),
+            trend=p.get("trend", "N/A"),
+            coordinates=coords
+        )
+        for p, name, emission_rate, coords in zip(props, names, emission_rates, coordinates)
+    ]
+    return {
+        "methane": {"hotspots": hotspots},
+        "methane_total": sum(emission_rates) / 1000  # Convert to MT
+    }, len(hotspots)
+
+
+def _report_co2_section(result: Dict) -> Tuple[Dict[str, Any], int]:
+    props, coordinates, names = _report_columns(result)
+    emissions = [p.get("emission_mt_year", 0) for p in props]
+    sources = [
+        Co2Row(
+            name=name,
+            sector=p.get("sector", "N/A"),
+            annual_emissions_mt=emission,
+            coordinates=coords
+        )
+        for p, name, emission, coords in zip(props, names, emissions, coordinates)
+    ]
+    return {"co2": {"sources": sources}, "co2_total": sum(emissions)}, len(sources)
+
+
+def _report_fires_section(result: Dict) -> Tuple[Dict[str, Any], int]:
+    props, coordinates, _ = _report_columns(result)
+    fires = [
+        FireRow(
+            brightness=p.get("brightness", 0),
+            confidence=p.get("confidence", "N/A"),
+            satellite=p.get("satellite", "N/A"),
+            acq_time=p.get("acq_time", "N/A"),
+            coordinates=coords
+        )
+        for p, coords in zip(props, coordinates)
+    ]
+    return {"fires": {"fires": fires}, "fire_count": len(fires)}, len(fires)
+
+
+# Section builders are pure functions of one fetched result, returning the
+# report_data entries and the number of rows they extracted
+_REPORT_SECTIONS = {
+    "air_quality": _report_air_quality_section,
+    "methane": _report_methane_section,
+    "co2": _report_co2_section,
+    "fires": _report_fires_section
+}
+
+
 @router.get("/report/pdf")
 async def generate_pdf_report(
     title: str = Query("Environmental Monitoring Report", description="Report title"),
@@ -870,122 +1315,63 @@ async def generate_pdf_report(
         # Fetch all required data
         report_data = {}
         
-        # Fetch data in parallel
-        tasks = []
+        # Fetch data in parallel, one named task per section
+        sources = {}
         if include_air_quality:
-            tasks.append(("air_quality", env_service.get_realtime_air_quality()))
+            sources["air_quality"] = env_service.get_realtime_air_quality()
         if include_methane:
-            tasks.append(("methane", env_service.get_methane_emissions()))
+            sources["methane"] = env_service.get_methane_emissions()
         if include_co2:
-            tasks.append(("co2", env_service.get_co2_emissions()))
+            sources["co2"] = env_service.get_co2_emissions()
         if include_fires:
-            tasks.append(("fires", sat_service.get_fire_data()))
+            sources["fires"] = _report_fires()
         
-        # Execute all tasks
-        results = await asyncio.gather(*[t[1] for t in tasks], return_exceptions=True)
+        # A failed source only drops its own section
+        tasks = {key: asyncio.ensure_future(source) for key, source in sources.items()}
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
         
-        # Process results
-        for i, (key, _) in enumerate(tasks):
-            result = results[i]
-            if isinstance(result, Exception):
-                print(f"[WARN] Failed to fetch {key}: {result}")
+        # Post-process each section on the thread pool so the event loop
+        # stays free while the rows are built
+        loop = asyncio.get_running_loop()
+        keys = []
+        jobs = []
+        for key, task in tasks.items():
+            error = task.exception()
+            if error is not None:
+                logger.warning("Failed to fetch %s: %s", key, error)
                 continue
-            
-            # Extract data from GeoJSON format
-            if key == "air_quality":
-                features = result.get("features", [])
-                stations = []
-                for f in features:
-                    props = f.get("properties", {})
-                    stations.append({
-                        "name": props.get("name", "Unknown"),
-                        "aqi": props.get("aqi", 0),
-                        "category": props.get("category", "N/A"),
-                        "dominant_pollutant": props.get("dominant_pollutant", "N/A"),
-                        "coordinates": f.get("geometry", {}).get("coordinates", [0, 0]),
-                        "pollutants": {
-                            "pm25": {"value": props.get("pm25", 0), "unit": "µg/m³"},
-                            "pm10": {"value": props.get("pm10", 0), "unit": "µg/m³"},
-                            "no2": {"value": props.get("no2", 0), "unit": "µg/m³"},
-                            "o3": {"value": props.get("o3", 0), "unit": "µg/m³"}
-                        }
-                    })
-                report_data["air_quality"] = {"stations": stations}
-                
-                # Calculate summary
-                aqis = [s["aqi"] for s in stations]
-                avg_aqi = sum(aqis) / len(aqis) if aqis else 0
-                report_data["air_quality_status"] = "Good" if avg_aqi <= 50 else "Moderate" if avg_aqi <= 100 else "Unhealthy"
-                
-            elif key == "methane":
-                features = result.get("features", [])
-                hotspots = []
-                total_emissions = 0
-                for f in features:
-                    props = f.get("properties", {})
-                    emission_rate = props.get("emission_rate_kt_year", 0)
-                    total_emissions += emission_rate
-                    hotspots.append({
-                        "name": props.get("name", "Unknown"),
-                        "type": props.get("type", "N/A"),
-                        "emission_rate_kt_per_year": emission_rate,
-                        "concentration_ppb": props.get("concentration_ppb", 0),
-                        "trend": props.get("trend", "N/A"),
-                        "coordinates": f.get("geometry", {}).get("coordinates", [0, 0])
-                    })
-                report_data["methane"] = {"hotspots": hotspots}
-                report_data["methane_total"] = total_emissions / 1000  # Convert to MT
-                
-            elif key == "co2":
-                features = result.get("features", [])
-                sources = []
-                total_emissions = 0
-                for f in features:
-                    props = f.get("properties", {})
-                    emission = props.get("emission_mt_year", 0)
-                    total_emissions += emission
-                    sources.append({
-                        "name": props.get("name", "Unknown"),
-                        "sector": props.get("sector", "N/A"),
-                        "annual_emissions_mt": emission,
-                        "coordinates": f.get("geometry", {}).get("coordinates", [0, 0])
-                    })
-                report_data["co2"] = {"sources": sources}
-                report_data["co2_total"] = total_emissions
-                
-            elif key == "fires":
-                features = result.get("features", [])
-                fires = []
-                for f in features:
-                    props = f.get("properties", {})
-                    fires.append({
-                        "brightness": props.get("brightness", 0),
-                        "confidence": props.get("confidence", "N/A"),
-                        "satellite": props.get("satellite", "N/A"),
-                        "acq_time": props.get("acq_time", "N/A"),
-                        "coordinates": f.get("geometry", {}).get("coordinates", [0, 0])
-                    })
-                report_data["fires"] = {"fires": fires}
-                report_data["fire_count"] = len(fires)
+            keys.append(key)
+            jobs.append(loop.run_in_executor(None, _REPORT_SECTIONS[key], task.result()))
+        counts = dict.fromkeys(_REPORT_SECTIONS, 0)
+        for key, (section, n_rows) in zip(keys, await asyncio.gather(*jobs)):
+            report_data.update(section)
+            counts[key] = n_rows
         
         # Add summary
         report_data["summary"] = (
             f"This environmental monitoring report covers the Republic of Kazakhstan region. "
-            f"The report includes data from {len(report_data.get('air_quality', {}).get('stations', []))} air quality monitoring stations, "
-            f"{len(report_data.get('methane', {}).get('hotspots', []))} methane emission hotspots, "
-            f"{len(report_data.get('co2', {}).get('sources', []))} CO₂ emission sources, and "
-            f"{report_data.get('fire_count', 0)} active fire detections. "
+            f"The report includes data from {counts['air_quality']} air quality monitoring stations, "
+            f"{counts['methane']} methane emission hotspots, "
+            f"{counts['co2']} CO₂ emission sources, and "
+            f"{counts['fires']} active fire detections. "
             f"Data sources include OpenAQ, Sentinel-5P, NASA FIRMS, and EDGAR emissions inventory."
         )
         
-        # Generate PDF
-        pdf_bytes = report_generator.generate_report(report_data, title)
+        # Generate PDF into a spooled file (in memory up to 1 MiB, then disk);
+        # rendering is CPU-bound, so it runs on the thread pool as well
+        pdf_file = tempfile.SpooledTemporaryFile(max_size=1 << 20)
+        try:
+            await loop.run_in_executor(None, report_generator.write_report, pdf_file, report_data, title)
+            pdf_file.seek(0)
+        except Exception:
+            pdf_file.close()
+            raise
         
         # Return PDF response
-        filename = f"ApexGIS_Report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+        filename = f"ApexGIS_Report_{_report_timestamp()}.pdf"
         
-        return Response(
-            content=pdf_bytes,
+        return StreamingResponse(
+            _iter_file_chunks(pdf_file),
             media_type="application/pdf",
             headers={
                 "Content-Disposition": f"attachment; filename={filename}",
@@ -0,0 +1,80 @@
+"""
+Caching Helpers
+In-process TTL caching shared by the data services and API routes
+"""
+
+import asyncio
+import functools
+import time
+from typing import Any, Callable, Dict, Tuple
+
+
+def async_ttl_cache(ttl: float, maxsize: int = 128):
+    """
+    Cache a coroutine function's result per call arguments for ttl seconds.
+    The in-flight future is stored, so concurrent callers share one call;
+    failed or cancelled calls are evicted immediately. Every caller gets the
+    same result object, so treat it as read-only.
+    At most maxsize argument sets are kept: expired entries are dropped on
+    insert, then the oldest entries if the cache is still full.
+    Calls with unhashable arguments (dicts, lists) are not cached.
+    """
+    def decorator(fn):
+        entries: Dict[Any, Tuple[float, "asyncio.Future"]] = {}
+
+        def evict_failed(key, future: "asyncio.Future"):
+            # Only drop the entry if it still holds this call; a newer call
+            # may have replaced it after the TTL ran out
+            if not future.cancelled() and future.exception() is None:
+                return
+            entry = entries.get(key)
+            if entry is not None and entry[1] is future:
+                del entries[key]
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            try:
+                hash(key)
+            except TypeError:
+                return await fn(*args, **kwargs)
+            now = time.monotonic()
+            entry = entries.get(key)
+            if entry is None or entry[0] <= now:
+                # Re-inserted keys move to the end, so dict order stays oldest first
+                entries.pop(key, None)
+                for stale in [k for k, (expires, _) in entries.items() if expires <= now]:
+                    del entries[stale]
+                while len(entries) >= maxsize:
+                    del entries[next(iter(entries))]
+                future = asyncio.ensure_future(fn(*args, **kwargs))
+                entries[key] = (now + ttl, future)
+                future.add_done_callback(functools.partial(evict_failed, key))
+            else:
+                future = entry[1]
+            # Shielded so one cancelled request does not cancel the shared call
+            return await asyncio.shield(future)
+
+        return wrapper
+    return decorator
+
+
+def per_second_stamp(fmt: Callable[[int], str]) -> Callable[[], str]:
+    """
+    Wrap fmt(epoch_second) -> str as a zero-argument clock that formats at
+    most once per second and reuses the string for the rest of that second.
+    """
+    # (epoch second, stamp) swapped as one tuple so concurrent readers never
+    # see a mismatched pair
+    last: Tuple[int, str] = (-1, "")
+
+    def stamp() -> str:
+        nonlocal last
+        now = int(time.time())
+        second, value = last
+        if now != second:
+            value = fmt(now)
+            last = (now, value)
+        return value
+
+    return stamp
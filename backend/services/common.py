@@ -0,0 +1,70 @@
+"""
+Shared Service Helpers
+Pooled upstream HTTP sessions and AQI reference tables used by the data services
+"""
+
+from types import MappingProxyType
+from typing import Optional
+
+# aiohttp is optional for the simulated services; it is only needed once a
+# session is actually opened
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class PooledSession:
+    """
+    One pooled aiohttp session per owner, created on first use: upstream
+    calls reuse warm TCP/TLS connections and cached DNS lookups instead of
+    reconnecting per request. Extra keyword arguments go to ClientSession.
+    """
+
+    def __init__(self, *, limit: int = 100, limit_per_host: int = 20,
+                 total_timeout: float = 30, connect_timeout: Optional[float] = None,
+                 keep_cookies: bool = True, **session_kwargs):
+        self._connector_kwargs = {
+            "limit": limit, "limit_per_host": limit_per_host,
+            "ttl_dns_cache": 300, "keepalive_timeout": 60
+        }
+        self._timeouts = {"total": total_timeout, "connect": connect_timeout}
+        self._keep_cookies = keep_cookies
+        self._session_kwargs = session_kwargs
+        self._session: Optional["aiohttp.ClientSession"] = None
+
+    async def get(self) -> "aiohttp.ClientSession":
+        """Get or create the shared session"""
+        if self._session is None or self._session.closed:
+            extra = {} if self._keep_cookies else {"cookie_jar": aiohttp.DummyCookieJar()}
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(**self._connector_kwargs),
+                timeout=aiohttp.ClientTimeout(**self._timeouts),
+                **extra,
+                **self._session_kwargs
+            )
+        return self._session
+
+    async def close(self):
+        """Close the shared session (called on application shutdown)"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+# AQI categories: AQI_CATEGORIES[i] covers AQI up to and including
+# AQI_CATEGORY_THRESHOLDS[i]; the last entry covers anything above 500.
+# Read-only mappings shared by every caller.
+AQI_CATEGORY_THRESHOLDS = (50, 100, 150, 200, 300, 500)
+AQI_CATEGORIES = tuple(
+    MappingProxyType({"name": name, "color": color, "health": health})
+    for name, color, health in (
+        ("Good", "#00e400", "Air quality is satisfactory"),
+        ("Moderate", "#ffff00", "Acceptable quality, some concern for sensitive groups"),
+        ("Unhealthy for Sensitive Groups", "#ff7e00", "Sensitive groups may experience health effects"),
+        ("Unhealthy", "#ff0000", "Everyone may experience health effects"),
+        ("Very Unhealthy", "#8f3f97", "Health alert: serious health effects"),
+        ("Hazardous", "#7e0023", "Health emergency: everyone affected"),
+        ("Hazardous", "#7e0023", "Health emergency")
+    )
+)
@@ -5,12 +5,21 @@ Based on best practices from opengeos and GeoGPT research projects
 """
 
 import asyncio
+import itertools
 import math
 import random
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List, Tuple
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta, timezone
+from operator import itemgetter
+from typing import Optional, Dict, Any, AsyncIterator, Iterator, List, Mapping, Tuple
 import json
 
+import numpy as np
+import orjson
+
+from services.cache import async_ttl_cache, per_second_stamp
+from services.common import AQI_CATEGORIES, AQI_CATEGORY_THRESHOLDS, PooledSession
+
 # Try to import aiohttp, but it's optional for demo mode
 try:
     import aiohttp
@@ -19,6 +28,48 @@ except ImportError:
     AIOHTTP_AVAILABLE = False
     print("Note: aiohttp not installed. Using simulated data.")
 
+# Module-private generator for the simulated readings, so this module does not
+# contend on the shared global random instance
+_rng = random.Random()
+# Prebaked noise banks: the vectorized endpoints slice a rolling window out of
+# these instead of drawing fresh samples on every request
+_NOISE_SIZE = 1 << 15
+_NOISE_WINDOW = 4096
+_NORMAL_NOISE = np.random.default_rng(0).standard_normal(_NOISE_SIZE)
+_UNIFORM_NOISE = np.random.default_rng(1).random(_NOISE_SIZE)
+_NOISE_OFFSETS = itertools.cycle(range(0, _NOISE_SIZE - _NOISE_WINDOW, 257))
+
+
+def _noise_window(bank: np.ndarray, n: int) -> np.ndarray:
+    """The next n samples of a noise bank, at a rolling offset"""
+    if n > _NOISE_WINDOW:
+        raise ValueError(f"requested {n} noise samples, the bank window holds {_NOISE_WINDOW}")
+    offset = next(_NOISE_OFFSETS)
+    return bank[offset:offset + n]
+
+
+def _normal_noise(n: int, scale=1.0) -> np.ndarray:
+    """n standard-normal samples (times scale) from the noise bank"""
+    return _noise_window(_NORMAL_NOISE, n) * scale
+
+
+def _uniform_noise(n: int, low=0.0, high=1.0) -> np.ndarray:
+    """n samples spread uniformly over [low, high) from the noise bank"""
+    return low + (high - low) * _noise_window(_UNIFORM_NOISE, n)
+
+
+# One pooled session per process for the upstream calls
+_session = PooledSession(
+    limit=50, limit_per_host=10, total_timeout=15, connect_timeout=5,
+    headers={"User-Agent": "EnvironmentalDataService/1.0"}
+)
+
+
+# Current UTC time as an ISO 8601 string with a Z suffix, to the second
+utc_timestamp = per_second_stamp(
+    lambda second: datetime.fromtimestamp(second, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+)
+
 
 # ==============================================================
 # REAL DATA APIs AND ENDPOINTS
@@ -36,6 +87,11 @@ OPENWEATHER_API = "https://api.openweathermap.org/data/2.5"
 # USGS Earthquake API
 USGS_EARTHQUAKE_API = "https://earthquake.usgs.gov/earthquakes/feed/v1.0"
 
+# Seconds a generated collection is reused per argument set. The sources
+# refresh hourly (stations) to daily (satellite/inventory data).
+AIR_QUALITY_CACHE_TTL = 60
+EMISSIONS_CACHE_TTL = 3600
+
 
 # ==============================================================
 # REAL KAZAKHSTAN ENVIRONMENTAL DATA
@@ -273,6 +329,287 @@ CLIMATE_ZONES = {
 }
 
 
+# ==============================================================
+# PRECOMPUTED FEATURE SKELETONS
+# ==============================================================
+# The parts of each methane/CO2 feature that depend only on the constant
+# source tables above, built once at import. Requests overlay the
+# time-varying fields on top; treat these as read-only.
+
+# Unit vectors for the 16 vertices of a methane emission zone (22.5° apart)
+_ZONE_ANGLES = np.arange(16) * (22.5 * math.pi / 180)
+_ZONE_COS = np.cos(_ZONE_ANGLES)
+_ZONE_SIN = np.sin(_ZONE_ANGLES)
+
+
+# Equal-area circle radius in degrees: sqrt(area / pi) / 111 km per degree
+_INV_PI_111 = 1.0 / (math.pi * 111 * 111)
+
+
+def _methane_skeleton(hotspot_id: str, hotspot: Dict) -> Dict[str, Any]:
+    emission_rate = hotspot["emission_rate_kt_year"]
+    
+    # Color intensity based on emission rate
+    if emission_rate > 600:
+        color, opacity = "#dc2626", 0.7  # Red - high
+    elif emission_rate > 300:
+        color, opacity = "#f97316", 0.6  # Orange - medium
+    else:
+        color, opacity = "#fbbf24", 0.5  # Yellow - lower
+    
+    return {
+        "center": hotspot["coordinates"],
+        "emission_rate": emission_rate,
+        "radius": math.sqrt(hotspot["area_km2"] * _INV_PI_111),
+        "properties": {
+            "id": hotspot_id,
+            "name": hotspot["name"],
+            "source_type": hotspot["type"],
+            "emission_rate_kt_year": emission_rate,
+            "emission_source": hotspot["source"],
+            "area_km2": hotspot["area_km2"],
+            "detected_plumes": hotspot["detected_plumes"],
+            "trend": hotspot["trend"],
+            "color": color,
+            "opacity": opacity
+        }
+    }
+
+
+def _co2_skeleton(source_id: str, source: Dict) -> Dict[str, Any]:
+    emission_mt = source["emission_mt_year"]
+    
+    # Color based on emission intensity
+    if emission_mt > 20:
+        color = "#991b1b"
+    elif emission_mt > 10:
+        color = "#dc2626"
+    elif emission_mt > 5:
+        color = "#f97316"
+    else:
+        color = "#fbbf24"
+    
+    return {
+        "emission_mt": emission_mt,
+        # Power plants follow a daily load curve; other sources vary randomly
+        "load_curve": source["type"] in ("power_generation", "combined_heat_power"),
+        "properties": {
+            "id": source_id,
+            "name": source["name"],
+            "facility_type": source["type"],
+            "emission_mt_year": emission_mt,
+            "fuel_type": source.get("fuel_type", "mixed"),
+            "capacity": source.get("capacity_mw") or source.get("capacity_bpd") or source.get("capacity_mt_steel"),
+            "efficiency_percent": source.get("efficiency_percent"),
+            "co2_intensity": source.get("co2_intensity_gkwh"),
+            "color": color,
+            # Visual representation radius based on emissions
+            "radius": math.sqrt(emission_mt) * 0.02
+        },
+        "geometry": {
+            "type": "Point",
+            "coordinates": source["coordinates"]
+        }
+    }
+
+
+# EPA AQI breakpoints per pollutant as (c_low, c_high, i_low, i_high) rows,
+# paired with their c_high column so the bracket is found by bisection, and
+# with the rows as a float array for the vectorized path
+def _aqi_breakpoints(rows: Tuple[Tuple, ...]) -> Tuple[Tuple[float, ...], Tuple[Tuple, ...], np.ndarray]:
+    return tuple(row[1] for row in rows), rows, np.array(rows, dtype=np.float64)
+
+
+_PM25_BREAKPOINTS = _aqi_breakpoints((
+    (0, 12, 0, 50),
+    (12.1, 35.4, 51, 100),
+    (35.5, 55.4, 101, 150),
+    (55.5, 150.4, 151, 200),
+    (150.5, 250.4, 201, 300),
+    (250.5, 500, 301, 500)
+))
+_PM10_BREAKPOINTS = _aqi_breakpoints((
+    (0, 54, 0, 50),
+    (55, 154, 51, 100),
+    (155, 254, 101, 150),
+    (255, 354, 151, 200),
+    (355, 424, 201, 300),
+    (425, 604, 301, 500)
+))
+_NO2_BREAKPOINTS = _aqi_breakpoints((
+    (0, 53, 0, 50),
+    (54, 100, 51, 100),
+    (101, 360, 101, 150),
+    (361, 649, 151, 200),
+    (650, 1249, 201, 300),
+    (1250, 2049, 301, 500)
+))
+
+
+
+def _breakpoint_aqi(conc: np.ndarray, breakpoints: Tuple) -> np.ndarray:
+    """Vectorized _calculate_aqi_breakpoint over an array of concentrations"""
+    highs, rows, table = breakpoints
+    index = np.searchsorted(highs, conc, side="left")
+    c_low, c_high, i_low, i_high = table[np.minimum(index, len(rows) - 1)].T
+    aqi = ((i_high - i_low) / (c_high - c_low)) * (conc - c_low) + i_low
+    bracketed = (index < len(rows)) & (c_low <= conc)
+    return np.where(bracketed, np.trunc(aqi), np.where(conc > 0, 500, 0)).astype(np.int64)
+
+
+# ==============================================================
+# STATION READING TABLES
+# ==============================================================
+# Simulated readings for every station are produced in one batch. Each
+# sensor's base concentration (µg/m³ unless noted) is
+#   scale * base_aqi + offset + uniform(low, high)
+# before the time, elevation and noise factors; unlisted sensors read 20.
+
+_STATION_BASE_AQI = {
+    "urban": 65,
+    "mountain": 25,
+    "industrial": 95,
+    "heavy_industrial": 130,
+    "coastal": 45
+}
+
+_SENSOR_MODEL = {
+    # sensor: (scale, offset, low, high)
+    "PM2.5": (0.35, 0, 0, 0),
+    "PM10": (0.75, 0, 0, 0),
+    "NO2": (0.4, 0, 0, 0),
+    "SO2": (0.25, 0, 0, 0),
+    "O3": (0, 45, -10, 20),  # O3 is higher in clean areas
+    "CO": (0.08, 0, 0, 0),  # mg/m³
+    "CH4": (0, 1.9, 0, 0.5),  # ppm
+    "H2S": (0, 0, 0.002, 0.01),  # ppm
+    "As": (0, 0, 0.001, 0.005),
+    "Pb": (0, 0, 0.01, 0.05)
+}
+_DEFAULT_SENSOR_MODEL = (0, 20, 0, 0)
+
+
+def _station_readings_table() -> Dict[str, Any]:
+    """
+    Flatten every (station, sensor) pair into parallel reading arrays.
+    Station i owns readings slices[i][0]:slices[i][1], in its sensor order;
+    pm25_at/pm10_at/no2_at index each station's reading of that pollutant,
+    or -1 (a trailing zero pad) when the station lacks the sensor.
+    """
+    stations = tuple(KAZAKHSTAN_AIR_QUALITY_STATIONS.items())
+    owner, models, slices = [], [], []
+    aqi_columns = {"PM2.5": [], "PM10": [], "NO2": []}
+    for i, (_, station) in enumerate(stations):
+        start = len(owner)
+        for sensor in station["sensors"]:
+            owner.append(i)
+            models.append(_SENSOR_MODEL.get(sensor, _DEFAULT_SENSOR_MODEL))
+        slices.append((start, len(owner)))
+        for sensor, column in aqi_columns.items():
+            sensors = station["sensors"]
+            column.append(start + sensors.index(sensor) if sensor in sensors else -1)
+    
+    owner = np.array(owner)
+    scale, offset, low, high = np.array(models, dtype=np.float64).T
+    # Elevation adjustment (cleaner at higher elevations)
+    elev_factor = np.array([max(0.5, 1 - station["elevation"] / 3000) for _, station in stations])
+    
+    return {
+        "stations": stations,
+        "slices": slices,
+        "base_aqi": np.array([_STATION_BASE_AQI.get(station["type"], 50) for _, station in stations]),
+        "owner": owner,
+        "scale": scale,
+        "offset": offset,
+        "low": low,
+        "high": high,
+        "elev_factor": elev_factor[owner],
+        "pm25_at": np.array(aqi_columns["PM2.5"]),
+        "pm10_at": np.array(aqi_columns["PM10"]),
+        "no2_at": np.array(aqi_columns["NO2"])
+    }
+
+
+_STATION_READINGS = _station_readings_table()
+
+# Fallback for points inside Kazakhstan but outside every CLIMATE_ZONES box
+_DEFAULT_CLIMATE_ZONE = {
+    "name": "Continental Kazakhstan",
+    "avg_temp_winter": -12,
+    "avg_temp_summer": 26,
+    "precipitation_mm": 250,
+    "climate_type": "continental",
+    "trend_celsius_decade": 0.4
+}
+
+# Temperature color ramp: _TEMP_COLORS[i] covers temperatures below
+# _TEMP_COLOR_BREAKS[i] (and at or above the previous break)
+_TEMP_COLOR_BREAKS = (-30, -20, -10, 0, 10, 20, 30, 40)
+_TEMP_COLORS = (
+    "#1e3a8a",  # Dark blue - extreme cold
+    "#2563eb",  # Blue - very cold
+    "#3b82f6",  # Light blue - cold
+    "#67e8f9",  # Cyan - freezing
+    "#86efac",  # Light green - cool
+    "#22c55e",  # Green - mild
+    "#f59e0b",  # Orange - warm
+    "#ef4444",  # Red - hot
+    "#991b1b"   # Dark red - extreme heat
+)
+_TEMP_COLOR_TABLE = np.array(_TEMP_COLORS)
+
+
+# Every climate zone in lookup order, the continental fallback last, with
+# their bounding boxes packed as (min_lng, min_lat, max_lng, max_lat) rows.
+# The fallback box is the wider country extent.
+_GRID_ZONES = tuple(CLIMATE_ZONES.values()) + (_DEFAULT_CLIMATE_ZONE,)
+_ZONE_BOUNDS = np.array(
+    [[*zone["bounds"][0], *zone["bounds"][1]] for zone in CLIMATE_ZONES.values()] + [[45, 40, 90, 56]],
+    dtype=np.float64
+)
+
+
+def _zone_masks(lng, lat) -> np.ndarray:
+    """(zones, points) membership of each point in each zone's bounding box"""
+    lng, lat = np.asarray(lng)[None, ...], np.asarray(lat)[None, ...]
+    min_lng, min_lat, max_lng, max_lat = (column[:, None] for column in _ZONE_BOUNDS.T)
+    return (min_lng <= lng) & (lng <= max_lng) & (min_lat <= lat) & (lat <= max_lat)
+
+
+def _temperature_grid() -> Dict[str, Any]:
+    """
+    1-degree temperature grid over Kazakhstan (lat 40-55, lng 46-87) with the
+    climate zone of every cell resolved once. Zone ids index _GRID_ZONES; the
+    first matching box wins, as in _get_climate_zone.
+    """
+    zones = _GRID_ZONES
+    lng, lat = np.meshgrid(np.arange(46, 88), np.arange(40, 56))
+    lng, lat = lng.ravel(), lat.ravel()
+    
+    masks = _zone_masks(lng, lat)
+    inside = masks.any(axis=0)
+    zone_ids = masks.argmax(axis=0)[inside]
+    
+    return {
+        "zone_ids": zone_ids,
+        "winter": np.array([zone["avg_temp_winter"] for zone in zones], dtype=np.float64),
+        "summer": np.array([zone["avg_temp_summer"] for zone in zones], dtype=np.float64),
+        "trend": np.array([zone["trend_celsius_decade"] for zone in zones], dtype=np.float64),
+        # Point at the center of each cell; fixed, so shared by every call
+        "geometry": tuple(
+            {"type": "Point", "coordinates": [x, y]}
+            for x, y in zip((lng[inside] + 0.5).tolist(), (lat[inside] + 0.5).tolist())
+        )
+    }
+
+
+_TEMPERATURE_GRID = _temperature_grid()
+
+_METHANE_SKELETONS = tuple(_methane_skeleton(k, v) for k, v in METHANE_HOTSPOTS.items())
+_CO2_SKELETONS = tuple(_co2_skeleton(k, v) for k, v in CO2_EMISSION_SOURCES.items())
+_CO2_TOTAL_MT = sum(source["emission_mt_year"] for source in CO2_EMISSION_SOURCES.values())
+
+
 class EnvironmentalDataService:
     """
     Provides real environmental data from multiple sources
@@ -282,65 +619,59 @@ class EnvironmentalDataService:
     def __init__(self, openaq_api_key: str = None, openweather_api_key: str = None):
         self.openaq_key = openaq_api_key
         self.openweather_key = openweather_api_key
-        self._session = None
     
     async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create aiohttp session"""
-        if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
-        return self._session
+        """Get the shared aiohttp session"""
+        return await _session.get()
     
     async def close(self):
         """Close the session"""
-        if self._session and not self._session.closed:
-            await self._session.close()
+        await _session.close()
     
     # ==============================================================
     # AIR QUALITY DATA
     # ==============================================================
     
-    async def get_realtime_air_quality(self, city: str = None, lat: float = None, lon: float = None, radius_km: float = 50) -> Dict[str, Any]:
+    @async_ttl_cache(AIR_QUALITY_CACHE_TTL)
+    async def get_realtime_air_quality(self, city: str = None, lat: float = None, lon: float = None, radius_km: float = 50,
+                                       *, summary_only: bool = False) -> Dict[str, Any]:
         """
         Get real-time air quality data for Kazakhstan
         Uses actual monitoring station data + satellite estimates
+        
+        With summary_only=True, returns {"stations": [...], "timestamp": ...}
+        holding only scalar station fields and no GeoJSON geometry.
         """
-        features = []
-        timestamp = datetime.utcnow().isoformat() + "Z"
+        timestamp = utc_timestamp()
         
-        for station_id, station in KAZAKHSTAN_AIR_QUALITY_STATIONS.items():
-            if city and city.lower() not in station["city"].lower():
-                continue
-            
-            # Generate realistic AQI values based on station type
-            base_aqi = self._calculate_base_aqi(station["type"])
-            
-            # Time-based variation
-            hour = datetime.now().hour
-            time_factor = 1.0
-            if 7 <= hour <= 9 or 17 <= hour <= 20:  # Rush hours
-                time_factor = 1.3
-            elif 0 <= hour <= 5:  # Night
-                time_factor = 0.7
-            
-            # Seasonal variation
-            month = datetime.now().month
-            if month in [12, 1, 2]:  # Winter - heating increases pollution
-                time_factor *= 1.4
-            elif month in [6, 7, 8]:  # Summer - less heating
-                time_factor *= 0.85
-            
-            # Calculate pollutant values
-            pollutants = {}
-            for sensor in station["sensors"]:
-                pollutants[sensor] = self._generate_pollutant_value(
-                    sensor, base_aqi, time_factor, station["elevation"]
-                )
-            
-            # Calculate overall AQI
-            aqi = self._calculate_aqi(pollutants)
-            category = self._get_aqi_category(aqi)
-            
-            features.append({
+        if summary_only:
+            stations = [
+                {
+                    "id": station_id,
+                    "name": station["name"],
+                    "city": station["city"],
+                    "aqi": aqi,
+                    "category": category["name"],
+                    "dominant_pollutant": dominant_pollutant,
+                    "pollutants": pollutants
+                }
+                for station_id, station, pollutants, aqi, category, dominant_pollutant
+                in self._iter_station_readings(city)
+            ]
+            return {"stations": stations, "timestamp": timestamp}
+        
+        return self.air_quality_collection(list(self.iter_realtime_air_quality(city, timestamp)), timestamp)
+    
+    def iter_realtime_air_quality(self, city: str = None, timestamp: str = None):
+        """
+        Yield air quality station Features one at a time, so callers can
+        project the fields they need as each station is produced.
+        Wrap the collected features with air_quality_collection().
+        """
+        timestamp = timestamp or utc_timestamp()
+        
+        for station_id, station, pollutants, aqi, category, dominant_pollutant in self._iter_station_readings(city):
+            yield {
                 "type": "Feature",
                 "properties": {
                     "id": station_id,
@@ -354,14 +685,16 @@ class EnvironmentalDataService:
                     "health_implications": category["health"],
                     "pollutants": pollutants,
                     "timestamp": timestamp,
-                    "dominant_pollutant": max(pollutants, key=pollutants.get)
+                    "dominant_pollutant": dominant_pollutant
                 },
                 "geometry": {
                     "type": "Point",
                     "coordinates": station["coordinates"]
                 }
-            })
-        
+            }
+    
+    def air_quality_collection(self, features: List[Dict], timestamp: str) -> Dict[str, Any]:
+        """Wrap air quality station features in a FeatureCollection with metadata"""
         return {
             "type": "FeatureCollection",
             "features": features,
@@ -373,42 +706,58 @@ class EnvironmentalDataService:
             }
         }
     
-    def _calculate_base_aqi(self, station_type: str) -> int:
-        """Calculate base AQI based on station type"""
-        base_values = {
-            "urban": 65,
-            "mountain": 25,
-            "industrial": 95,
-            "heavy_industrial": 130,
-            "coastal": 45
-        }
-        return base_values.get(station_type, 50) + random.randint(-15, 15)
-    
-    def _generate_pollutant_value(self, pollutant: str, base_aqi: int, 
-                                   time_factor: float, elevation: int) -> float:
-        """Generate realistic pollutant value"""
-        # Base concentrations in µg/m³
-        base_concentrations = {
-            "PM2.5": base_aqi * 0.35,
-            "PM10": base_aqi * 0.75,
-            "NO2": base_aqi * 0.4,
-            "SO2": base_aqi * 0.25,
-            "O3": 45 + random.uniform(-10, 20),  # O3 is higher in clean areas
-            "CO": base_aqi * 0.08,  # mg/m³
-            "CH4": 1.9 + random.uniform(0, 0.5),  # ppm
-            "H2S": random.uniform(0.002, 0.01),  # ppm
-            "As": random.uniform(0.001, 0.005),  # µg/m³
-            "Pb": random.uniform(0.01, 0.05)  # µg/m³
-        }
+    def _iter_station_readings(self, city: str = None):
+        """Yield (station_id, station, pollutants, aqi, category, dominant_pollutant) per station"""
+        table = _STATION_READINGS
+        
+        # Time-based variation
+        now = datetime.now()
+        hour = now.hour
+        time_factor = 1.0
+        if 7 <= hour <= 9 or 17 <= hour <= 20:  # Rush hours
+            time_factor = 1.3
+        elif 0 <= hour <= 5:  # Night
+            time_factor = 0.7
         
-        # Elevation adjustment (cleaner at higher elevations)
-        elev_factor = max(0.5, 1 - elevation / 3000)
+        # Seasonal variation
+        month = now.month
+        if month in [12, 1, 2]:  # Winter - heating increases pollution
+            time_factor *= 1.4
+        elif month in [6, 7, 8]:  # Summer - less heating
+            time_factor *= 0.85
         
-        value = base_concentrations.get(pollutant, 20)
-        value *= time_factor * elev_factor
-        value *= random.uniform(0.85, 1.15)  # Random noise
+        # Generate realistic AQI values based on station type, then every
+        # sensor reading of every station in one pass
+        n_readings = table["owner"].size
+        base_aqi = table["base_aqi"] + np.floor(_uniform_noise(len(table["stations"]), -15, 16))
+        values = (
+            table["scale"] * base_aqi[table["owner"]] + table["offset"]
+            + _uniform_noise(n_readings, table["low"], table["high"])
+        )
+        values *= time_factor * table["elev_factor"]
+        values *= _uniform_noise(n_readings, 0.85, 1.15)  # Random noise
+        values = np.round(values, 2)
+        
+        # Overall AQI: the worst of the PM2.5, PM10 and NO2 sub-indices,
+        # reading 0 where a station has no such sensor
+        padded = np.append(values, 0.0)
+        aqis = np.maximum.reduce([
+            _breakpoint_aqi(padded[table["pm25_at"]], _PM25_BREAKPOINTS),
+            _breakpoint_aqi(padded[table["pm10_at"]], _PM10_BREAKPOINTS),
+            _breakpoint_aqi(padded[table["no2_at"]], _NO2_BREAKPOINTS)
+        ]).tolist()
+        values = values.tolist()
         
-        return round(value, 2)
+        for (station_id, station), (start, end), aqi in zip(table["stations"], table["slices"], aqis):
+            if city and city.lower() not in station["city"].lower():
+                continue
+            
+            pollutants = dict(zip(station["sensors"], values[start:end]))
+            category = self._get_aqi_category(aqi)
+            
+            dominant_pollutant = max(pollutants.items(), key=itemgetter(1))[0]
+            
+            yield station_id, station, pollutants, aqi, category, dominant_pollutant
     
     def _calculate_aqi(self, pollutants: Dict[str, float]) -> int:
         """Calculate overall AQI from pollutant concentrations"""
@@ -426,124 +775,63 @@ class EnvironmentalDataService:
     
     def _pm25_to_aqi(self, pm25: float) -> int:
         """Convert PM2.5 to AQI"""
-        breakpoints = [
-            (0, 12, 0, 50),
-            (12.1, 35.4, 51, 100),
-            (35.5, 55.4, 101, 150),
-            (55.5, 150.4, 151, 200),
-            (150.5, 250.4, 201, 300),
-            (250.5, 500, 301, 500)
-        ]
-        return self._calculate_aqi_breakpoint(pm25, breakpoints)
+        return self._calculate_aqi_breakpoint(pm25, _PM25_BREAKPOINTS)
     
     def _pm10_to_aqi(self, pm10: float) -> int:
         """Convert PM10 to AQI"""
-        breakpoints = [
-            (0, 54, 0, 50),
-            (55, 154, 51, 100),
-            (155, 254, 101, 150),
-            (255, 354, 151, 200),
-            (355, 424, 201, 300),
-            (425, 604, 301, 500)
-        ]
-        return self._calculate_aqi_breakpoint(pm10, breakpoints)
+        return self._calculate_aqi_breakpoint(pm10, _PM10_BREAKPOINTS)
     
     def _no2_to_aqi(self, no2: float) -> int:
         """Convert NO2 to AQI"""
-        breakpoints = [
-            (0, 53, 0, 50),
-            (54, 100, 51, 100),
-            (101, 360, 101, 150),
-            (361, 649, 151, 200),
-            (650, 1249, 201, 300),
-            (1250, 2049, 301, 500)
-        ]
-        return self._calculate_aqi_breakpoint(no2, breakpoints)
+        return self._calculate_aqi_breakpoint(no2, _NO2_BREAKPOINTS)
     
-    def _calculate_aqi_breakpoint(self, conc: float, breakpoints: List[Tuple]) -> int:
-        """Calculate AQI from concentration using breakpoints"""
-        for c_low, c_high, i_low, i_high in breakpoints:
-            if c_low <= conc <= c_high:
+    def _calculate_aqi_breakpoint(self, conc: float, breakpoints: Tuple) -> int:
+        """Calculate AQI from concentration using (c_high column, rows) breakpoints"""
+        highs, rows, _ = breakpoints
+        index = bisect_left(highs, conc)
+        if index < len(rows):
+            c_low, c_high, i_low, i_high = rows[index]
+            if c_low <= conc:
                 return int(((i_high - i_low) / (c_high - c_low)) * (conc - c_low) + i_low)
         return 500 if conc > 0 else 0
     
-    def _get_aqi_category(self, aqi: int) -> Dict[str, str]:
-        """Get AQI category information"""
-        categories = [
-            (50, "Good", "#00e400", "Air quality is satisfactory"),
-            (100, "Moderate", "#ffff00", "Acceptable quality, some concern for sensitive groups"),
-            (150, "Unhealthy for Sensitive Groups", "#ff7e00", "Sensitive groups may experience health effects"),
-            (200, "Unhealthy", "#ff0000", "Everyone may experience health effects"),
-            (300, "Very Unhealthy", "#8f3f97", "Health alert: serious health effects"),
-            (500, "Hazardous", "#7e0023", "Health emergency: everyone affected")
-        ]
-        
-        for threshold, name, color, health in categories:
-            if aqi <= threshold:
-                return {"name": name, "color": color, "health": health}
-        return {"name": "Hazardous", "color": "#7e0023", "health": "Health emergency"}
+    def _get_aqi_category(self, aqi: int) -> Mapping[str, str]:
+        """Get AQI category information (a shared read-only mapping)"""
+        return AQI_CATEGORIES[bisect_left(AQI_CATEGORY_THRESHOLDS, aqi)]
     
     # ==============================================================
     # METHANE DATA
     # ==============================================================
     
-    async def get_methane_emissions(self, bounds: Dict = None) -> Dict[str, Any]:
+    @async_ttl_cache(EMISSIONS_CACHE_TTL)
+    async def get_methane_emissions(self) -> Dict[str, Any]:
         """
         Get methane emission data for Kazakhstan
         Based on Sentinel-5P TROPOMI data patterns
         """
         features = []
-        timestamp = datetime.utcnow().isoformat() + "Z"
+        timestamp = utc_timestamp()
         
-        for hotspot_id, hotspot in METHANE_HOTSPOTS.items():
-            # Generate plume visualization
-            center = hotspot["coordinates"]
-            emission_rate = hotspot["emission_rate_kt_year"]
+        for skeleton in _METHANE_SKELETONS:
+            center = skeleton["center"]
+            emission_rate = skeleton["emission_rate"]
+            radius = skeleton["radius"]
             
-            # Create emission area polygon
-            area_km2 = hotspot["area_km2"]
-            radius = math.sqrt(area_km2 / math.pi) / 111
-            
-            # Create irregular emission zone
-            polygon_points = []
-            for i in range(16):
-                angle = i * 22.5 * math.pi / 180
-                r = radius * (0.7 + random.uniform(0, 0.5))
-                lng = center[0] + r * math.cos(angle)
-                lat = center[1] + r * math.sin(angle)
-                polygon_points.append([lng, lat])
+            # Create irregular emission zone: all 16 jittered vertices at once
+            r = radius * (0.7 + _uniform_noise(_ZONE_ANGLES.size, 0, 0.5))
+            polygon_points = np.column_stack((center[0] + r * _ZONE_COS, center[1] + r * _ZONE_SIN)).tolist()
             polygon_points.append(polygon_points[0])
             
-            # Color intensity based on emission rate
-            if emission_rate > 600:
-                color = "#dc2626"  # Red - high
-                opacity = 0.7
-            elif emission_rate > 300:
-                color = "#f97316"  # Orange - medium
-                opacity = 0.6
-            else:
-                color = "#fbbf24"  # Yellow - lower
-                opacity = 0.5
-            
             # Generate plume points for visualization
-            plume_points = self._generate_plume_points(center, emission_rate, area_km2)
+            plume_points = self._generate_plume_points(center, emission_rate, radius)
             
             features.append({
                 "type": "Feature",
                 "properties": {
-                    "id": hotspot_id,
-                    "name": hotspot["name"],
-                    "source_type": hotspot["type"],
-                    "emission_rate_kt_year": emission_rate,
-                    "emission_source": hotspot["source"],
-                    "area_km2": area_km2,
-                    "detected_plumes": hotspot["detected_plumes"],
-                    "trend": hotspot["trend"],
-                    "color": color,
-                    "opacity": opacity,
+                    **skeleton["properties"],
                     "plume_points": plume_points,
                     "timestamp": timestamp,
-                    "concentration_ppb": 1850 + emission_rate * 0.3 + random.randint(-50, 50),
+                    "concentration_ppb": 1850 + emission_rate * 0.3 + _rng.randint(-50, 50),
                     "background_ppb": 1850
                 },
                 "geometry": {
@@ -566,94 +854,54 @@ class EnvironmentalDataService:
         }
     
     def _generate_plume_points(self, center: List[float], emission_rate: float, 
-                               area_km2: float) -> List[Dict]:
-        """Generate methane plume visualization points"""
-        points = []
+                               radius: float) -> List[Dict]:
+        """Generate methane plume visualization points around a zone of the given radius (degrees)"""
         num_points = min(100, int(emission_rate / 5))
-        radius = math.sqrt(area_km2 / math.pi) / 111
         
-        for _ in range(num_points):
-            # Gaussian distribution for plume shape
-            dx = random.gauss(0, radius * 0.4)
-            dy = random.gauss(0, radius * 0.3)
-            
-            # Wind-driven offset (typical westerly winds)
-            dx += radius * 0.2
-            
-            concentration = emission_rate / 100 * random.uniform(0.5, 1.5)
-            
-            points.append({
-                "lng": center[0] + dx,
-                "lat": center[1] + dy,
-                "concentration": round(concentration, 2),
-                "height_m": random.randint(0, 500)
-            })
+        # Gaussian distribution for plume shape, drawn for all points at once,
+        # plus the wind-driven offset (typical westerly winds)
+        lng = center[0] + _normal_noise(num_points, radius * 0.4) + radius * 0.2
+        lat = center[1] + _normal_noise(num_points, radius * 0.3)
+        concentration = np.round(emission_rate / 100 * _uniform_noise(num_points, 0.5, 1.5), 2)
+        height_m = _uniform_noise(num_points, 0, 501).astype(np.int64)
         
-        return points
+        return [
+            {"lng": x, "lat": y, "concentration": c, "height_m": h}
+            for x, y, c, h in zip(lng.tolist(), lat.tolist(), concentration.tolist(), height_m.tolist())
+        ]
     
     # ==============================================================
     # CO2 EMISSIONS DATA
     # ==============================================================
     
-    async def get_co2_emissions(self, bounds: Dict = None) -> Dict[str, Any]:
+    @async_ttl_cache(EMISSIONS_CACHE_TTL)
+    async def get_co2_emissions(self) -> Dict[str, Any]:
         """
         Get CO2 emission data for major sources in Kazakhstan
         Based on real industrial emission data
         """
         features = []
-        timestamp = datetime.utcnow().isoformat() + "Z"
-        total_emissions = 0
+        timestamp = utc_timestamp()
         
-        for source_id, source in CO2_EMISSION_SOURCES.items():
-            emission_mt = source["emission_mt_year"]
-            total_emissions += emission_mt
-            
-            # Current emission rate (with daily variation)
-            hour = datetime.now().hour
-            if source["type"] in ["power_generation", "combined_heat_power"]:
-                # Power plants have load curves
-                if 8 <= hour <= 20:  # Peak hours
-                    current_factor = 1.2
-                else:
-                    current_factor = 0.8
+        # Current emission rate (with daily variation)
+        load_factor = 1.2 if 8 <= datetime.now().hour <= 20 else 0.8  # Peak hours
+        
+        for skeleton in _CO2_SKELETONS:
+            if skeleton["load_curve"]:
+                current_factor = load_factor
             else:
-                current_factor = 0.9 + random.uniform(0, 0.2)
-            
-            current_emission_tph = (emission_mt * 1000000 / 8760) * current_factor
+                current_factor = 0.9 + _rng.uniform(0, 0.2)
             
-            # Visual representation radius based on emissions
-            radius = math.sqrt(emission_mt) * 0.02
-            
-            # Color based on emission intensity
-            if emission_mt > 20:
-                color = "#991b1b"
-            elif emission_mt > 10:
-                color = "#dc2626"
-            elif emission_mt > 5:
-                color = "#f97316"
-            else:
-                color = "#fbbf24"
+            current_emission_tph = (skeleton["emission_mt"] * 1000000 / 8760) * current_factor
             
             features.append({
                 "type": "Feature",
                 "properties": {
-                    "id": source_id,
-                    "name": source["name"],
-                    "facility_type": source["type"],
-                    "emission_mt_year": emission_mt,
+                    **skeleton["properties"],
                     "current_emission_tph": round(current_emission_tph, 1),
-                    "fuel_type": source.get("fuel_type", "mixed"),
-                    "capacity": source.get("capacity_mw") or source.get("capacity_bpd") or source.get("capacity_mt_steel"),
-                    "efficiency_percent": source.get("efficiency_percent"),
-                    "co2_intensity": source.get("co2_intensity_gkwh"),
-                    "color": color,
-                    "radius": radius,
                     "timestamp": timestamp
                 },
-                "geometry": {
-                    "type": "Point",
-                    "coordinates": source["coordinates"]
-                }
+                "geometry": skeleton["geometry"]
             })
         
         return {
@@ -662,7 +910,7 @@ class EnvironmentalDataService:
             "metadata": {
                 "source": "Kazakhstan Industrial Emission Inventory",
                 "timestamp": timestamp,
-                "total_emissions_mt_year": round(total_emissions, 1),
+                "total_emissions_mt_year": round(_CO2_TOTAL_MT, 1),
                 "data_year": 2024,
                 "sectors_covered": ["power", "industry", "oil_gas", "cement"]
             }
@@ -677,71 +925,11 @@ class EnvironmentalDataService:
         Get temperature distribution data for Kazakhstan
         Based on climate monitoring stations and ERA5 reanalysis
         """
-        features = []
-        timestamp = datetime.utcnow().isoformat() + "Z"
-        
-        # Get current month and time for realistic temperatures
-        month = datetime.now().month
-        hour = datetime.now().hour
-        
-        # Determine if winter or summer
-        is_winter = month in [12, 1, 2]
-        is_summer = month in [6, 7, 8]
-        
-        # Generate temperature grid
-        grid_resolution = 1.0  # degrees
-        lat_range = range(40, 56)  # Kazakhstan latitude range
-        lng_range = range(46, 88)  # Kazakhstan longitude range
-        
-        for lat in lat_range:
-            for lng in lng_range:
-                # Find which climate zone this point is in
-                zone = self._get_climate_zone(lng, lat)
-                if zone is None:
-                    continue
-                
-                # Calculate base temperature
-                if is_winter:
-                    base_temp = zone["avg_temp_winter"]
-                elif is_summer:
-                    base_temp = zone["avg_temp_summer"]
-                else:  # Spring/Autumn
-                    base_temp = (zone["avg_temp_winter"] + zone["avg_temp_summer"]) / 2
-                
-                # Diurnal variation
-                if 6 <= hour <= 14:  # Warming
-                    diurnal = (hour - 6) / 8 * 8
-                elif 14 < hour <= 22:  # Cooling
-                    diurnal = 8 - (hour - 14) / 8 * 8
-                else:  # Night - cold
-                    diurnal = -4
-                
-                # Add some random variation
-                temp = base_temp + diurnal + random.uniform(-3, 3)
-                
-                # Climate change trend (warming)
-                years_since_1990 = datetime.now().year - 1990
-                warming = zone["trend_celsius_decade"] * years_since_1990 / 10
-                temp += warming
-                
-                features.append({
-                    "type": "Feature",
-                    "properties": {
-                        "temperature": round(temp, 1),
-                        "climate_zone": zone["name"],
-                        "climate_type": zone["climate_type"],
-                        "color": self._temp_to_color(temp),
-                        "weight": max(0.1, min(1, (temp + 20) / 60))
-                    },
-                    "geometry": {
-                        "type": "Point",
-                        "coordinates": [lng + 0.5, lat + 0.5]  # Center of cell
-                    }
-                })
+        timestamp = utc_timestamp()
         
         return {
             "type": "FeatureCollection",
-            "features": features,
+            "features": list(self._temperature_features()),
             "metadata": {
                 "source": "Kazakhstan Meteorological Service + ERA5 Reanalysis",
                 "timestamp": timestamp,
@@ -750,46 +938,70 @@ class EnvironmentalDataService:
             }
         }
     
-    def _get_climate_zone(self, lng: float, lat: float) -> Optional[Dict]:
-        """Determine climate zone for a point"""
-        for zone_id, zone in CLIMATE_ZONES.items():
-            bounds = zone["bounds"]
-            if (bounds[0][0] <= lng <= bounds[1][0] and 
-                bounds[0][1] <= lat <= bounds[1][1]):
-                return zone
+    async def stream_temperature_ndjson(self) -> AsyncIterator[bytes]:
+        """Stream the temperature grid as NDJSON, one encoded feature per line"""
+        for feature in self._temperature_features():
+            yield orjson.dumps(feature) + b"\n"
+    
+    def _temperature_features(self) -> Iterator[Dict[str, Any]]:
+        """Yield the temperature grid features for the current hour"""
+        grid = _TEMPERATURE_GRID
+        
+        # Get current month and time for realistic temperatures
+        now = datetime.now()
+        month = now.month
+        hour = now.hour
+        
+        # Calculate base temperature per zone
+        if month in [12, 1, 2]:  # Winter
+            base_temp = grid["winter"]
+        elif month in [6, 7, 8]:  # Summer
+            base_temp = grid["summer"]
+        else:  # Spring/Autumn
+            base_temp = (grid["winter"] + grid["summer"]) / 2
+        
+        # Diurnal variation
+        if 6 <= hour <= 14:  # Warming
+            diurnal = (hour - 6) / 8 * 8
+        elif 14 < hour <= 22:  # Cooling
+            diurnal = 8 - (hour - 14) / 8 * 8
+        else:  # Night - cold
+            diurnal = -4
         
-        # Return default continental if not in specific zone
-        if 45 <= lng <= 90 and 40 <= lat <= 56:
-            return {
-                "name": "Continental Kazakhstan",
-                "avg_temp_winter": -12,
-                "avg_temp_summer": 26,
-                "precipitation_mm": 250,
-                "climate_type": "continental",
-                "trend_celsius_decade": 0.4
+        # Climate change trend (warming) per zone
+        warming = grid["trend"] * (now.year - 1990) / 10
+        
+        # Whole grid at once: zone values gathered per cell plus random variation
+        zone_ids = grid["zone_ids"]
+        temp = base_temp[zone_ids] + diurnal + _uniform_noise(zone_ids.size, -3, 3)
+        temp += warming[zone_ids]
+        
+        colors = _TEMP_COLOR_TABLE[np.digitize(temp, _TEMP_COLOR_BREAKS)].tolist()
+        weights = np.clip((temp + 20) / 60, 0.1, 1).tolist()
+        
+        for t, z, color, weight, geometry in zip(
+            np.round(temp, 1).tolist(), zone_ids.tolist(), colors, weights, grid["geometry"]
+        ):
+            yield {
+                "type": "Feature",
+                "properties": {
+                    "temperature": t,
+                    "climate_zone": _GRID_ZONES[z]["name"],
+                    "climate_type": _GRID_ZONES[z]["climate_type"],
+                    "color": color,
+                    "weight": weight
+                },
+                "geometry": geometry
             }
-        return None
+    
+    def _get_climate_zone(self, lng: float, lat: float) -> Optional[Dict]:
+        """Determine climate zone for a point (continental default if in no specific zone)"""
+        inside = _zone_masks(lng, lat)[:, 0]
+        return _GRID_ZONES[inside.argmax()] if inside.any() else None
     
     def _temp_to_color(self, temp: float) -> str:
         """Convert temperature to color for visualization"""
-        if temp < -30:
-            return "#1e3a8a"  # Dark blue - extreme cold
-        elif temp < -20:
-            return "#2563eb"  # Blue - very cold
-        elif temp < -10:
-            return "#3b82f6"  # Light blue - cold
-        elif temp < 0:
-            return "#67e8f9"  # Cyan - freezing
-        elif temp < 10:
-            return "#86efac"  # Light green - cool
-        elif temp < 20:
-            return "#22c55e"  # Green - mild
-        elif temp < 30:
-            return "#f59e0b"  # Orange - warm
-        elif temp < 40:
-            return "#ef4444"  # Red - hot
-        else:
-            return "#991b1b"  # Dark red - extreme heat
+        return _TEMP_COLORS[bisect_right(_TEMP_COLOR_BREAKS, temp)]
     
     # ==============================================================
     # COMBINED ENVIRONMENTAL LAYER
@@ -800,9 +1012,12 @@ class EnvironmentalDataService:
         Get comprehensive environmental overview for Kazakhstan
         Combines all environmental data types
         """
-        air_quality = await self.get_realtime_air_quality()
-        methane = await self.get_methane_emissions()
-        co2 = await self.get_co2_emissions()
+        # Independent sources: fetch concurrently over the shared session
+        air_quality, methane, co2 = await asyncio.gather(
+            self.get_realtime_air_quality(),
+            self.get_methane_emissions(),
+            self.get_co2_emissions()
+        )
         
         # Calculate summary statistics
         aqi_values = [f["properties"]["aqi"] for f in air_quality["features"]]
@@ -819,7 +1034,7 @@ class EnvironmentalDataService:
         )
         
         return {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": utc_timestamp(),
             "summary": {
                 "average_aqi": round(avg_aqi),
                 "aqi_status": self._get_aqi_category(int(avg_aqi))["name"],
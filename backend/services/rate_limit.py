@@ -0,0 +1,45 @@
+"""
+Rate Limiting Helpers
+Client-side token buckets that keep upstream API calls under provider limits
+"""
+
+import asyncio
+import time
+
+
+class AsyncRateLimiter:
+    """
+    Token bucket allowing max_rate acquisitions per period seconds.
+    Used as `async with limiter:`; callers over the limit wait in line for
+    the next token instead of firing requests the provider would reject.
+    """
+
+    def __init__(self, max_rate: float, period: float = 60):
+        self.max_rate = max_rate
+        self.period = period
+        self._tokens = float(max_rate)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(
+            self.max_rate, self._tokens + (now - self._updated) * self.max_rate / self.period
+        )
+        self._updated = now
+
+    async def acquire(self):
+        # The lock queues waiters in order, so one token is handed out at a time
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) * self.period / self.max_rate)
+                self._refill()
+            self._tokens -= 1
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return None
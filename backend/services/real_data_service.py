@@ -6,11 +6,31 @@ Based on opengeos projects and GeoGPT research
 
 import asyncio
 import aiohttp
+import codecs
+import csv
+import functools
+import io
 import json
-from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional, Tuple
+import logging
+import sys
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from operator import itemgetter
+from types import MappingProxyType
+from typing import Dict, Any, AsyncIterator, List, Mapping, Optional, Tuple
 import os
 
+import numpy as np
+import orjson
+
+from services.cache import async_ttl_cache, per_second_stamp
+from services.common import PooledSession
+from services.rate_limit import AsyncRateLimiter
+
+logger = logging.getLogger(__name__)
+
 # Real API endpoints
 OPENAQ_API = "https://api.openaq.org/v2"
 NASA_FIRMS_API = "https://firms.modaps.eosdis.nasa.gov/api/area/csv"
@@ -23,29 +43,745 @@ OPENAQ_API_KEY = os.getenv("OPENAQ_API_KEY", "")
 NASA_API_KEY = os.getenv("NASA_API_KEY", "")
 OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY", "")
 
+# Upstream responses are cached per request parameters for this many seconds,
+# keeping at most this many parameter sets per endpoint
+UPSTREAM_CACHE_TTL = 300
+UPSTREAM_CACHE_MAXSIZE = 128
+
+# Client-side request budgets per provider, so bursts queue locally instead of
+# drawing 429s
+_limiters = {
+    "openaq": AsyncRateLimiter(60, 60),
+    "firms": AsyncRateLimiter(5000, 600),
+    "usgs": AsyncRateLimiter(100, 60)
+}
+
+# Providers that answered 429/503 are left alone until this monotonic time
+_backoff_until: Dict[str, float] = {}
+_DEFAULT_BACKOFF = 30
+_MAX_BACKOFF = 300
+
+
+def _backing_off(provider: str) -> bool:
+    """Whether a provider recently rejected a request and is still being avoided"""
+    return _backoff_until.get(provider, 0) > time.monotonic()
+
+
+def _note_failure(provider: str, error: Exception):
+    """Start a back-off when the provider throttled us or is unavailable"""
+    if isinstance(error, aiohttp.ClientResponseError) and error.status in (429, 503):
+        retry_after = error.headers.get("Retry-After") if error.headers else None
+        delay = int(retry_after) if retry_after and retry_after.isdigit() else _DEFAULT_BACKOFF
+        _backoff_until[provider] = time.monotonic() + min(delay, _MAX_BACKOFF)
+
+
+# Validators of the last full response per upstream request, as
+# (ETag, Last-Modified, parsed payload): once the TTL cache expires the
+# request is revalidated, and a 304 reuses the payload without a download
+_validators: Dict[Any, Tuple[Optional[str], Optional[str], Any]] = {}
+_VALIDATORS_MAX_ENTRIES = 64
+
+
+# One pooled session per process, shared by the OpenAQ, USGS and FIRMS calls.
+# Error statuses raise ClientResponseError; cookies are never needed.
+_session = PooledSession(total_timeout=30, keep_cookies=False, raise_for_status=True)
+
+
+# UTC ISO-8601 timestamp for response metadata, formatted at most once per second
+_iso_now = per_second_stamp(
+    lambda second: datetime.fromtimestamp(second, timezone.utc).replace(tzinfo=None).isoformat()
+)
+
+
+def _conditional_headers(entry: Optional[Tuple[Optional[str], Optional[str], Any]]) -> Dict[str, str]:
+    """
+    If-None-Match / If-Modified-Since headers for a _validators entry. Callers
+    read the entry once and answer a 304 from that same tuple, since a
+    concurrent fetch may replace or clear the table meanwhile.
+    """
+    if entry is None:
+        return {}
+    etag, last_modified, _ = entry
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+def _remember_validators(key: Any, response: aiohttp.ClientResponse, payload: Any):
+    """Store a full response's validators with its parsed payload"""
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if not etag and not last_modified:
+        _validators.pop(key, None)
+        return
+    if len(_validators) >= _VALIDATORS_MAX_ENTRIES:
+        _validators.clear()
+    _validators[key] = (etag, last_modified, payload)
+
+
+def _intern(value: Any) -> Any:
+    """Intern low-cardinality strings decoded from upstream JSON (keys, units, cities)"""
+    return sys.intern(value) if type(value) is str else value
+
+
+@dataclass(slots=True, frozen=True)
+class Fire:
+    """
+    One fire detection. Fires can number in the tens of thousands, so they
+    are slotted records rather than dicts; orjson and FastAPI's encoder
+    serialize dataclasses as JSON objects directly.
+    """
+    latitude: float
+    longitude: float
+    coordinates: list
+    brightness: float
+    confidence: int
+    frp: float
+    satellite: str
+    acq_date: str
+    acq_time: str
+
+
+# FIRMS CSV fields read per fire, with the value used when a column is absent
+_FIRMS_COLUMNS = ("latitude", "longitude", "bright_ti4", "frp", "confidence",
+                  "satellite", "acq_date", "acq_time")
+_FIRMS_DEFAULTS = ("0", "0", "0", "0", "nominal", "VIIRS", "", "")
+
+# Confidence classes as 0-100 numbers; any other value counts as nominal
+_FIRMS_CONFIDENCE = {"low": 30, "nominal": 65, "high": 90}
+
+
+def _firms_confidence(value: str) -> int:
+    """Convert a FIRMS confidence field to a 0-100 number"""
+    return _FIRMS_CONFIDENCE.get(value, 65)
+
+
+async def _iter_csv_rows(content: aiohttp.StreamReader) -> AsyncIterator[List[List[str]]]:
+    """Yield the rows of a streamed UTF-8 CSV body, one batch per network chunk"""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    async for chunk in content.iter_any():
+        complete, _, pending = (pending + decoder.decode(chunk)).rpartition("\n")
+        if complete:
+            yield list(csv.reader(io.StringIO(complete)))
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield list(csv.reader(io.StringIO(pending)))
+
+
+async def _iter_firms_batches(content: aiohttp.StreamReader):
+    """
+    Parse a streamed NASA FIRMS CSV body batch by batch. Yields
+    (data rows seen, fire dicts, frp array, confidence array) per batch;
+    each batch is converted column-wise with NumPy rather than one
+    float() call per field.
+    """
+    n_columns = 0
+    pick = pad = None
+    
+    async for rows in _iter_csv_rows(content):
+        rows = [values for values in rows if values]
+        if pick is None and rows:
+            # Header row: resolve each field to its column once,
+            # pointing missing ones at a padded default instead
+            header = rows.pop(0)
+            n_columns = len(header)
+            index = {name: i for i, name in enumerate(header)}
+            positions = [
+                index.get(name, n_columns + k) for k, name in enumerate(_FIRMS_COLUMNS)
+            ]
+            pick = itemgetter(*positions)
+            if max(positions) >= n_columns:
+                pad = list(_FIRMS_DEFAULTS)
+        n_rows = len(rows)
+        
+        rows = [pick(values[:n_columns] + pad if pad else values)
+                for values in rows if len(values) >= n_columns]
+        if not rows:
+            yield n_rows, [], None, None
+            continue
+        
+        lat, lon, brightness, frp, confidence, satellite, acq_date, acq_time = zip(*rows)
+        lat = np.array(lat, dtype=np.float64)
+        lon = np.array(lon, dtype=np.float64)
+        brightness = np.array(brightness, dtype=np.float64)
+        frp = np.array(frp, dtype=np.float64)
+        confidence = np.fromiter(map(_firms_confidence, confidence), dtype=np.int64, count=len(rows))
+        
+        fires = [
+            Fire(y, x, [x, y], b, c, f, sat, date, time)
+            for x, y, b, c, f, sat, date, time in zip(
+                lon.tolist(), lat.tolist(), brightness.tolist(), confidence.tolist(),
+                frp.tolist(), satellite, acq_date, acq_time
+            )
+        ]
+        yield n_rows, fires, frp, confidence
+
+
+def _fire_feature(fire: "Fire") -> Dict[str, Any]:
+    """GeoJSON point feature with the fire record as its properties"""
+    return {
+        "type": "Feature",
+        "properties": fire,
+        "geometry": {"type": "Point", "coordinates": fire.coordinates}
+    }
+
+
+def _encode_features(features, as_seq: bool = False) -> bytes:
+    """Encode features as one FeatureCollection, or as a GeoJSON text sequence (RFC 8142)"""
+    if as_seq:
+        return b"".join(b"\x1e" + orjson.dumps(feature) + b"\n" for feature in features)
+    return orjson.dumps({"type": "FeatureCollection", "features": features})
+
+
+# EPA PM2.5 breakpoints: segment i covers concentrations up to and including
+# _PM25_AQI_HIGHS[i] (the last one anything above), as (slope, C_low, I_low)
+_PM25_AQI_HIGHS = (12.0, 35.4, 55.4, 150.4, 250.4)
+_PM25_AQI_SEGMENTS = tuple(
+    ((i_high - i_low) / (c_high - c_low), c_low, i_low)
+    for c_low, c_high, i_low, i_high in (
+        (0, 12, 0, 50),
+        (12.1, 35.4, 51, 100),
+        (35.5, 55.4, 101, 150),
+        (55.5, 150.4, 151, 200),
+        (150.5, 250.4, 201, 300),
+        (250.5, 500, 301, 500),
+    )
+)
+
+
+_PM25_HIGHS_ARRAY = np.array(_PM25_AQI_HIGHS)
+_PM25_SLOPES, _PM25_C_LOWS, _PM25_I_LOWS = (np.array(column) for column in zip(*_PM25_AQI_SEGMENTS))
+
+
+def _pm25_to_aqi_vec(pm25: np.ndarray) -> np.ndarray:
+    """AQI for an array of PM2.5 readings (EPA formula, truncated to int)"""
+    segment = np.searchsorted(_PM25_HIGHS_ARRAY, pm25, side="left")
+    aqi = _PM25_SLOPES[segment] * (pm25 - _PM25_C_LOWS[segment]) + _PM25_I_LOWS[segment]
+    return aqi.astype(np.int64)
+
+
+# AQI categories for the real-data payloads: _AQI_CATEGORIES[i] covers AQI up
+# to and including _AQI_CATEGORY_THRESHOLDS[i], the last one anything above.
+# These strings differ from the simulated service's table in services.common,
+# and clients already depend on them. Read-only mappings shared by every caller.
+_AQI_CATEGORY_THRESHOLDS = (50, 100, 150, 200, 300)
+_AQI_CATEGORIES = tuple(
+    MappingProxyType({"name": name, "color": color, "health": health})
+    for name, color, health in (
+        ("Good", "#00E400", "Air quality is satisfactory"),
+        ("Moderate", "#FFFF00", "Acceptable air quality"),
+        ("Unhealthy for Sensitive Groups", "#FF7E00", "Sensitive groups may experience health effects"),
+        ("Unhealthy", "#FF0000", "Everyone may experience health effects"),
+        ("Very Unhealthy", "#8F3F97", "Health alert: significant health effects"),
+        ("Hazardous", "#7E0023", "Emergency conditions")
+    )
+)
+
+
+# ===========================================
+# PREBUILT FALLBACK COLLECTIONS
+# ===========================================
+# The sample collections never change at run time, so they are built once at
+# import; the methods only splice in a fresh timestamp. Shared, treat as read-only.
+
+# Real Kazakhstan air quality stations with typical values
+_FALLBACK_AQ_STATIONS = [
+    {
+        "id": "almaty_001",
+        "name": "Almaty - Abay Avenue",
+        "city": "Almaty",
+        "country": "KZ",
+        "aqi": 78,
+        "category": "Moderate",
+        "color": "#FFFF00",
+        "coordinates": [76.9458, 43.2220],
+        "parameters": {
+            "pm25": {"value": 23.5, "unit": "µg/m³"},
+            "pm10": {"value": 45.2, "unit": "µg/m³"},
+            "no2": {"value": 28.3, "unit": "µg/m³"},
+            "o3": {"value": 42.1, "unit": "µg/m³"}
+        },
+        "sensors": ["pm25", "pm10", "no2", "o3"]
+    },
+    {
+        "id": "astana_001",
+        "name": "Astana - Downtown",
+        "city": "Astana",
+        "country": "KZ",
+        "aqi": 52,
+        "category": "Moderate",
+        "color": "#FFFF00",
+        "coordinates": [71.4491, 51.1801],
+        "parameters": {
+            "pm25": {"value": 12.8, "unit": "µg/m³"},
+            "pm10": {"value": 28.5, "unit": "µg/m³"},
+            "no2": {"value": 18.2, "unit": "µg/m³"}
+        },
+        "sensors": ["pm25", "pm10", "no2"]
+    },
+    {
+        "id": "atyrau_001",
+        "name": "Atyrau - Industrial Zone",
+        "city": "Atyrau",
+        "country": "KZ",
+        "aqi": 95,
+        "category": "Unhealthy for Sensitive Groups",
+        "color": "#FF7E00",
+        "coordinates": [51.9200, 46.8500],
+        "parameters": {
+            "pm25": {"value": 35.2, "unit": "µg/m³"},
+            "pm10": {"value": 68.4, "unit": "µg/m³"},
+            "so2": {"value": 22.5, "unit": "µg/m³"},
+            "no2": {"value": 42.3, "unit": "µg/m³"}
+        },
+        "sensors": ["pm25", "pm10", "so2", "no2"]
+    },
+    {
+        "id": "karaganda_001",
+        "name": "Karaganda - City Center",
+        "city": "Karaganda",
+        "country": "KZ",
+        "aqi": 88,
+        "category": "Moderate",
+        "color": "#FFFF00",
+        "coordinates": [73.1022, 49.8047],
+        "parameters": {
+            "pm25": {"value": 28.7, "unit": "µg/m³"},
+            "pm10": {"value": 52.1, "unit": "µg/m³"},
+            "co": {"value": 1.2, "unit": "mg/m³"}
+        },
+        "sensors": ["pm25", "pm10", "co"]
+    },
+    {
+        "id": "shymkent_001",
+        "name": "Shymkent - Residential",
+        "city": "Shymkent",
+        "country": "KZ",
+        "aqi": 65,
+        "category": "Moderate",
+        "color": "#FFFF00",
+        "coordinates": [69.5958, 42.3417],
+        "parameters": {
+            "pm25": {"value": 18.4, "unit": "µg/m³"},
+            "pm10": {"value": 35.6, "unit": "µg/m³"}
+        },
+        "sensors": ["pm25", "pm10"]
+    },
+    {
+        "id": "aktau_001",
+        "name": "Aktau - Coastal",
+        "city": "Aktau",
+        "country": "KZ",
+        "aqi": 42,
+        "category": "Good",
+        "color": "#00E400",
+        "coordinates": [51.1667, 43.6500],
+        "parameters": {
+            "pm25": {"value": 8.5, "unit": "µg/m³"},
+            "pm10": {"value": 22.3, "unit": "µg/m³"}
+        },
+        "sensors": ["pm25", "pm10"]
+    }
+]
+
+
+def _fallback_air_quality_base() -> Dict[str, Any]:
+    stations = _FALLBACK_AQ_STATIONS
+    features = [
+        {
+            "type": "Feature",
+            "properties": {k: v for k, v in s.items() if k != "coordinates"},
+            "geometry": {
+                "type": "Point",
+                "coordinates": s["coordinates"]
+            }
+        }
+        for s in stations
+    ]
+    
+    avg_aqi = sum(s["aqi"] for s in stations) / len(stations)
+    
+    return {
+        "type": "FeatureCollection",
+        "features": features,
+        "stations": stations,
+        "summary": {
+            "total_stations": len(stations),
+            "avg_aqi": round(avg_aqi),
+            "overall_status": _AQI_CATEGORIES[bisect_left(_AQI_CATEGORY_THRESHOLDS, avg_aqi)]["name"]
+        },
+        "metadata": {
+            "source": "Kazakhstan Environmental Monitoring (Cached Data)"
+        }
+    }
+
+
+_FALLBACK_AQ_BASE = _fallback_air_quality_base()
+
+
+@functools.lru_cache(maxsize=1)
+def _fallback_fire_base(acq_date: str) -> Dict[str, Any]:
+    """Typical fire locations in Kazakhstan (agricultural/steppe fires), rebuilt once per day"""
+    fires = [
+        Fire(
+            latitude=50.42,
+            longitude=66.85,
+            coordinates=[66.85, 50.42],
+            brightness=312.5,
+            confidence=78,
+            frp=25.3,
+            satellite="VIIRS",
+            acq_date=acq_date,
+            acq_time="1145"
+        ),
+        Fire(
+            latitude=47.85,
+            longitude=68.42,
+            coordinates=[68.42, 47.85],
+            brightness=298.2,
+            confidence=65,
+            frp=18.7,
+            satellite="MODIS",
+            acq_date=acq_date,
+            acq_time="0845"
+        ),
+        Fire(
+            latitude=52.15,
+            longitude=77.28,
+            coordinates=[77.28, 52.15],
+            brightness=324.8,
+            confidence=92,
+            frp=42.5,
+            satellite="VIIRS",
+            acq_date=acq_date,
+            acq_time="1430"
+        )
+    ]
+    
+    features = [_fire_feature(f) for f in fires]
+    
+    return {
+        "type": "FeatureCollection",
+        "features": features,
+        "fires": fires,
+        "summary": {
+            "total_fires": len(fires),
+            "high_confidence": len([f for f in fires if f.confidence > 80]),
+            "avg_frp": sum(f.frp for f in fires) / len(fires) if fires else 0
+        }
+    }
+
+
+# Real methane hotspots from Sentinel-5P data
+_METHANE_HOTSPOTS = [
+    {
+        "name": "Tengiz Oil Field",
+        "coordinates": [53.45, 46.23],
+        "type": "oil_gas",
+        "emission_rate_kt_per_year": 850,
+        "concentration_ppb": 2105,
+        "trend": "stable",
+        "source": "Oil extraction and flaring",
+        "area_km2": 2500
+    },
+    {
+        "name": "Karachaganak Gas Field",
+        "coordinates": [50.1, 50.2],
+        "type": "oil_gas",
+        "emission_rate_kt_per_year": 620,
+        "concentration_ppb": 1985,
+        "trend": "decreasing",
+        "source": "Natural gas processing",
+        "area_km2": 1800
+    },
+    {
+        "name": "Kashagan Offshore Field",
+        "coordinates": [52.5, 46.4],
+        "type": "oil_gas",
+        "emission_rate_kt_per_year": 480,
+        "concentration_ppb": 1920,
+        "trend": "increasing",
+        "source": "Offshore extraction",
+        "area_km2": 3200
+    },
+    {
+        "name": "Ekibastuz Coal Basin",
+        "coordinates": [75.4, 51.7],
+        "type": "coal",
+        "emission_rate_kt_per_year": 320,
+        "concentration_ppb": 1895,
+        "trend": "stable",
+        "source": "Coal mining fugitive emissions",
+        "area_km2": 800
+    },
+    {
+        "name": "Aktobe Gas Fields",
+        "coordinates": [57.2, 50.3],
+        "type": "oil_gas",
+        "emission_rate_kt_per_year": 185,
+        "concentration_ppb": 1875,
+        "trend": "stable",
+        "source": "Gas production",
+        "area_km2": 600
+    }
+]
+
+
+# Emission colors, lowest band first; a value on a band edge takes the lower band
+_EMISSION_COLORS = ("#fbbf24", "#f97316", "#dc2626")
+_METHANE_COLOR_EDGES = (300, 600)  # kt/year
+_CO2_COLOR_EDGES = (10, 20)  # Mt/year
+
+
+def _emission_colors(values: List[float], edges: Tuple[float, float]) -> List[str]:
+    """Color per emission value, bucketed in one np.digitize call"""
+    return [_EMISSION_COLORS[i] for i in np.digitize(values, edges, right=True).tolist()]
+
+
+def _methane_base() -> Dict[str, Any]:
+    hotspots = _METHANE_HOTSPOTS
+    features = []
+    # Color based on emission rate
+    colors = _emission_colors([h["emission_rate_kt_per_year"] for h in hotspots], _METHANE_COLOR_EDGES)
+    for h, color in zip(hotspots, colors):
+        features.append({
+            "type": "Feature",
+            "properties": {
+                **h,
+                "color": color
+            },
+            "geometry": {
+                "type": "Point",
+                "coordinates": h["coordinates"]
+            }
+        })
+    
+    return {
+        "type": "FeatureCollection",
+        "features": features,
+        "hotspots": hotspots,
+        "total_emissions_mt": sum(h["emission_rate_kt_per_year"] for h in hotspots) / 1000,
+        "metadata": {
+            "source": "Sentinel-5P TROPOMI Methane",
+            "background_ppb": 1850
+        }
+    }
+
+
+_METHANE_BASE = _methane_base()
+
+
+# Industrial CO2 sources from real emission inventories
+_CO2_SOURCES = [
+    {
+        "name": "Ekibastuz Power Plants",
+        "coordinates": [75.35, 51.67],
+        "type": "power_generation",
+        "sector": "energy",
+        "annual_emissions_mt": 45.2,
+        "fuel_type": "coal",
+        "capacity_mw": 8000
+    },
+    {
+        "name": "ArcelorMittal Temirtau",
+        "coordinates": [72.96, 50.05],
+        "type": "steel_manufacturing",
+        "sector": "industry",
+        "annual_emissions_mt": 18.5,
+        "fuel_type": "coal_coke"
+    },
+    {
+        "name": "Astana CHP Plants",
+        "coordinates": [71.42, 51.18],
+        "type": "combined_heat_power",
+        "sector": "energy",
+        "annual_emissions_mt": 12.8,
+        "fuel_type": "coal_gas"
+    },
+    {
+        "name": "Pavlodar Petrochemical",
+        "coordinates": [77.0, 52.3],
+        "type": "refinery",
+        "sector": "oil_gas",
+        "annual_emissions_mt": 5.2,
+        "fuel_type": "oil_gas"
+    },
+    {
+        "name": "Atyrau Refinery",
+        "coordinates": [51.88, 46.85],
+        "type": "refinery",
+        "sector": "oil_gas",
+        "annual_emissions_mt": 4.8,
+        "fuel_type": "oil"
+    },
+    {
+        "name": "Zhambyl Cement Plant",
+        "coordinates": [71.4, 42.9],
+        "type": "cement_manufacturing",
+        "sector": "industry",
+        "annual_emissions_mt": 2.3,
+        "fuel_type": "coal"
+    }
+]
+
+
+def _co2_base() -> Dict[str, Any]:
+    sources = _CO2_SOURCES
+    features = []
+    by_sector = {}
+    
+    # Color based on emissions
+    colors = _emission_colors([s["annual_emissions_mt"] for s in sources], _CO2_COLOR_EDGES)
+    for s, color in zip(sources, colors):
+        features.append({
+            "type": "Feature",
+            "properties": {
+                **s,
+                "color": color
+            },
+            "geometry": {
+                "type": "Point",
+                "coordinates": s["coordinates"]
+            }
+        })
+        
+        # Aggregate by sector
+        sector = s["sector"]
+        by_sector[sector] = by_sector.get(sector, 0) + s["annual_emissions_mt"]
+    
+    return {
+        "type": "FeatureCollection",
+        "features": features,
+        "sources": sources,
+        "by_sector": by_sector,
+        "total_emissions_mt": sum(s["annual_emissions_mt"] for s in sources),
+        "metadata": {
+            "source": "Kazakhstan Industrial Emission Inventory",
+            "data_year": 2024
+        }
+    }
+
+
+_CO2_BASE = _co2_base()
+
+
+def _temperature_base(is_winter: bool) -> Dict[str, Any]:
+    # Real temperature zones based on climate data
+    zones = [
+        {
+            "name": "Northern Steppes (Kostanay)",
+            "coordinates": [64.0, 53.0],
+            "temp_current": -15 if is_winter else 22,
+            "temp_min": -35 if is_winter else 12,
+            "temp_max": -5 if is_winter else 32,
+            "climate": "continental"
+        },
+        {
+            "name": "Almaty Region",
+            "coordinates": [77.0, 43.5],
+            "temp_current": -2 if is_winter else 28,
+            "temp_min": -12 if is_winter else 18,
+            "temp_max": 5 if is_winter else 38,
+            "climate": "semi-arid"
+        },
+        {
+            "name": "Caspian Coast (Atyrau)",
+            "coordinates": [51.9, 46.8],
+            "temp_current": -3 if is_winter else 32,
+            "temp_min": -10 if is_winter else 22,
+            "temp_max": 4 if is_winter else 42,
+            "climate": "desert"
+        },
+        {
+            "name": "Central Kazakhstan",
+            "coordinates": [68.0, 48.0],
+            "temp_current": -12 if is_winter else 26,
+            "temp_min": -28 if is_winter else 15,
+            "temp_max": -2 if is_winter else 35,
+            "climate": "continental"
+        },
+        {
+            "name": "Eastern Kazakhstan (Semey)",
+            "coordinates": [80.3, 50.4],
+            "temp_current": -18 if is_winter else 24,
+            "temp_min": -38 if is_winter else 14,
+            "temp_max": -8 if is_winter else 34,
+            "climate": "continental"
+        }
+    ]
+    
+    features = [
+        {
+            "type": "Feature",
+            "properties": z,
+            "geometry": {
+                "type": "Point",
+                "coordinates": z["coordinates"]
+            }
+        }
+        for z in zones
+    ]
+    temps = [z["temp_current"] for z in zones]
+    
+    return {
+        "type": "FeatureCollection",
+        "features": features,
+        "grid_data": zones,
+        "summary": {
+            "min_temp": min(temps),
+            "max_temp": max(temps),
+            "avg_temp": sum(temps) / len(temps),
+            "season": "winter" if is_winter else "summer"
+        },
+        "metadata": {
+            "source": "ERA5 Climate Reanalysis"
+        }
+    }
+
+
+_TEMPERATURE_WINTER = _temperature_base(True)
+_TEMPERATURE_SUMMER = _temperature_base(False)
+
+
+# The same static layers pre-encoded, with a placeholder where the timestamp
+# goes, so a JSON response only has to splice the stamp in
+_TIMESTAMP_SLOT = b"__timestamp__"
+
+
+def _layer_template(base: Dict[str, Any]) -> bytes:
+    return orjson.dumps({**base, "metadata": {**base["metadata"], "timestamp": _TIMESTAMP_SLOT.decode()}})
+
+
+_METHANE_JSON = _layer_template(_METHANE_BASE)
+_CO2_JSON = _layer_template(_CO2_BASE)
+_TEMPERATURE_WINTER_JSON = _layer_template(_TEMPERATURE_WINTER)
+_TEMPERATURE_SUMMER_JSON = _layer_template(_TEMPERATURE_SUMMER)
+
+# Placeholders for the static layers in an encoded dashboard bundle
+_BUNDLE_SLOTS = {key: f"__{key}_layer__" for key in ("methane", "co2", "temperature")}
+
 
 class RealDataService:
     """
     Service for fetching real environmental and geospatial data
     from various open APIs and data sources
+    
+    Every payload carries both the GeoJSON "features" and the matching flat
+    list ("stations", "fires", "hotspots" or "sources"), built in the same
+    pass, so callers never need to re-derive one from the other.
     """
     
-    def __init__(self):
-        self.session: Optional[aiohttp.ClientSession] = None
-        self._cache: Dict[str, Any] = {}
-        self._cache_ttl = 300  # 5 minutes cache
-        
     async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create aiohttp session"""
-        if self.session is None or self.session.closed:
-            timeout = aiohttp.ClientTimeout(total=30)
-            self.session = aiohttp.ClientSession(timeout=timeout)
-        return self.session
+        """Get the shared aiohttp session"""
+        return await _session.get()
     
     async def close(self):
         """Close the session"""
-        if self.session and not self.session.closed:
-            await self.session.close()
+        await _session.close()
     
     # ===========================================
     # OPENAQ - Real Air Quality Data
@@ -59,43 +795,56 @@ class RealDataService:
         Get real air quality data from OpenAQ API
         Returns actual monitoring station measurements
         """
+        if _backing_off("openaq"):
+            # Fall back to cached/sample data
+            return await self._get_fallback_air_quality()
         try:
-            session = await self._get_session()
-            
-            # Build OpenAQ API URL
-            params = {
-                "country": country,
-                "limit": limit,
-                "order_by": "lastUpdated",
-                "sort": "desc"
-            }
-            if city:
-                params["city"] = city
-            
-            headers = {}
-            if OPENAQ_API_KEY:
-                headers["X-API-Key"] = OPENAQ_API_KEY
-            
-            async with session.get(
-                f"{OPENAQ_API}/locations",
-                params=params,
-                headers=headers
-            ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return self._transform_openaq_to_geojson(data)
-                else:
-                    # Fall back to cached/sample data
-                    return await self._get_fallback_air_quality()
+            return await self._fetch_openaq_air_quality(country, city, limit)
                     
         except Exception as e:
-            print(f"OpenAQ API error: {e}")
+            _note_failure("openaq", e)
+            logger.warning("OpenAQ API error: %s", e)
             return await self._get_fallback_air_quality()
     
+    @async_ttl_cache(UPSTREAM_CACHE_TTL, maxsize=UPSTREAM_CACHE_MAXSIZE)
+    async def _fetch_openaq_air_quality(self, country: str, city: Optional[str],
+                                        limit: int) -> Dict[str, Any]:
+        """
+        Fetch OpenAQ locations as our GeoJSON (error statuses raise
+        ClientResponseError). The transformed payload is what gets cached,
+        so the raw response is released as soon as it has been converted.
+        """
+        session = await self._get_session()
+        
+        # Build OpenAQ API URL
+        params = {
+            "country": country,
+            "limit": limit,
+            "order_by": "lastUpdated",
+            "sort": "desc"
+        }
+        if city:
+            params["city"] = city
+        
+        headers = {}
+        if OPENAQ_API_KEY:
+            headers["X-API-Key"] = OPENAQ_API_KEY
+        
+        async with _limiters["openaq"], session.get(
+            f"{OPENAQ_API}/locations",
+            params=params,
+            headers=headers
+        ) as response:
+            # orjson straight off the body bytes: far faster on multi-MB GeoJSON
+            data = orjson.loads(await response.read())
+        return self._transform_openaq_to_geojson(data)
+    
     def _transform_openaq_to_geojson(self, openaq_data: Dict) -> Dict[str, Any]:
         """Transform OpenAQ response to GeoJSON FeatureCollection"""
         features = []
         stations = []
+        located = []
+        pm25_values = []
         
         results = openaq_data.get("results", [])
         
@@ -107,26 +856,34 @@ class RealDataService:
             # Extract latest measurements
             parameters = {}
             for param in location.get("parameters", []):
-                parameters[param.get("parameter", "unknown")] = {
+                parameters[_intern(param.get("parameter", "unknown"))] = {
                     "value": param.get("lastValue"),
-                    "unit": param.get("unit"),
+                    "unit": _intern(param.get("unit")),
                     "last_updated": param.get("lastUpdated")
                 }
             
-            # Calculate AQI from PM2.5 if available
-            pm25 = parameters.get("pm25", {}).get("value", 0) or 0
-            aqi = self._pm25_to_aqi(pm25)
-            category = self._get_aqi_category(aqi)
-            
+            located.append((location, coords, parameters))
+            pm25_values.append(parameters.get("pm25", {}).get("value", 0) or 0)
+        
+        # AQI from PM2.5 (0 where unavailable) and its category, for all stations at once
+        aqis = _pm25_to_aqi_vec(np.array(pm25_values, dtype=np.float64))
+        category_ids = np.searchsorted(_AQI_CATEGORY_THRESHOLDS, aqis, side="left")
+        
+        for (location, coords, parameters), aqi, category_id in zip(
+            located, aqis.tolist(), category_ids.tolist()
+        ):
+            category = _AQI_CATEGORIES[category_id]
+            coordinates = [coords.get("longitude"), coords.get("latitude")]
+            # One dict serves as both the flat station and the feature properties
             station_data = {
                 "id": location.get("id"),
                 "name": location.get("name", "Unknown"),
-                "city": location.get("city", "Unknown"),
-                "country": location.get("country"),
+                "city": _intern(location.get("city", "Unknown")),
+                "country": _intern(location.get("country")),
                 "aqi": aqi,
                 "category": category["name"],
                 "color": category["color"],
-                "coordinates": [coords.get("longitude"), coords.get("latitude")],
+                "coordinates": coordinates,
                 "parameters": parameters,
                 "last_updated": location.get("lastUpdated"),
                 "is_mobile": location.get("isMobile", False),
@@ -137,19 +894,17 @@ class RealDataService:
             
             features.append({
                 "type": "Feature",
-                "properties": {
-                    **station_data,
-                    "coordinates": None  # Remove duplicate
-                },
+                "properties": station_data,
                 "geometry": {
                     "type": "Point",
-                    "coordinates": [coords.get("longitude"), coords.get("latitude")]
+                    "coordinates": coordinates
                 }
             })
         
         # Calculate summary
-        aqi_values = [s["aqi"] for s in stations if s["aqi"] > 0]
-        avg_aqi = sum(aqi_values) / len(aqi_values) if aqi_values else 0
+        reporting = aqis[aqis > 0]
+        avg_aqi = float(reporting.mean()) if reporting.size else 0
+        timestamp = _iso_now()
         
         return {
             "type": "FeatureCollection",
@@ -159,144 +914,22 @@ class RealDataService:
                 "total_stations": len(stations),
                 "avg_aqi": round(avg_aqi),
                 "overall_status": self._get_aqi_category(avg_aqi)["name"],
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": timestamp
             },
             "metadata": {
                 "source": "OpenAQ - Real-time Air Quality Data",
                 "api": "openaq.org",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": timestamp
             }
         }
     
     async def _get_fallback_air_quality(self) -> Dict[str, Any]:
         """Fallback air quality data when API unavailable"""
-        # Real Kazakhstan air quality stations with typical values
-        stations = [
-            {
-                "id": "almaty_001",
-                "name": "Almaty - Abay Avenue",
-                "city": "Almaty",
-                "country": "KZ",
-                "aqi": 78,
-                "category": "Moderate",
-                "color": "#FFFF00",
-                "coordinates": [76.9458, 43.2220],
-                "parameters": {
-                    "pm25": {"value": 23.5, "unit": "µg/m³"},
-                    "pm10": {"value": 45.2, "unit": "µg/m³"},
-                    "no2": {"value": 28.3, "unit": "µg/m³"},
-                    "o3": {"value": 42.1, "unit": "µg/m³"}
-                },
-                "sensors": ["pm25", "pm10", "no2", "o3"]
-            },
-            {
-                "id": "astana_001",
-                "name": "Astana - Downtown",
-                "city": "Astana",
-                "country": "KZ",
-                "aqi": 52,
-                "category": "Moderate",
-                "color": "#FFFF00",
-                "coordinates": [71.4491, 51.1801],
-                "parameters": {
-                    "pm25": {"value": 12.8, "unit": "µg/m³"},
-                    "pm10": {"value": 28.5, "unit": "µg/m³"},
-                    "no2": {"value": 18.2, "unit": "µg/m³"}
-                },
-                "sensors": ["pm25", "pm10", "no2"]
-            },
-            {
-                "id": "atyrau_001",
-                "name": "Atyrau - Industrial Zone",
-                "city": "Atyrau",
-                "country": "KZ",
-                "aqi": 95,
-                "category": "Unhealthy for Sensitive Groups",
-                "color": "#FF7E00",
-                "coordinates": [51.9200, 46.8500],
-                "parameters": {
-                    "pm25": {"value": 35.2, "unit": "µg/m³"},
-                    "pm10": {"value": 68.4, "unit": "µg/m³"},
-                    "so2": {"value": 22.5, "unit": "µg/m³"},
-                    "no2": {"value": 42.3, "unit": "µg/m³"}
-                },
-                "sensors": ["pm25", "pm10", "so2", "no2"]
-            },
-            {
-                "id": "karaganda_001",
-                "name": "Karaganda - City Center",
-                "city": "Karaganda",
-                "country": "KZ",
-                "aqi": 88,
-                "category": "Moderate",
-                "color": "#FFFF00",
-                "coordinates": [73.1022, 49.8047],
-                "parameters": {
-                    "pm25": {"value": 28.7, "unit": "µg/m³"},
-                    "pm10": {"value": 52.1, "unit": "µg/m³"},
-                    "co": {"value": 1.2, "unit": "mg/m³"}
-                },
-                "sensors": ["pm25", "pm10", "co"]
-            },
-            {
-                "id": "shymkent_001",
-                "name": "Shymkent - Residential",
-                "city": "Shymkent",
-                "country": "KZ",
-                "aqi": 65,
-                "category": "Moderate",
-                "color": "#FFFF00",
-                "coordinates": [69.5958, 42.3417],
-                "parameters": {
-                    "pm25": {"value": 18.4, "unit": "µg/m³"},
-                    "pm10": {"value": 35.6, "unit": "µg/m³"}
-                },
-                "sensors": ["pm25", "pm10"]
-            },
-            {
-                "id": "aktau_001",
-                "name": "Aktau - Coastal",
-                "city": "Aktau",
-                "country": "KZ",
-                "aqi": 42,
-                "category": "Good",
-                "color": "#00E400",
-                "coordinates": [51.1667, 43.6500],
-                "parameters": {
-                    "pm25": {"value": 8.5, "unit": "µg/m³"},
-                    "pm10": {"value": 22.3, "unit": "µg/m³"}
-                },
-                "sensors": ["pm25", "pm10"]
-            }
-        ]
-        
-        features = []
-        for s in stations:
-            features.append({
-                "type": "Feature",
-                "properties": {k: v for k, v in s.items() if k != "coordinates"},
-                "geometry": {
-                    "type": "Point",
-                    "coordinates": s["coordinates"]
-                }
-            })
-        
-        avg_aqi = sum(s["aqi"] for s in stations) / len(stations)
-        
+        timestamp = _iso_now()
         return {
-            "type": "FeatureCollection",
-            "features": features,
-            "stations": stations,
-            "summary": {
-                "total_stations": len(stations),
-                "avg_aqi": round(avg_aqi),
-                "overall_status": self._get_aqi_category(avg_aqi)["name"],
-                "timestamp": datetime.utcnow().isoformat()
-            },
-            "metadata": {
-                "source": "Kazakhstan Environmental Monitoring (Cached Data)",
-                "timestamp": datetime.utcnow().isoformat()
-            }
+            **_FALLBACK_AQ_BASE,
+            "summary": {**_FALLBACK_AQ_BASE["summary"], "timestamp": timestamp},
+            "metadata": {**_FALLBACK_AQ_BASE["metadata"], "timestamp": timestamp}
         }
     
     # ===========================================
@@ -310,72 +943,51 @@ class RealDataService:
         Get real fire detection data from NASA FIRMS
         MODIS and VIIRS satellite fire data
         """
+        if not NASA_API_KEY or _backing_off("firms"):
+            return await self._get_fallback_fire_data()
         try:
-            session = await self._get_session()
-            
-            # NASA FIRMS endpoint
-            url = f"https://firms.modaps.eosdis.nasa.gov/api/country/csv/{NASA_API_KEY}/VIIRS_SNPP_NRT/{country}/{days}"
-            
-            if not NASA_API_KEY:
-                return await self._get_fallback_fire_data()
-            
-            async with session.get(url) as response:
-                if response.status == 200:
-                    csv_data = await response.text()
-                    return self._parse_firms_csv(csv_data)
-                else:
-                    return await self._get_fallback_fire_data()
+            return await self._fetch_firms_fires(country, days)
                     
         except Exception as e:
-            print(f"NASA FIRMS error: {e}")
+            _note_failure("firms", e)
+            logger.warning("NASA FIRMS error: %s", e)
             return await self._get_fallback_fire_data()
     
-    def _parse_firms_csv(self, csv_data: str) -> Dict[str, Any]:
-        """Parse NASA FIRMS CSV response"""
-        lines = csv_data.strip().split('\n')
-        if len(lines) < 2:
-            return self._get_fallback_fire_data_sync()
+    @async_ttl_cache(UPSTREAM_CACHE_TTL, maxsize=UPSTREAM_CACHE_MAXSIZE)
+    async def _fetch_firms_fires(self, country: str, days: int) -> Dict[str, Any]:
+        """Fetch and parse the NASA FIRMS country CSV (error statuses raise ClientResponseError)"""
+        session = await self._get_session()
+        
+        # NASA FIRMS endpoint
+        url = f"https://firms.modaps.eosdis.nasa.gov/api/country/csv/{NASA_API_KEY}/VIIRS_SNPP_NRT/{country}/{days}"
         
-        headers = lines[0].split(',')
+        validated = _validators.get(url)
+        async with _limiters["firms"], session.get(url, headers=_conditional_headers(validated)) as response:
+            if response.status == 304 and validated is not None:
+                return validated[2]
+            data = await self._parse_firms_stream(response.content)
+            _remember_validators(url, response, data)
+            return data
+    
+    async def _parse_firms_stream(self, content: aiohttp.StreamReader) -> Dict[str, Any]:
+        """Parse a NASA FIRMS CSV response body as it streams in"""
+        n_rows = 0
         fires = []
         features = []
+        frp_batches = []
+        confidence_batches = []
         
-        for line in lines[1:]:
-            values = line.split(',')
-            if len(values) >= len(headers):
-                fire = dict(zip(headers, values))
-                
-                lat = float(fire.get('latitude', 0))
-                lon = float(fire.get('longitude', 0))
-                brightness = float(fire.get('bright_ti4', 0))
-                confidence = fire.get('confidence', 'nominal')
-                frp = float(fire.get('frp', 0))
-                
-                # Convert confidence to numeric
-                conf_map = {'low': 30, 'nominal': 65, 'high': 90}
-                conf_numeric = conf_map.get(confidence, 65) if isinstance(confidence, str) else int(confidence)
-                
-                fire_data = {
-                    "latitude": lat,
-                    "longitude": lon,
-                    "coordinates": [lon, lat],
-                    "brightness": brightness,
-                    "confidence": conf_numeric,
-                    "frp": frp,
-                    "satellite": fire.get('satellite', 'VIIRS'),
-                    "acq_date": fire.get('acq_date', ''),
-                    "acq_time": fire.get('acq_time', '')
-                }
-                fires.append(fire_data)
-                
-                features.append({
-                    "type": "Feature",
-                    "properties": fire_data,
-                    "geometry": {
-                        "type": "Point",
-                        "coordinates": [lon, lat]
-                    }
-                })
+        async for batch_rows, batch_fires, frp, confidence in _iter_firms_batches(content):
+            n_rows += batch_rows
+            if not batch_fires:
+                continue
+            fires.extend(batch_fires)
+            features.extend(_fire_feature(fire_data) for fire_data in batch_fires)
+            frp_batches.append(frp)
+            confidence_batches.append(confidence)
+        
+        if not n_rows:
+            return self._get_fallback_fire_data_sync()
         
         return {
             "type": "FeatureCollection",
@@ -383,82 +995,48 @@ class RealDataService:
             "fires": fires,
             "summary": {
                 "total_fires": len(fires),
-                "high_confidence": len([f for f in fires if f["confidence"] > 80]),
-                "avg_frp": sum(f["frp"] for f in fires) / len(fires) if fires else 0
+                "high_confidence": int(sum((batch > 80).sum() for batch in confidence_batches)),
+                "avg_frp": float(np.concatenate(frp_batches).mean()) if fires else 0
             },
             "metadata": {
                 "source": "NASA FIRMS - Fire Information for Resource Management System",
                 "satellite": "VIIRS SNPP",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": _iso_now()
             }
         }
     
+    async def get_fire_data_firms_geojson(self, country: str = "KAZ", days: int = 7,
+                                          as_seq: bool = False) -> bytes:
+        """
+        NASA FIRMS fire features as encoded GeoJSON: one FeatureCollection, or
+        a GeoJSON text sequence with as_seq. A live feed is encoded once per
+        cached download; the fallback fires are encoded per call.
+        """
+        if NASA_API_KEY and not _backing_off("firms"):
+            try:
+                return await self._encode_firms_fires(country, days, as_seq)
+            except Exception as e:
+                _note_failure("firms", e)
+                logger.warning("NASA FIRMS error: %s", e)
+        return _encode_features(self._get_fallback_fire_data_sync()["features"], as_seq)
+    
+    @async_ttl_cache(UPSTREAM_CACHE_TTL, maxsize=UPSTREAM_CACHE_MAXSIZE)
+    async def _encode_firms_fires(self, country: str, days: int, as_seq: bool) -> bytes:
+        """Encoded features of the cached FIRMS download (errors raise, and are not cached)"""
+        data = await self._fetch_firms_fires(country, days)
+        return _encode_features(data["features"], as_seq)
+    
     async def _get_fallback_fire_data(self) -> Dict[str, Any]:
         """Fallback fire data based on typical patterns"""
         return self._get_fallback_fire_data_sync()
     
     def _get_fallback_fire_data_sync(self) -> Dict[str, Any]:
         """Sync version of fallback fire data"""
-        # Typical fire locations in Kazakhstan (agricultural/steppe fires)
-        fires = [
-            {
-                "latitude": 50.42,
-                "longitude": 66.85,
-                "coordinates": [66.85, 50.42],
-                "brightness": 312.5,
-                "confidence": 78,
-                "frp": 25.3,
-                "satellite": "VIIRS",
-                "acq_date": datetime.now().strftime("%Y-%m-%d"),
-                "acq_time": "1145"
-            },
-            {
-                "latitude": 47.85,
-                "longitude": 68.42,
-                "coordinates": [68.42, 47.85],
-                "brightness": 298.2,
-                "confidence": 65,
-                "frp": 18.7,
-                "satellite": "MODIS",
-                "acq_date": datetime.now().strftime("%Y-%m-%d"),
-                "acq_time": "0845"
-            },
-            {
-                "latitude": 52.15,
-                "longitude": 77.28,
-                "coordinates": [77.28, 52.15],
-                "brightness": 324.8,
-                "confidence": 92,
-                "frp": 42.5,
-                "satellite": "VIIRS",
-                "acq_date": datetime.now().strftime("%Y-%m-%d"),
-                "acq_time": "1430"
-            }
-        ]
-        
-        features = []
-        for f in fires:
-            features.append({
-                "type": "Feature",
-                "properties": f,
-                "geometry": {
-                    "type": "Point",
-                    "coordinates": f["coordinates"]
-                }
-            })
-        
         return {
-            "type": "FeatureCollection",
-            "features": features,
-            "fires": fires,
-            "summary": {
-                "total_fires": len(fires),
-                "high_confidence": len([f for f in fires if f["confidence"] > 80]),
-                "avg_frp": sum(f["frp"] for f in fires) / len(fires) if fires else 0
-            },
+            **_fallback_fire_base(datetime.now().strftime("%Y-%m-%d")),
             "metadata": {
                 "source": "Fire Detection Data (Cached)",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": _iso_now()
             }
         }
     
@@ -472,94 +1050,9 @@ class RealDataService:
         Based on Sentinel-5P TROPOMI observations
         Real data from major emission hotspots in Kazakhstan
         """
-        # Real methane hotspots from Sentinel-5P data
-        hotspots = [
-            {
-                "name": "Tengiz Oil Field",
-                "coordinates": [53.45, 46.23],
-                "type": "oil_gas",
-                "emission_rate_kt_per_year": 850,
-                "concentration_ppb": 2105,
-                "trend": "stable",
-                "source": "Oil extraction and flaring",
-                "area_km2": 2500
-            },
-            {
-                "name": "Karachaganak Gas Field",
-                "coordinates": [50.1, 50.2],
-                "type": "oil_gas",
-                "emission_rate_kt_per_year": 620,
-                "concentration_ppb": 1985,
-                "trend": "decreasing",
-                "source": "Natural gas processing",
-                "area_km2": 1800
-            },
-            {
-                "name": "Kashagan Offshore Field",
-                "coordinates": [52.5, 46.4],
-                "type": "oil_gas",
-                "emission_rate_kt_per_year": 480,
-                "concentration_ppb": 1920,
-                "trend": "increasing",
-                "source": "Offshore extraction",
-                "area_km2": 3200
-            },
-            {
-                "name": "Ekibastuz Coal Basin",
-                "coordinates": [75.4, 51.7],
-                "type": "coal",
-                "emission_rate_kt_per_year": 320,
-                "concentration_ppb": 1895,
-                "trend": "stable",
-                "source": "Coal mining fugitive emissions",
-                "area_km2": 800
-            },
-            {
-                "name": "Aktobe Gas Fields",
-                "coordinates": [57.2, 50.3],
-                "type": "oil_gas",
-                "emission_rate_kt_per_year": 185,
-                "concentration_ppb": 1875,
-                "trend": "stable",
-                "source": "Gas production",
-                "area_km2": 600
-            }
-        ]
-        
-        features = []
-        for h in hotspots:
-            # Color based on emission rate
-            if h["emission_rate_kt_per_year"] > 600:
-                color = "#dc2626"
-            elif h["emission_rate_kt_per_year"] > 300:
-                color = "#f97316"
-            else:
-                color = "#fbbf24"
-            
-            features.append({
-                "type": "Feature",
-                "properties": {
-                    **h,
-                    "color": color
-                },
-                "geometry": {
-                    "type": "Point",
-                    "coordinates": h["coordinates"]
-                }
-            })
-        
-        total_emissions = sum(h["emission_rate_kt_per_year"] for h in hotspots) / 1000
-        
         return {
-            "type": "FeatureCollection",
-            "features": features,
-            "hotspots": hotspots,
-            "total_emissions_mt": total_emissions,
-            "metadata": {
-                "source": "Sentinel-5P TROPOMI Methane",
-                "background_ppb": 1850,
-                "timestamp": datetime.utcnow().isoformat()
-            }
+            **_METHANE_BASE,
+            "metadata": {**_METHANE_BASE["metadata"], "timestamp": _iso_now()}
         }
     
     # ===========================================
@@ -571,100 +1064,9 @@ class RealDataService:
         Get CO2 emission data from industrial sources
         Based on real emission inventories
         """
-        sources = [
-            {
-                "name": "Ekibastuz Power Plants",
-                "coordinates": [75.35, 51.67],
-                "type": "power_generation",
-                "sector": "energy",
-                "annual_emissions_mt": 45.2,
-                "fuel_type": "coal",
-                "capacity_mw": 8000
-            },
-            {
-                "name": "ArcelorMittal Temirtau",
-                "coordinates": [72.96, 50.05],
-                "type": "steel_manufacturing",
-                "sector": "industry",
-                "annual_emissions_mt": 18.5,
-                "fuel_type": "coal_coke"
-            },
-            {
-                "name": "Astana CHP Plants",
-                "coordinates": [71.42, 51.18],
-                "type": "combined_heat_power",
-                "sector": "energy",
-                "annual_emissions_mt": 12.8,
-                "fuel_type": "coal_gas"
-            },
-            {
-                "name": "Pavlodar Petrochemical",
-                "coordinates": [77.0, 52.3],
-                "type": "refinery",
-                "sector": "oil_gas",
-                "annual_emissions_mt": 5.2,
-                "fuel_type": "oil_gas"
-            },
-            {
-                "name": "Atyrau Refinery",
-                "coordinates": [51.88, 46.85],
-                "type": "refinery",
-                "sector": "oil_gas",
-                "annual_emissions_mt": 4.8,
-                "fuel_type": "oil"
-            },
-            {
-                "name": "Zhambyl Cement Plant",
-                "coordinates": [71.4, 42.9],
-                "type": "cement_manufacturing",
-                "sector": "industry",
-                "annual_emissions_mt": 2.3,
-                "fuel_type": "coal"
-            }
-        ]
-        
-        features = []
-        by_sector = {}
-        
-        for s in sources:
-            # Color based on emissions
-            em = s["annual_emissions_mt"]
-            if em > 20:
-                color = "#dc2626"
-            elif em > 10:
-                color = "#f97316"
-            else:
-                color = "#fbbf24"
-            
-            features.append({
-                "type": "Feature",
-                "properties": {
-                    **s,
-                    "color": color
-                },
-                "geometry": {
-                    "type": "Point",
-                    "coordinates": s["coordinates"]
-                }
-            })
-            
-            # Aggregate by sector
-            sector = s["sector"]
-            by_sector[sector] = by_sector.get(sector, 0) + s["annual_emissions_mt"]
-        
-        total_emissions = sum(s["annual_emissions_mt"] for s in sources)
-        
         return {
-            "type": "FeatureCollection",
-            "features": features,
-            "sources": sources,
-            "by_sector": by_sector,
-            "total_emissions_mt": total_emissions,
-            "metadata": {
-                "source": "Kazakhstan Industrial Emission Inventory",
-                "data_year": 2024,
-                "timestamp": datetime.utcnow().isoformat()
-            }
+            **_CO2_BASE,
+            "metadata": {**_CO2_BASE["metadata"], "timestamp": _iso_now()}
         }
     
     # ===========================================
@@ -673,83 +1075,10 @@ class RealDataService:
     
     async def get_temperature_data(self) -> Dict[str, Any]:
         """Get temperature data for Kazakhstan regions"""
-        
-        month = datetime.now().month
-        is_winter = month in [12, 1, 2]
-        
-        # Real temperature zones based on climate data
-        zones = [
-            {
-                "name": "Northern Steppes (Kostanay)",
-                "coordinates": [64.0, 53.0],
-                "temp_current": -15 if is_winter else 22,
-                "temp_min": -35 if is_winter else 12,
-                "temp_max": -5 if is_winter else 32,
-                "climate": "continental"
-            },
-            {
-                "name": "Almaty Region",
-                "coordinates": [77.0, 43.5],
-                "temp_current": -2 if is_winter else 28,
-                "temp_min": -12 if is_winter else 18,
-                "temp_max": 5 if is_winter else 38,
-                "climate": "semi-arid"
-            },
-            {
-                "name": "Caspian Coast (Atyrau)",
-                "coordinates": [51.9, 46.8],
-                "temp_current": -3 if is_winter else 32,
-                "temp_min": -10 if is_winter else 22,
-                "temp_max": 4 if is_winter else 42,
-                "climate": "desert"
-            },
-            {
-                "name": "Central Kazakhstan",
-                "coordinates": [68.0, 48.0],
-                "temp_current": -12 if is_winter else 26,
-                "temp_min": -28 if is_winter else 15,
-                "temp_max": -2 if is_winter else 35,
-                "climate": "continental"
-            },
-            {
-                "name": "Eastern Kazakhstan (Semey)",
-                "coordinates": [80.3, 50.4],
-                "temp_current": -18 if is_winter else 24,
-                "temp_min": -38 if is_winter else 14,
-                "temp_max": -8 if is_winter else 34,
-                "climate": "continental"
-            }
-        ]
-        
-        features = []
-        temps = []
-        
-        for z in zones:
-            temps.append(z["temp_current"])
-            
-            features.append({
-                "type": "Feature",
-                "properties": z,
-                "geometry": {
-                    "type": "Point",
-                    "coordinates": z["coordinates"]
-                }
-            })
-        
+        base = _TEMPERATURE_WINTER if datetime.now().month in [12, 1, 2] else _TEMPERATURE_SUMMER
         return {
-            "type": "FeatureCollection",
-            "features": features,
-            "grid_data": zones,
-            "summary": {
-                "min_temp": min(temps),
-                "max_temp": max(temps),
-                "avg_temp": sum(temps) / len(temps),
-                "season": "winter" if is_winter else "summer"
-            },
-            "metadata": {
-                "source": "ERA5 Climate Reanalysis",
-                "timestamp": datetime.utcnow().isoformat()
-            }
+            **base,
+            "metadata": {**base["metadata"], "timestamp": _iso_now()}
         }
     
     # ===========================================
@@ -763,55 +1092,82 @@ class RealDataService:
         Get earthquake data from USGS
         Focus on Central Asia region
         """
+        if _backing_off("usgs"):
+            return await self._get_fallback_earthquake_data()
         try:
-            session = await self._get_session()
-            
             end_time = datetime.utcnow()
             start_time = end_time - timedelta(days=days)
             
-            params = {
-                "format": "geojson",
-                "starttime": start_time.strftime("%Y-%m-%d"),
-                "endtime": end_time.strftime("%Y-%m-%d"),
-                "minlatitude": 35,
-                "maxlatitude": 56,
-                "minlongitude": 45,
-                "maxlongitude": 90,
-                "minmagnitude": min_magnitude
-            }
-            
-            async with session.get(
-                f"{USGS_API}/summary/all_month.geojson",
-                params=params
-            ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return self._transform_usgs_earthquakes(data)
-                else:
-                    return await self._get_fallback_earthquake_data()
+            # The query only has day resolution, so the dates make a stable cache key
+            data = await self._fetch_usgs_earthquakes(
+                start_time.strftime("%Y-%m-%d"), end_time.strftime("%Y-%m-%d"), min_magnitude
+            )
+            return self._transform_usgs_earthquakes(data)
                     
         except Exception as e:
-            print(f"USGS API error: {e}")
+            _note_failure("usgs", e)
+            logger.warning("USGS API error: %s", e)
             return await self._get_fallback_earthquake_data()
     
-    def _transform_usgs_earthquakes(self, usgs_data: Dict) -> Dict[str, Any]:
-        """Transform USGS GeoJSON to our format"""
-        features = usgs_data.get("features", [])
+    @async_ttl_cache(UPSTREAM_CACHE_TTL, maxsize=UPSTREAM_CACHE_MAXSIZE)
+    async def _fetch_usgs_earthquakes(self, start_date: str, end_date: str,
+                                      min_magnitude: float) -> Dict:
+        """Fetch USGS earthquake GeoJSON for Central Asia (error statuses raise ClientResponseError)"""
+        session = await self._get_session()
+        
+        params = {
+            "format": "geojson",
+            "starttime": start_date,
+            "endtime": end_date,
+            "minlatitude": 35,
+            "maxlatitude": 56,
+            "minlongitude": 45,
+            "maxlongitude": 90,
+            "minmagnitude": min_magnitude
+        }
         
+        key = ("usgs", start_date, end_date, min_magnitude)
+        validated = _validators.get(key)
+        async with _limiters["usgs"], session.get(
+            f"{USGS_API}/summary/all_month.geojson",
+            params=params,
+            headers=_conditional_headers(validated)
+        ) as response:
+            if response.status == 304 and validated is not None:
+                return validated[2]
+            # orjson straight off the body bytes: far faster on multi-MB GeoJSON
+            data = orjson.loads(await response.read())
+            _remember_validators(key, response, data)
+            return data
+    
+    def _transform_usgs_earthquakes(self, usgs_data: Dict) -> Dict[str, Any]:
+        """
+        Transform USGS GeoJSON to our format. The features reference the
+        earthquake records as their properties rather than carrying the full
+        USGS property set alongside them.
+        """
         earthquakes = []
-        for f in features:
+        features = []
+        for f in usgs_data.get("features", []):
             props = f.get("properties", {})
             geom = f.get("geometry", {})
             coords = geom.get("coordinates", [])
             
             if len(coords) >= 2:
-                earthquakes.append({
+                coordinates = [coords[0], coords[1]]
+                earthquake = {
                     "magnitude": props.get("mag"),
                     "place": props.get("place"),
                     "time": props.get("time"),
                     "depth_km": coords[2] if len(coords) > 2 else 0,
-                    "coordinates": [coords[0], coords[1]],
+                    "coordinates": coordinates,
                     "url": props.get("url")
+                }
+                earthquakes.append(earthquake)
+                features.append({
+                    "type": "Feature",
+                    "properties": earthquake,
+                    "geometry": {"type": "Point", "coordinates": coordinates}
                 })
         
         return {
@@ -821,7 +1177,7 @@ class RealDataService:
             "metadata": {
                 "source": "USGS Earthquake Hazards Program",
                 "count": len(earthquakes),
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": _iso_now()
             }
         }
     
@@ -833,43 +1189,88 @@ class RealDataService:
             "earthquakes": [],
             "metadata": {
                 "source": "No recent earthquakes",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": _iso_now()
             }
         }
     
+    async def get_earthquake_data_geojson(self, days: int = 30, min_magnitude: float = 3.0,
+                                          as_seq: bool = False) -> bytes:
+        """
+        USGS earthquake features as encoded GeoJSON: one FeatureCollection, or
+        a GeoJSON text sequence with as_seq. Encoded once per cached download.
+        """
+        if not _backing_off("usgs"):
+            end_time = datetime.utcnow()
+            start_time = end_time - timedelta(days=days)
+            try:
+                return await self._encode_usgs_earthquakes(
+                    start_time.strftime("%Y-%m-%d"), end_time.strftime("%Y-%m-%d"), min_magnitude, as_seq
+                )
+            except Exception as e:
+                _note_failure("usgs", e)
+                logger.warning("USGS API error: %s", e)
+        return _encode_features((await self._get_fallback_earthquake_data())["features"], as_seq)
+    
+    @async_ttl_cache(UPSTREAM_CACHE_TTL, maxsize=UPSTREAM_CACHE_MAXSIZE)
+    async def _encode_usgs_earthquakes(self, start_date: str, end_date: str,
+                                       min_magnitude: float, as_seq: bool) -> bytes:
+        """Encoded features of the cached USGS download (errors raise, and are not cached)"""
+        data = await self._fetch_usgs_earthquakes(start_date, end_date, min_magnitude)
+        return _encode_features(self._transform_usgs_earthquakes(data)["features"], as_seq)
+    
     # ===========================================
-    # HELPER METHODS
+    # DASHBOARD BUNDLE
     # ===========================================
     
-    def _pm25_to_aqi(self, pm25: float) -> int:
-        """Convert PM2.5 to AQI (EPA formula)"""
-        if pm25 <= 12.0:
-            return int((50 / 12) * pm25)
-        elif pm25 <= 35.4:
-            return int(((100 - 51) / (35.4 - 12.1)) * (pm25 - 12.1) + 51)
-        elif pm25 <= 55.4:
-            return int(((150 - 101) / (55.4 - 35.5)) * (pm25 - 35.5) + 101)
-        elif pm25 <= 150.4:
-            return int(((200 - 151) / (150.4 - 55.5)) * (pm25 - 55.5) + 151)
-        elif pm25 <= 250.4:
-            return int(((300 - 201) / (250.4 - 150.5)) * (pm25 - 150.5) + 201)
-        else:
-            return int(((500 - 301) / (500 - 250.5)) * (pm25 - 250.5) + 301)
-    
-    def _get_aqi_category(self, aqi: int) -> Dict[str, str]:
-        """Get AQI category and color"""
-        if aqi <= 50:
-            return {"name": "Good", "color": "#00E400", "health": "Air quality is satisfactory"}
-        elif aqi <= 100:
-            return {"name": "Moderate", "color": "#FFFF00", "health": "Acceptable air quality"}
-        elif aqi <= 150:
-            return {"name": "Unhealthy for Sensitive Groups", "color": "#FF7E00", "health": "Sensitive groups may experience health effects"}
-        elif aqi <= 200:
-            return {"name": "Unhealthy", "color": "#FF0000", "health": "Everyone may experience health effects"}
-        elif aqi <= 300:
-            return {"name": "Very Unhealthy", "color": "#8F3F97", "health": "Health alert: significant health effects"}
+    async def get_dashboard_bundle_json(self) -> bytes:
+        """
+        Get every dashboard layer at once, as encoded JSON. The upstream calls
+        run concurrently, so the bundle takes as long as the slowest one; a
+        layer that fails is replaced by its fallback data. Only the upstream
+        layers are encoded per call; the static layers are spliced in pre-encoded.
+        """
+        bundle = await self._get_upstream_layers()
+        body = orjson.dumps({**bundle, **_BUNDLE_SLOTS, "timestamp": _iso_now()})
+        for key, slot in _BUNDLE_SLOTS.items():
+            body = body.replace(orjson.dumps(slot), self.get_static_layer_json(key), 1)
+        return body
+    
+    def get_static_layer_json(self, layer: str) -> bytes:
+        """Encoded "methane", "co2" or "temperature" layer with a fresh timestamp"""
+        if layer == "methane":
+            template = _METHANE_JSON
+        elif layer == "co2":
+            template = _CO2_JSON
         else:
-            return {"name": "Hazardous", "color": "#7E0023", "health": "Emergency conditions"}
+            template = _TEMPERATURE_WINTER_JSON if datetime.now().month in [12, 1, 2] else _TEMPERATURE_SUMMER_JSON
+        return template.replace(_TIMESTAMP_SLOT, _iso_now().encode(), 1)
+    
+    async def _get_upstream_layers(self) -> Dict[str, Any]:
+        """Fetch the upstream-backed layers concurrently, falling back per layer"""
+        layers = {
+            "air_quality": (self.get_air_quality_openaq, self._get_fallback_air_quality),
+            "fires": (self.get_fire_data_firms, self._get_fallback_fire_data),
+            "earthquakes": (self.get_earthquake_data, self._get_fallback_earthquake_data)
+        }
+        results = await asyncio.gather(
+            *(fetch() for fetch, _ in layers.values()), return_exceptions=True
+        )
+        
+        bundle = {}
+        for (key, (_, fallback)), result in zip(layers.items(), results):
+            if isinstance(result, Exception):
+                logger.warning("Dashboard %s error: %s", key, result)
+                result = await fallback()
+            bundle[key] = result
+        return bundle
+    
+    # ===========================================
+    # HELPER METHODS
+    # ===========================================
+    
+    def _get_aqi_category(self, aqi: int) -> Mapping[str, str]:
+        """Get AQI category and color (a shared read-only mapping)"""
+        return _AQI_CATEGORIES[bisect_left(_AQI_CATEGORY_THRESHOLDS, aqi)]
 
 
 # Create singleton instance
@@ -15,6 +15,8 @@ from reportlab.graphics.shapes import Drawing, Rect, Circle, Line, String
 from reportlab.graphics.charts.barcharts import VerticalBarChart
 from reportlab.graphics.charts.piecharts import Pie
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
+from dataclasses import dataclass
+from typing import Union
 from io import BytesIO
 from datetime import datetime
 import base64
@@ -30,6 +32,54 @@ APEX_DARK = colors.HexColor("#1E293B")  # Dark background
 APEX_GRAY = colors.HexColor("#64748B")  # Gray text
 
 
+# ==============================================================
+# REPORT ROWS
+# ==============================================================
+
+@dataclass(slots=True, frozen=True)
+class StationRow:
+    """One air quality station in the report (pollutants in µg/m³)"""
+    name: str
+    aqi: float
+    category: str
+    dominant_pollutant: str
+    coordinates: list
+    pm25: float
+    pm10: float
+    no2: float
+    o3: float
+
+
+@dataclass(slots=True, frozen=True)
+class MethaneRow:
+    """One methane hotspot in the report"""
+    name: str
+    type: str
+    emission_rate_kt_per_year: float
+    concentration_ppb: float
+    trend: str
+    coordinates: list
+
+
+@dataclass(slots=True, frozen=True)
+class Co2Row:
+    """One CO2 emission source in the report"""
+    name: str
+    sector: str
+    annual_emissions_mt: float
+    coordinates: list
+
+
+@dataclass(slots=True, frozen=True)
+class FireRow:
+    """One active fire detection in the report"""
+    brightness: float
+    confidence: Union[int, str]  # percent from the fire feed, "N/A" if missing
+    satellite: str
+    acq_time: str
+    coordinates: list
+
+
 class ApexReportGenerator:
     """Generates beautiful PDF reports for ApexGIS platform"""
     
@@ -200,16 +250,13 @@ class ApexReportGenerator:
             table_data = [["Station", "AQI", "Category", "PM2.5", "PM10", "Dominant"]]
             
             for station in stations[:10]:  # Limit to 10 stations
-                pollutants = station.get('pollutants', {})
-                pm25 = pollutants.get('pm25', {}).get('value', 'N/A')
-                pm10 = pollutants.get('pm10', {}).get('value', 'N/A')
                 table_data.append([
-                    station.get('name', 'Unknown')[:20],
-                    str(station.get('aqi', 'N/A')),
-                    station.get('category', 'N/A')[:10],
-                    str(pm25),
-                    str(pm10),
-                    station.get('dominant_pollutant', 'N/A')
+                    station.name[:20],
+                    str(station.aqi),
+                    station.category[:10],
+                    str(station.pm25),
+                    str(station.pm10),
+                    station.dominant_pollutant
                 ])
             
             aq_table = Table(table_data, colWidths=[3*cm, 1.5*cm, 2.5*cm, 1.8*cm, 1.8*cm, 2.5*cm])
@@ -253,11 +300,11 @@ class ApexReportGenerator:
             table_data = [["Source", "Type", "Emission Rate (kt/yr)", "Concentration (ppb)", "Trend"]]
             for hs in hotspots[:8]:
                 table_data.append([
-                    hs.get('name', 'Unknown')[:25],
-                    hs.get('type', 'N/A'),
-                    f"{hs.get('emission_rate_kt_per_year', 0):.1f}",
-                    f"{hs.get('concentration_ppb', 0):.0f}",
-                    hs.get('trend', 'N/A')
+                    hs.name[:25],
+                    hs.type,
+                    f"{hs.emission_rate_kt_per_year:.1f}",
+                    f"{hs.concentration_ppb:.0f}",
+                    hs.trend
                 ])
             
             ch4_table = Table(table_data, colWidths=[4*cm, 2.5*cm, 3*cm, 3*cm, 2*cm])
@@ -284,9 +331,9 @@ class ApexReportGenerator:
             table_data = [["Source", "Sector", "Annual Emissions (MT)"]]
             for src in sources[:8]:
                 table_data.append([
-                    src.get('name', 'Unknown')[:30],
-                    src.get('sector', 'N/A'),
-                    f"{src.get('annual_emissions_mt', 0):.2f}"
+                    src.name[:30],
+                    src.sector,
+                    f"{src.annual_emissions_mt:.2f}"
                 ])
             
             co2_table = Table(table_data, colWidths=[5.5*cm, 4*cm, 4*cm])
@@ -323,13 +370,13 @@ class ApexReportGenerator:
             
             table_data = [["Location", "Brightness (K)", "Confidence", "Satellite", "Time"]]
             for fire in fires[:10]:
-                coords = fire.get('coordinates', [0, 0])
+                coords = fire.coordinates
                 table_data.append([
                     f"{coords[1]:.2f}°N, {coords[0]:.2f}°E",
-                    f"{fire.get('brightness', 0):.0f}",
-                    fire.get('confidence', 'N/A'),
-                    fire.get('satellite', 'N/A'),
-                    fire.get('acq_time', 'N/A')
+                    f"{fire.brightness:.0f}",
+                    fire.confidence,
+                    fire.satellite,
+                    fire.acq_time
                 ])
             
             fire_table = Table(table_data, colWidths=[4*cm, 2.5*cm, 2.5*cm, 2.5*cm, 3*cm])
@@ -373,9 +420,17 @@ class ApexReportGenerator:
     def generate_report(self, data: dict, title: str = "Environmental Monitoring Report") -> bytes:
         """Generate complete PDF report"""
         buffer = BytesIO()
+        self.write_report(buffer, data, title)
         
+        pdf_bytes = buffer.getvalue()
+        buffer.close()
+        
+        return pdf_bytes
+    
+    def write_report(self, out, data: dict, title: str = "Environmental Monitoring Report") -> None:
+        """Build the complete PDF report into a writable binary file object"""
         doc = SimpleDocTemplate(
-            buffer,
+            out,
             pagesize=A4,
             rightMargin=1.5*cm,
             leftMargin=1.5*cm,
@@ -395,11 +450,6 @@ class ApexReportGenerator:
         
         # Build PDF
         doc.build(elements)
-        
-        pdf_bytes = buffer.getvalue()
-        buffer.close()
-        
-        return pdf_bytes
 
 
 # Singleton instance
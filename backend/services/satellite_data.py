@@ -11,6 +11,8 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List, Tuple
 import json
 
+import numpy as np
+
 # Try to import aiohttp, but it's optional for demo mode
 try:
     import aiohttp
@@ -38,6 +40,68 @@ NASA_CMR_STAC = "https://cmr.earthdata.nasa.gov/stac"
 COPERNICUS_API = "https://dataspace.copernicus.eu/odata/v1"
 
 
+# Simulated-grid noise; grids are drawn as whole arrays rather than per point
+_rng = np.random.default_rng()
+
+# Color and class lookup tables: np.digitize over the band edges indexes the
+# table for a whole grid at once. Values equal to an edge fall in the upper
+# band, like the `value < edge` chains they replace.
+_NDVI_COLOR_BREAKS = np.array([-0.1, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6])
+_NDVI_COLORS = np.array([
+    "#2166ac",  # Water
+    "#d6604d",  # Bare soil/rock
+    "#f4a582",  # Sparse vegetation
+    "#fddbc7",  # Light vegetation
+    "#d1e5f0",  # Moderate vegetation
+    "#92c5de",  # Good vegetation
+    "#4393c3",  # Dense vegetation
+    "#1a9850"   # Very dense vegetation
+])
+
+_NDVI_CLASS_BREAKS = np.array([-0.1, 0.1, 0.2, 0.3, 0.5, 0.7])
+_NDVI_CLASSES = np.array([
+    "Water", "Bare Soil/Rock", "Sparse Vegetation", "Grassland",
+    "Shrubland/Crops", "Forest", "Dense Forest"
+])
+
+_LST_COLOR_BREAKS = np.array([-20, -10, 0, 10, 20, 25, 30, 35, 40, 45])
+_LST_COLORS = np.array([
+    "#313695", "#4575b4", "#74add1", "#abd9e9", "#e0f3f8", "#ffffbf",
+    "#fee090", "#fdae61", "#f46d43", "#d73027", "#a50026"
+])
+
+# Urban heat islands: Almaty, Astana
+_LST_CITIES = np.array([[76.9458, 43.2220], [71.4491, 51.1801]])
+
+
+def _grid(center: List[float], resolution: float, lat_range: int,
+          lng_range: int, step: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    """Flattened lng/lat arrays of a grid around center, rows by latitude"""
+    i, j = np.meshgrid(
+        np.arange(-lat_range, lat_range + 1, step),
+        np.arange(-lng_range, lng_range + 1, step),
+        indexing="ij"
+    )
+    return center[0] + j.ravel() * resolution, center[1] + i.ravel() * resolution
+
+
+def _point_features(lng: np.ndarray, lat: np.ndarray,
+                    columns: Dict[str, list]) -> List[Dict[str, Any]]:
+    """Point Features from coordinate arrays and per-point property columns"""
+    names = tuple(columns)
+    return [
+        {
+            "type": "Feature",
+            "properties": dict(zip(names, values)),
+            "geometry": {
+                "type": "Point",
+                "coordinates": [x, y]
+            }
+        }
+        for x, y, *values in zip(lng.tolist(), lat.tolist(), *columns.values())
+    ]
+
+
 # ==============================================================
 # SENTINEL DATA COLLECTIONS
 # ==============================================================
@@ -294,38 +358,23 @@ class SatelliteDataService:
         Generate NDVI layer for vegetation analysis
         Simulates Sentinel-2 NDVI calculation
         """
-        features = []
         timestamp = datetime.utcnow().isoformat() + "Z"
         
         # Generate NDVI grid
         resolution = 0.01  # ~1km resolution
         lat_range = int(radius_km / 111)
         lng_range = int(radius_km / (111 * math.cos(math.radians(center[1]))))
+        lng, lat = _grid(center, resolution, lat_range, lng_range)
         
-        for i in range(-lat_range, lat_range + 1):
-            for j in range(-lng_range, lng_range + 1):
-                lat = center[1] + i * resolution
-                lng = center[0] + j * resolution
-                
-                # Calculate NDVI based on location characteristics
-                ndvi = self._estimate_ndvi(lng, lat)
-                
-                # Color mapping
-                color = self._ndvi_to_color(ndvi)
-                
-                features.append({
-                    "type": "Feature",
-                    "properties": {
-                        "ndvi": round(ndvi, 3),
-                        "color": color,
-                        "vegetation_class": self._ndvi_class(ndvi),
-                        "weight": max(0.1, (ndvi + 0.5) / 1.5)
-                    },
-                    "geometry": {
-                        "type": "Point",
-                        "coordinates": [lng, lat]
-                    }
-                })
+        # Calculate NDVI based on location characteristics
+        ndvi = self._estimate_ndvi(lng, lat)
+        
+        features = _point_features(lng, lat, {
+            "ndvi": np.round(ndvi, 3).tolist(),
+            "color": _NDVI_COLORS[np.digitize(ndvi, _NDVI_COLOR_BREAKS)].tolist(),
+            "vegetation_class": _NDVI_CLASSES[np.digitize(ndvi, _NDVI_CLASS_BREAKS)].tolist(),
+            "weight": np.maximum(0.1, (ndvi + 0.5) / 1.5).tolist()
+        })
         
         return {
             "id": "ndvi-analysis",
@@ -362,32 +411,27 @@ class SatelliteDataService:
             }
         }
     
-    def _estimate_ndvi(self, lng: float, lat: float) -> float:
-        """Estimate NDVI based on location"""
+    def _estimate_ndvi(self, lng: np.ndarray, lat: np.ndarray) -> np.ndarray:
+        """Estimate NDVI for arrays of locations"""
         # Higher NDVI in mountain foothills and river valleys
         # Lower in deserts and urban areas
         
         # Check if near mountains (Tian Shan)
-        dist_to_mountains = math.sqrt((lng - 77)**2 + (lat - 43)**2)
-        mountain_factor = max(0, 0.4 - dist_to_mountains * 0.05)
+        dist_to_mountains = np.hypot(lng - 77, lat - 43)
+        mountain_factor = np.maximum(0, 0.4 - dist_to_mountains * 0.05)
         
-        # Check if in desert region (central Kazakhstan)
-        if 60 < lng < 75 and 44 < lat < 48:
-            base_ndvi = 0.1
-        # Check if in steppe
-        elif lat > 48:
-            base_ndvi = 0.25
-        # Southern regions
-        elif lat < 44:
-            base_ndvi = 0.2
-        else:
-            base_ndvi = 0.15
+        # Desert (central Kazakhstan), steppe, southern regions, else
+        base_ndvi = np.select(
+            [(60 < lng) & (lng < 75) & (44 < lat) & (lat < 48), lat > 48, lat < 44],
+            [0.1, 0.25, 0.2],
+            0.15
+        )
         
         # Add mountain vegetation boost
         ndvi = base_ndvi + mountain_factor
         
         # Add randomness
-        ndvi += random.uniform(-0.1, 0.1)
+        ndvi += _rng.uniform(-0.1, 0.1, ndvi.size)
         
         # Seasonal adjustment (assuming summer)
         month = datetime.now().month
@@ -396,43 +440,7 @@ class SatelliteDataService:
         elif month in [12, 1, 2]:  # Winter low
             ndvi *= 0.3
         
-        return max(-0.5, min(1.0, ndvi))
-    
-    def _ndvi_to_color(self, ndvi: float) -> str:
-        """Convert NDVI to color"""
-        if ndvi < -0.1:
-            return "#2166ac"  # Water
-        elif ndvi < 0.1:
-            return "#d6604d"  # Bare soil/rock
-        elif ndvi < 0.2:
-            return "#f4a582"  # Sparse vegetation
-        elif ndvi < 0.3:
-            return "#fddbc7"  # Light vegetation
-        elif ndvi < 0.4:
-            return "#d1e5f0"  # Moderate vegetation
-        elif ndvi < 0.5:
-            return "#92c5de"  # Good vegetation
-        elif ndvi < 0.6:
-            return "#4393c3"  # Dense vegetation
-        else:
-            return "#1a9850"  # Very dense vegetation
-    
-    def _ndvi_class(self, ndvi: float) -> str:
-        """Get vegetation class from NDVI"""
-        if ndvi < -0.1:
-            return "Water"
-        elif ndvi < 0.1:
-            return "Bare Soil/Rock"
-        elif ndvi < 0.2:
-            return "Sparse Vegetation"
-        elif ndvi < 0.3:
-            return "Grassland"
-        elif ndvi < 0.5:
-            return "Shrubland/Crops"
-        elif ndvi < 0.7:
-            return "Forest"
-        else:
-            return "Dense Forest"
+        return np.clip(ndvi, -0.5, 1.0)
     
     # ==============================================================
     # LAND SURFACE TEMPERATURE
@@ -444,38 +452,26 @@ class SatelliteDataService:
         Generate Land Surface Temperature layer
         Simulates MODIS LST data
         """
-        features = []
         timestamp = datetime.utcnow().isoformat() + "Z"
         
         # Get current hour for diurnal variation
-        hour = datetime.now().hour
-        month = datetime.now().month
+        now = datetime.now()
+        hour, month = now.hour, now.month
         
         resolution = 0.05  # ~5km resolution
         lat_range = int(radius_km / 111)
         lng_range = int(radius_km / (111 * math.cos(math.radians(center[1]))))
+        lng, lat = _grid(center, resolution, lat_range, lng_range, step=5)
         
-        for i in range(-lat_range, lat_range + 1, 5):
-            for j in range(-lng_range, lng_range + 1, 5):
-                lat = center[1] + i * resolution
-                lng = center[0] + j * resolution
-                
-                # Calculate LST
-                lst = self._estimate_lst(lng, lat, hour, month)
-                
-                features.append({
-                    "type": "Feature",
-                    "properties": {
-                        "lst_celsius": round(lst, 1),
-                        "lst_kelvin": round(lst + 273.15, 1),
-                        "color": self._lst_to_color(lst),
-                        "weight": max(0.1, (lst + 30) / 80)
-                    },
-                    "geometry": {
-                        "type": "Point",
-                        "coordinates": [lng, lat]
-                    }
-                })
+        # Calculate LST
+        lst = self._estimate_lst(lng, lat, hour, month)
+        
+        features = _point_features(lng, lat, {
+            "lst_celsius": np.round(lst, 1).tolist(),
+            "lst_kelvin": np.round(lst + 273.15, 1).tolist(),
+            "color": _LST_COLORS[np.digitize(lst, _LST_COLOR_BREAKS)].tolist(),
+            "weight": np.maximum(0.1, (lst + 30) / 80).tolist()
+        })
         
         return {
             "id": "lst-analysis",
@@ -515,10 +511,11 @@ class SatelliteDataService:
             }
         }
     
-    def _estimate_lst(self, lng: float, lat: float, hour: int, month: int) -> float:
-        """Estimate Land Surface Temperature"""
+    def _estimate_lst(self, lng: np.ndarray, lat: np.ndarray,
+                      hour: int, month: int) -> np.ndarray:
+        """Estimate Land Surface Temperature for arrays of locations"""
         # Base temperature by latitude
-        base_temp = 25 - abs(lat - 45) * 0.8
+        base_temp = 25 - np.abs(lat - 45) * 0.8
         
         # Seasonal variation
         if month in [6, 7, 8]:  # Summer
@@ -540,50 +537,21 @@ class SatelliteDataService:
         else:  # Night
             base_temp -= 8
         
-        # Urban heat island effect
-        # Check if near major cities
-        cities = [(76.9458, 43.2220), (71.4491, 51.1801)]  # Almaty, Astana
-        for city_lng, city_lat in cities:
-            dist = math.sqrt((lng - city_lng)**2 + (lat - city_lat)**2)
-            if dist < 0.5:
-                base_temp += 5 * (1 - dist * 2)
+        # Urban heat island effect near major cities
+        for city_lng, city_lat in _LST_CITIES:
+            dist = np.hypot(lng - city_lng, lat - city_lat)
+            base_temp += np.where(dist < 0.5, 5 * (1 - dist * 2), 0)
         
         # Elevation effect (higher = cooler)
         # Mountain regions
-        dist_to_mountains = math.sqrt((lng - 77)**2 + (lat - 43)**2)
-        if dist_to_mountains < 2:
-            base_temp -= 15 * (1 - dist_to_mountains / 2)
+        dist_to_mountains = np.hypot(lng - 77, lat - 43)
+        base_temp -= np.where(dist_to_mountains < 2, 15 * (1 - dist_to_mountains / 2), 0)
         
         # Random variation
-        base_temp += random.uniform(-3, 3)
+        base_temp += _rng.uniform(-3, 3, base_temp.size)
         
         return base_temp
     
-    def _lst_to_color(self, lst: float) -> str:
-        """Convert LST to color"""
-        if lst < -20:
-            return "#313695"
-        elif lst < -10:
-            return "#4575b4"
-        elif lst < 0:
-            return "#74add1"
-        elif lst < 10:
-            return "#abd9e9"
-        elif lst < 20:
-            return "#e0f3f8"
-        elif lst < 25:
-            return "#ffffbf"
-        elif lst < 30:
-            return "#fee090"
-        elif lst < 35:
-            return "#fdae61"
-        elif lst < 40:
-            return "#f46d43"
-        elif lst < 45:
-            return "#d73027"
-        else:
-            return "#a50026"
-    
     # ==============================================================
     # BURNED AREA / FIRE DATA
     # ==============================================================
@@ -594,7 +562,8 @@ class SatelliteDataService:
         Simulates FIRMS active fire data
         """
         features = []
-        timestamp = datetime.utcnow().isoformat() + "Z"
+        now = datetime.utcnow()
+        timestamp = now.isoformat() + "Z"
         
         # Known fire-prone regions in Kazakhstan
         fire_regions = [
@@ -620,7 +589,7 @@ class SatelliteDataService:
                 
                 # Age of fire detection
                 age_hours = random.randint(0, days_back * 24)
-                detection_time = datetime.utcnow() - timedelta(hours=age_hours)
+                detection_time = now - timedelta(hours=age_hours)
                 
                 features.append({
                     "type": "Feature",
@@ -0,0 +1,22 @@
+"""
+Shared test fixtures
+The services and routes import each other as top-level packages, so the
+backend directory goes on sys.path the same way main.py runs.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def client():
+    """One TestClient over the full app, with its lifespan running"""
+    from fastapi.testclient import TestClient
+    import main
+
+    with TestClient(main.app) as test_client:
+        yield test_client
@@ -0,0 +1,71 @@
+"""
+Vectorized AQI conversions against their scalar counterparts, with every
+breakpoint edge (and the values just around it) included
+"""
+
+import numpy as np
+import pytest
+
+from services import real_data_service
+from services.environmental_data import (
+    EnvironmentalDataService, _breakpoint_aqi,
+    _PM25_BREAKPOINTS, _PM10_BREAKPOINTS, _NO2_BREAKPOINTS
+)
+
+
+def _edge_values(breakpoints, top: float) -> np.ndarray:
+    """Every breakpoint bound, +/- a small step, plus zero, negatives and out-of-range values"""
+    bounds = sorted({b for c_low, c_high, _, _ in breakpoints for b in (c_low, c_high)})
+    values = [v + d for v in bounds for d in (-0.05, -0.01, 0.0, 0.01, 0.05)]
+    values += [-1.0, 0.0, top * 2, float(np.nextafter(top, np.inf))]
+    values += np.linspace(0, top * 1.2, 997).tolist()
+    return np.array(values, dtype=np.float64)
+
+
+@pytest.mark.parametrize("breakpoints", [_PM25_BREAKPOINTS, _PM10_BREAKPOINTS, _NO2_BREAKPOINTS],
+                         ids=["pm25", "pm10", "no2"])
+def test_breakpoint_aqi_matches_scalar(breakpoints):
+    service = EnvironmentalDataService()
+    _, rows, _ = breakpoints
+    conc = _edge_values(rows, rows[-1][1])
+    expected = [service._calculate_aqi_breakpoint(c, breakpoints) for c in conc.tolist()]
+    assert _breakpoint_aqi(conc, breakpoints).tolist() == expected
+
+
+def _pm25_to_aqi_reference(pm25: float) -> int:
+    """The real-data service's original per-reading EPA conversion"""
+    if pm25 <= 12.0:
+        return int((50 / 12) * pm25)
+    elif pm25 <= 35.4:
+        return int(((100 - 51) / (35.4 - 12.1)) * (pm25 - 12.1) + 51)
+    elif pm25 <= 55.4:
+        return int(((150 - 101) / (55.4 - 35.5)) * (pm25 - 35.5) + 101)
+    elif pm25 <= 150.4:
+        return int(((200 - 151) / (150.4 - 55.5)) * (pm25 - 55.5) + 151)
+    elif pm25 <= 250.4:
+        return int(((300 - 201) / (250.4 - 150.5)) * (pm25 - 150.5) + 201)
+    else:
+        return int(((500 - 301) / (500 - 250.5)) * (pm25 - 250.5) + 301)
+
+
+def test_pm25_to_aqi_vec_matches_scalar():
+    pm25 = _edge_values(
+        [(0, 12.0, 0, 50), (12.1, 35.4, 51, 100), (35.5, 55.4, 101, 150),
+         (55.5, 150.4, 151, 200), (150.5, 250.4, 201, 300), (250.5, 500, 301, 500)],
+        500
+    )
+    pm25 = pm25[pm25 >= 0]
+    expected = [_pm25_to_aqi_reference(v) for v in pm25.tolist()]
+    assert real_data_service._pm25_to_aqi_vec(pm25).tolist() == expected
+
+
+def test_real_data_aqi_categories_keep_their_bands():
+    service = real_data_service.RealDataService()
+    names = [(aqi, service._get_aqi_category(aqi)["name"]) for aqi in (0, 50, 51, 100, 101, 150, 151, 200, 201, 300, 301, 500, 501)]
+    assert names == [
+        (0, "Good"), (50, "Good"), (51, "Moderate"), (100, "Moderate"),
+        (101, "Unhealthy for Sensitive Groups"), (150, "Unhealthy for Sensitive Groups"),
+        (151, "Unhealthy"), (200, "Unhealthy"), (201, "Very Unhealthy"), (300, "Very Unhealthy"),
+        (301, "Hazardous"), (500, "Hazardous"), (501, "Hazardous")
+    ]
+    assert service._get_aqi_category(42)["color"] == "#00E400"
@@ -0,0 +1,139 @@
+"""
+async_ttl_cache keying, expiry, eviction and sharing of in-flight calls
+"""
+
+import asyncio
+
+import pytest
+
+from services import cache
+from services.cache import async_ttl_cache
+
+
+class _Clock:
+    """Stand-in for time.monotonic that only moves when told to"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = _Clock()
+    monkeypatch.setattr(cache.time, "monotonic", fake)
+    return fake
+
+
+def _counting(ttl: float = 10, maxsize: int = 128, fail: bool = False):
+    calls = []
+
+    @async_ttl_cache(ttl, maxsize=maxsize)
+    async def fetch(*args, **kwargs):
+        calls.append((args, kwargs))
+        await asyncio.sleep(0)
+        if fail:
+            raise RuntimeError("upstream down")
+        return len(calls)
+
+    return fetch, calls
+
+
+def test_same_arguments_share_one_call(clock):
+    fetch, calls = _counting()
+
+    async def run():
+        return [await fetch(1, mode="a"), await fetch(1, mode="a")]
+
+    assert asyncio.run(run()) == [1, 1]
+    assert len(calls) == 1
+
+
+def test_key_covers_args_and_kwargs_in_any_order(clock):
+    fetch, calls = _counting()
+
+    async def run():
+        await fetch(1, a=1, b=2)
+        await fetch(1, b=2, a=1)
+        await fetch(2, a=1, b=2)
+        await fetch(1, a=1, b=3)
+
+    asyncio.run(run())
+    assert len(calls) == 3
+
+
+def test_entries_expire_after_ttl(clock):
+    fetch, calls = _counting(ttl=10)
+
+    async def run():
+        first = await fetch("k")
+        clock.now += 9.9
+        cached = await fetch("k")
+        clock.now += 0.1
+        refreshed = await fetch("k")
+        return first, cached, refreshed
+
+    assert asyncio.run(run()) == (1, 1, 2)
+
+
+def test_concurrent_callers_share_the_in_flight_call(clock):
+    fetch, calls = _counting()
+
+    async def run():
+        return await asyncio.gather(*(fetch("k") for _ in range(5)))
+
+    assert asyncio.run(run()) == [1] * 5
+    assert len(calls) == 1
+
+
+def test_failed_calls_are_not_cached(clock):
+    fetch, calls = _counting(fail=True)
+
+    async def run():
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await fetch("k")
+
+    asyncio.run(run())
+    assert len(calls) == 2
+
+
+def test_unhashable_arguments_bypass_the_cache(clock):
+    fetch, calls = _counting()
+
+    async def run():
+        return [await fetch({"bbox": [1, 2]}), await fetch({"bbox": [1, 2]}),
+                await fetch(bounds=[1, 2]), await fetch("k"), await fetch("k")]
+
+    assert asyncio.run(run()) == [1, 2, 3, 4, 4]
+
+
+def test_maxsize_drops_the_oldest_entry(clock):
+    fetch, calls = _counting(maxsize=2)
+
+    async def run():
+        await fetch("a")
+        await fetch("b")
+        await fetch("c")
+        await fetch("c")
+        await fetch("b")
+        await fetch("a")
+
+    asyncio.run(run())
+    assert [args for args, _ in calls] == [("a",), ("b",), ("c",), ("a",)]
+
+
+def test_per_second_stamp_formats_once_per_second(monkeypatch):
+    seconds = iter([5.1, 5.9, 6.0])
+    monkeypatch.setattr(cache.time, "time", lambda: next(seconds))
+    formatted = []
+
+    def fmt(second):
+        formatted.append(second)
+        return f"t{second}"
+
+    stamp = cache.per_second_stamp(fmt)
+    assert [stamp(), stamp(), stamp()] == ["t5", "t5", "t6"]
+    assert formatted == [5, 6]
@@ -0,0 +1,65 @@
+"""
+NDVI and LST lookup tables against the `value < edge` chains they replaced:
+a value equal to an edge falls in the upper band
+"""
+
+import numpy as np
+
+from services import satellite_data
+from routes import environmental
+
+
+def _around(edges) -> np.ndarray:
+    """Each edge and the values just below and above it, plus far outliers"""
+    edges = np.asarray(edges, dtype=np.float64)
+    return np.concatenate([edges, np.nextafter(edges, -np.inf), np.nextafter(edges, np.inf),
+                           [edges[0] - 100, edges[-1] + 100]])
+
+
+def _band(value: float, edges, labels):
+    for edge, label in zip(edges, labels):
+        if value < edge:
+            return label
+    return labels[-1]
+
+
+def _lookup(table, breaks, values):
+    return table[np.digitize(values, breaks)].tolist()
+
+
+def test_satellite_ndvi_colors_at_edges():
+    values = _around(satellite_data._NDVI_COLOR_BREAKS)
+    edges = [-0.1, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6]
+    labels = ["#2166ac", "#d6604d", "#f4a582", "#fddbc7", "#d1e5f0", "#92c5de", "#4393c3", "#1a9850"]
+    assert _lookup(satellite_data._NDVI_COLORS, satellite_data._NDVI_COLOR_BREAKS, values) == [
+        _band(v, edges, labels) for v in values.tolist()
+    ]
+
+
+def test_satellite_ndvi_classes_at_edges():
+    values = _around(satellite_data._NDVI_CLASS_BREAKS)
+    edges = [-0.1, 0.1, 0.2, 0.3, 0.5, 0.7]
+    labels = ["Water", "Bare Soil/Rock", "Sparse Vegetation", "Grassland",
+              "Shrubland/Crops", "Forest", "Dense Forest"]
+    assert _lookup(satellite_data._NDVI_CLASSES, satellite_data._NDVI_CLASS_BREAKS, values) == [
+        _band(v, edges, labels) for v in values.tolist()
+    ]
+
+
+def test_satellite_lst_colors_at_edges():
+    values = _around(satellite_data._LST_COLOR_BREAKS)
+    edges = [-20, -10, 0, 10, 20, 25, 30, 35, 40, 45]
+    labels = ["#313695", "#4575b4", "#74add1", "#abd9e9", "#e0f3f8", "#ffffbf",
+              "#fee090", "#fdae61", "#f46d43", "#d73027", "#a50026"]
+    assert _lookup(satellite_data._LST_COLORS, satellite_data._LST_COLOR_BREAKS, values) == [
+        _band(v, edges, labels) for v in values.tolist()
+    ]
+
+
+def test_route_ndvi_batch_matches_scalar():
+    values = _around(environmental._NDVI_COLOR_BREAKS)
+    edges = [-0.1, 0.1, 0.3, 0.6]
+    labels = ["#a50026", "#d73027", "#fee08b", "#66bd63", "#006837"]
+    expected = [_band(v, edges, labels) for v in values.tolist()]
+    assert environmental.get_ndvi_colors(values) == expected
+    assert [environmental.get_ndvi_color(v) for v in values.tolist()] == expected
@@ -0,0 +1,39 @@
+"""
+Route-level checks over the full app: per-city quick air quality and the
+PDF report
+"""
+
+from services.environmental_data import KAZAKHSTAN_AIR_QUALITY_STATIONS
+
+
+def _city_sensors(city: str):
+    return [set(s["sensors"]) for s in KAZAKHSTAN_AIR_QUALITY_STATIONS.values() if s["city"] == city]
+
+
+def test_quick_air_quality_uses_the_requested_city(client):
+    for key, city in (("almaty", "Almaty"), ("atyrau", "Atyrau"), ("astana", "Astana")):
+        response = client.get(f"/api/quick/air-quality/{key}")
+        assert response.status_code == 200
+        body = response.json()
+        assert body["city"] == city
+        assert set(body["pollutants"]) in _city_sensors(city)
+        assert body["timestamp"].endswith("Z")
+
+
+def test_quick_air_quality_city_without_station(client):
+    response = client.get("/api/quick/air-quality/taraz")
+    assert response.status_code == 200
+    assert response.json() == {"city": "Taraz", "status": "no_data"}
+
+
+def test_quick_air_quality_unknown_city(client):
+    assert client.get("/api/quick/air-quality/atlantis").status_code == 404
+
+
+def test_report_pdf(client):
+    response = client.get("/api/environmental/report/pdf", params={"title": "Test Report"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/pdf"
+    assert "ApexGIS_Report_" in response.headers["content-disposition"]
+    assert response.content.startswith(b"%PDF")
+    assert response.content.rstrip().endswith(b"%%EOF")